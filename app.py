@@ -5,23 +5,24 @@ app.py - Final Institutional Edition
 """
 import streamlit as st
 import pandas as pd
-from src.core.config import TABS, COMPANY_NAME, COLORS
-from src.core.data_loader import UniversalScreenerLoader
-from src.ui.sidebar import render_sidebar
+from src.core.config import (TABS, COMPANY_NAME, COLORS, UPLOAD_MAX_WORKERS, UPLOAD_PROCESS_MIN_FILES, UNIVERSE_STORE_PATH,
+                             PREFETCH_WAIT_SECONDS, PREFETCH_POLL_SECONDS)
+from src.core.ingest import load_workbooks, parse_workbook, parse_workbook_state
+from src.core.session_data import LazyRecord, process_stats
+from src.core.universe_store import UniverseStore
+from src.core.log import counters
+from src.core.profiler import profiler, span
+from src.ui.sidebar import render_sidebar, render_dataset_selector, render_publish_button, render_performance_panel
 from src.ui.styles import apply_custom_css
 from src.ui.components import UIComponents
+from src.ui.charts import bar_chart, line_chart
+from src.ui.display import show_table
+from src.ui.cache import (index_universe, get_universe_store, get_prefetcher, prefetch_analyses, get_watch_service,
+                          get_session_data, get_parse_pool)
 
-# Analysis Engines
-from src.analysis.financial import FinancialAnalyzer
-from src.analysis.eva import EVAAnalyzer
-from src.analysis.thesis import ThesisEngine
-
-# Tab Modules
-from src.ui.tabs.dashboard import render_dashboard
-from src.ui.tabs.profitability_tab import render_profitability_tab
-from src.ui.tabs.dcf_tab import render_dcf_tab
-from src.ui.tabs.efficiency_tab import render_efficiency_tab
-from src.ui.tabs.growth_tab import render_growth_tab
+# Analysis Engines & Tab Modules (imported on first use - keeps cold start light)
+from src.analysis import get_engine
+from src.ui.tabs import render_tab
 
 # 1. Page Configuration
 st.set_page_config(
@@ -30,94 +31,229 @@ st.set_page_config(
     layout="wide"
 )
 
-def format_df_for_streamlit(df):
-    """Fixes ArrowTypeError by ensuring string indices and columns."""
-    temp_df = df.copy()
-    temp_df.index = temp_df.index.astype(str)
-    temp_df.columns = temp_df.columns.astype(str)
-    return temp_df
+def ingest_uploads(uploaded_files):
+    """
+    Parses new uploads concurrently and returns every parsed dataset.
 
-def main():
+    Parsed results live in the session's SessionDataManager keyed by upload,
+    so a rerun (slider move, tab switch) never re-parses a workbook it has
+    already seen - unless the session's memory budget evicted it, in which
+    case it is re-parsed from the upload on first use.
+    """
+    session_data = get_session_data()
+    uploads = session_data.namespace('uploads')
+    keys = {getattr(f, 'file_id', None) or (f.name, f.size): f for f in uploaded_files}
+
+    # Forget files the user removed from the uploader
+    for key in uploads.keys():
+        if key not in keys:
+            uploads.pop(key)
+
+    pending = [(key, f) for key, f in keys.items() if key not in uploads]
+    if pending:
+        from src.core.differential import DifferentialIngestor, format_change_summary
+
+        # A re-uploaded export of a company only re-extracts its changed sections
+        ingestor = st.session_state.setdefault(
+            'ingestor', DifferentialIngestor(views=(), states=session_data.namespace('ingest')))
+        with st.status(f"🏔️ Scaling the Data... ({len(pending)} file(s))", expanded=len(pending) > 1) as status:
+            progress = st.progress(0.0)
+
+            def on_progress(name, result, done, total):
+                icon = "✓" if result['data'] is not None else "❌"
+                changes = result.get('changes') or {}
+                detail = f" ({format_change_summary(changes)})" if changes.get('status') in ('updated', 'unchanged') else ""
+                status.write(f"{icon} {name}{detail}")
+                progress.progress(done / total, text=f"{done}/{total} parsed")
+
+            pool = get_parse_pool() if len(pending) >= UPLOAD_PROCESS_MIN_FILES else None
+            if pool is not None:
+                # openpyxl holds the GIL: batches parse in worker processes, and
+                # the ingestor's change summaries and state are applied here
+                results = load_workbooks([f for _, f in pending], on_progress=on_progress, pool=pool,
+                                         parse=parse_workbook_state, reuse=ingestor.unchanged,
+                                         finish=lambda payload, name, parsed: ingestor.ingest(payload, name, parsed=parsed))
+            else:
+                # Single files (and single-core hosts) keep the ingestor's section reuse
+                results = load_workbooks([f for _, f in pending], max_workers=UPLOAD_MAX_WORKERS,
+                                         on_progress=on_progress, parse=ingestor.ingest)
+            for (key, f), result in zip(pending, results):
+                info = {'key': ('upload', key), 'name': result['name'], 'metadata': result['metadata'],
+                        'valid': result['data'] is not None}
+                uploads.put(key, result, info=info,
+                            recompute=lambda f=f, name=result['name']: parse_workbook(f.getvalue(), name))
+            status.update(label=f"✓ {len(pending)} file(s) parsed", state="complete", expanded=False)
+
+    # Display name -> dataset (company name, disambiguated by file name);
+    # frames are only loaded when a tab reads them
+    datasets = {}
+    for key in keys:
+        info = uploads.info(key)
+        if not info['valid']:
+            st.error(f"❌ {info['name']}: Data structure mismatch. Please use a valid Screener.in Excel.")
+            continue
+        name = info['metadata'].get('company_name') or info['name']
+        if name in datasets:
+            name = f"{name} ({info['name']})"
+        datasets[name] = LazyRecord(uploads, key, info)
+    return datasets
+
+def load_from_universe(store, company):
+    """Builds a dataset from the memory-mapped universe store (no parsing)."""
+    return {'key': ('universe', store.path, company), 'name': company, 'data': store.company_frame(company),
+            'metadata': store.company_metadata(company), 'quarterly': None}
+
+def prefetched(key, view, label, waiting):
+    """
+    A background-computed view, or a placeholder while it is still running
+    (the view is then added to `waiting` so the page refreshes once it lands).
+    """
+    prefetcher = get_prefetcher()
+    value = prefetcher.get(key, view)
+    if value is None:
+        if prefetcher.error(key, view) is not None:
+            st.error(f"❌ {label} could not be computed for this dataset.")
+            # Failed views are not resubmitted on their own
+            if st.button("🔄 Retry", key=f"retry_{view}"):
+                prefetcher.retry(key, view)
+                st.rerun()
+        else:
+            st.info(f"⏳ Computing {label} in the background...")
+            waiting.append(view)
+    return value
+
+@st.fragment(run_every=PREFETCH_POLL_SECONDS)
+def poll_prefetched(key, views):
+    """
+    Refreshes the page once a view behind a placeholder lands. Runs on its
+    own timer, so the script never blocks and widget interactions are
+    handled at once.
+    """
+    prefetcher = get_prefetcher()
+    if any(prefetcher.ready(key, view) or prefetcher.error(key, view) is not None for view in views):
+        st.rerun()
+
+def render_app():
     # 2. Apply Custom UI Styling (Deep Navy/Gold Theme)
     apply_custom_css()
 
     # 3. Sidebar Implementation (Inputs & File Upload)
-    uploaded_file, settings = render_sidebar()
+    get_watch_service()
+    store = get_universe_store()
+    uploaded_files, settings = render_sidebar(store.companies if store is not None else None)
 
     # 4. Institutional Hero Header
     UIComponents.header("Advanced Institutional Financial Analytics")
 
-    if uploaded_file:
-        with st.spinner("🏔️ Scaling the Data..."):
-            loader = UniversalScreenerLoader(uploaded_file)
-            data, metadata = loader.get_processed_data()
+    if uploaded_files or settings['universe_picks']:
+        with span('app.ingest_uploads'):
+            datasets = ingest_uploads(uploaded_files) if uploaded_files else {}
+        if render_publish_button(len(datasets)):
+            UniverseStore.publish(UNIVERSE_STORE_PATH,
+                                  {name: d['data'] for name, d in datasets.items()},
+                                  {name: d['metadata'] for name, d in datasets.items()})
+            st.sidebar.success("✓ Published to the shared universe")
+        for name in settings['universe_picks']:
+            datasets.setdefault(name, load_from_universe(store, name))
+        index_universe(datasets)
+        active = render_dataset_selector(list(datasets))
+        dataset = datasets.get(active, {})
+        data, metadata = dataset.get('data'), dataset.get('metadata')
+
+        # Trailing-Twelve-Month basis: engines persist per company so a
+        # re-upload after results only pushes the new quarters
+        if data is not None and settings.get('use_ttm') and dataset.get('quarterly') is not None:
+            engines = st.session_state.setdefault('ttm_engines', {})
+            engine = engines.setdefault(metadata['company_name'], get_engine('ttm')())
+            engine.extend(dataset['quarterly'])
+            data = engine.apply_to(data)
 
         if data is not None:
-            analyzer = FinancialAnalyzer(data)
-            
-            # Create the 9-Tab Navigation
+            # Everything behind the non-dashboard tabs starts computing now
+            prefetch_key = prefetch_analyses(data, metadata, settings)
+            waiting = []
+
+            # Create the 10-Tab Navigation
             tab_objs = st.tabs(TABS)
 
             # --- TAB 1: DASHBOARD ---
             with tab_objs[0]: 
-                render_dashboard(data, metadata)
+                render_tab('dashboard', data, metadata)
 
             # --- TAB 2: FINANCIALS ---
-            with tab_objs[1]: 
+            with tab_objs[1], span('render.financials_tab'):
                 st.subheader("📋 Historical Financial Statements")
-                f_df = data.set_index('Report Date').T
-                st.dataframe(format_df_for_streamlit(f_df), width='stretch')
+                show_table(data, 'financials', lambda: data.set_index('Report Date').T)
 
             # --- TAB 3: PROFITABILITY ---
             with tab_objs[2]: 
-                render_profitability_tab(data)
+                render_tab('profitability', data)
 
             # --- TAB 4: DCF VALUATION ---
             with tab_objs[3]: 
-                render_dcf_tab(data, settings)
+                render_tab('dcf', data, settings, get_prefetcher().get(prefetch_key, 'dcf'), metadata)
+
+            # Fast jobs (e.g. after a slider move) usually land within this
+            # bounded wait and render without a placeholder
+            get_prefetcher().wait(prefetch_key, timeout=PREFETCH_WAIT_SECONDS)
 
             # --- TAB 5: EVA ANALYSIS ---
-            with tab_objs[4]:
+            with tab_objs[4], span('render.eva_tab'):
                 st.subheader("💎 Economic Value Added (EVA)")
-                wacc = settings.get('wacc', 12.0) / 100
-                eva_df = EVAAnalyzer(data, wacc).calculate_eva()
-                st.bar_chart(eva_df.set_index('Report Date')['EVA'])
-                st.dataframe(format_df_for_streamlit(eva_df.set_index('Report Date').T), width='stretch')
+                eva_df = prefetched(prefetch_key, 'eva', "EVA", waiting)
+                if eva_df is not None:
+                    bar_chart(data, ('eva', settings['wacc']), lambda: eva_df.set_index('Report Date')['EVA'])
+                    show_table(data, ('eva', settings['wacc']), lambda: eva_df.set_index('Report Date').T)
 
             # --- TAB 6: SOLVENCY ---
-            with tab_objs[5]: 
+            with tab_objs[5], span('render.solvency_tab'):
                 st.subheader("⚖️ Solvency Analysis")
-                solv = analyzer.get_solvency_metrics()
-                st.line_chart(solv.set_index('Year')['Debt-to-Equity'])
-                st.dataframe(format_df_for_streamlit(solv.set_index('Year').T), width='stretch')
+                solv = prefetched(prefetch_key, 'solvency', "solvency ratios", waiting)
+                if solv is not None:
+                    line_chart(data, 'debt_to_equity', lambda: solv.set_index('Year')['Debt-to-Equity'])
+                    show_table(data, 'solvency', lambda: solv.set_index('Year').T)
 
             # --- TAB 7: EFFICIENCY ---
             with tab_objs[6]: 
-                render_efficiency_tab(data)
+                eff_df = prefetched(prefetch_key, 'efficiency', "efficiency ratios", waiting)
+                if eff_df is not None:
+                    render_tab('efficiency', data, eff_df)
 
             # --- TAB 8: GROWTH ---
             with tab_objs[7]: 
-                render_growth_tab(data)
+                growth_df = prefetched(prefetch_key, 'growth', "growth rates", waiting)
+                if growth_df is not None:
+                    render_tab('growth', data, growth_df)
 
             # --- TAB 9: THESIS (Decision Engine) ---
-            with tab_objs[8]:
+            with tab_objs[8], span('render.thesis_tab'):
                 st.subheader("📝 Final Investment Thesis")
                 curr_price = metadata.get('current_price', 0)
-                dcf_val = st.session_state.get('intrinsic_value', 0) 
+                dcf_val = st.session_state.get('intrinsic_value_per_share', 0)
+
+                thesis_metrics = prefetched(prefetch_key, 'thesis', "thesis inputs", waiting)
+                if thesis_metrics is not None:
+                    engine = get_engine('thesis')(data, dcf_val, curr_price, metrics=thesis_metrics)
+                    score, checks = engine.generate_verdict()
+
+                    c1, c2 = st.columns([1, 2])
+                    c1.metric("Mountain Score", f"{score} / 3")
+                    with c2:
+                        for check in checks: st.write(check)
 
-                engine = ThesisEngine(data, dcf_val, curr_price)
-                score, checks = engine.generate_verdict()
+                    st.divider()
+                    if score >= 2:
+                        st.success("🏔️ **VERDICT: INVESTABLE GRADE**")
+                    else:
+                        st.error("🚨 **VERDICT: AVOID / WATCHLIST**")
 
-                c1, c2 = st.columns([1, 2])
-                c1.metric("Mountain Score", f"{score} / 3")
-                with c2:
-                    for check in checks: st.write(check)
+            # --- TAB 10: PEERS (Side-by-Side) ---
+            with tab_objs[9]:
+                render_tab('peers', data, datasets, active)
 
-                st.divider()
-                if score >= 2:
-                    st.success("🏔️ **VERDICT: INVESTABLE GRADE**")
-                else:
-                    st.error("🚨 **VERDICT: AVOID / WATCHLIST**")
+            # Placeholders were shown: poll (without blocking) until the results land
+            if waiting:
+                poll_prefetched(prefetch_key, waiting)
 
         else:
             st.error("❌ Data structure mismatch. Please use a valid Screener.in Excel.")
@@ -128,5 +264,25 @@ def main():
     # 5. Fixed Institutional Footer
     UIComponents.footer()
 
+
+def main():
+    if profiler.enabled:
+        profiler.begin_run()
+
+    session_data = get_session_data()
+    session_data.begin_run()
+    try:
+        render_app()
+    finally:
+        # Also on st.rerun(): lift this rerun's protection and trim cached
+        # uploads / results to the memory budget
+        session_data.end_run()
+
+    # 6. Stage timings for this rerun (only when MOUNTAIN_PROFILE is set)
+    if profiler.enabled:
+        render_performance_panel(profiler.run_spans(), profiler.run_elapsed_ms(), profiler.trace_path,
+                                 counters.snapshot(), {'session': get_session_data().stats(),
+                                                       'process': process_stats()})
+
 if __name__ == "__main__":
     main()
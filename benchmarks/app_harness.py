@@ -0,0 +1,51 @@
+"""
+app_harness.py - Streamlit App Entry Point with Injected Uploads
+🏔️ THE MOUNTAIN PATH - World of Finance
+
+AppTest cannot drive st.file_uploader, so this script replaces the sidebar
+uploader with in-memory copies of the workbooks listed in the
+BENCH_WORKBOOKS environment variable (os.pathsep-separated) and then runs
+app.py unchanged. A session can upload its own set instead by putting a
+list of paths in session state under 'bench_workbooks' (used by the
+concurrent-session load test, where every simulated analyst differs).
+Used by the pipeline benchmarks:
+
+    AppTest.from_file('benchmarks/app_harness.py').run()
+"""
+
+import io
+import os
+import runpy
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+import streamlit as st
+
+
+def _uploaded_files():
+    files = []
+    paths = st.session_state.get('bench_workbooks') or os.environ.get('BENCH_WORKBOOKS', '').split(os.pathsep)
+    for path in filter(None, paths):
+        with open(path, 'rb') as f:
+            buffer = io.BytesIO(f.read())
+        # Mimic the UploadedFile attributes the app relies on
+        buffer.name = os.path.basename(path)
+        buffer.file_id = path
+        buffer.size = len(buffer.getvalue())
+        files.append(buffer)
+    return files
+
+
+def _file_uploader(*args, **kwargs):
+    files = _uploaded_files()
+    if kwargs.get('accept_multiple_files'):
+        return files
+    return files[0] if files else None
+
+
+st.sidebar.file_uploader = _file_uploader
+runpy.run_path(os.path.join(ROOT, 'app.py'), run_name='__main__')
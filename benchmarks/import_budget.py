@@ -0,0 +1,130 @@
+"""
+import_budget.py - Startup Import Budget Check
+🏔️ THE MOUNTAIN PATH - World of Finance
+
+Measures what `import app` costs on top of the framework (streamlit, pandas
+and numpy are imported first, since every deployment pays for those
+regardless), in a fresh interpreter per run, and fails when:
+
+- the best-of-N import time exceeds --budget-ms, or regresses by more than
+  --threshold against a --compare baseline
+- a module that must stay lazy (plotting, scipy, tab modules, ...) is
+  imported at startup
+
+    python -m benchmarks.import_budget
+    python -m benchmarks.import_budget --output startup.json
+    python -m benchmarks.import_budget --compare startup.json
+
+Exit code 1 on any failure.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules the welcome screen must not pay for (prefix match)
+LAZY_MODULES = (
+    'plotly.express',
+    'scipy',
+    'matplotlib',
+    'pyarrow.dataset',
+    'pyarrow.parquet',
+    'src.analysis.peers',
+    'src.analysis.benchmarks',
+    'src.analysis.out_of_core',
+    'src.ui.tabs.',
+)
+
+_PROBE = """
+import json, sys, time
+import numpy, pandas, streamlit
+before = set(sys.modules)
+start = time.perf_counter()
+import app
+elapsed = (time.perf_counter() - start) * 1000
+print(json.dumps({'ms': elapsed, 'modules': sorted(set(sys.modules) - before)}))
+"""
+
+
+def measure_startup(runs=5):
+    """
+    Import app in `runs` fresh interpreters.
+
+    Returns:
+        dict with best/median milliseconds and the modules the import added
+    """
+    timings, modules = [], []
+    for _ in range(runs):
+        out = subprocess.run([sys.executable, '-c', _PROBE], cwd=ROOT, capture_output=True,
+                             text=True, check=True, timeout=120)
+        result = json.loads(out.stdout.strip().splitlines()[-1])
+        timings.append(result['ms'])
+        modules = result['modules']
+    timings.sort()
+    return {
+        'best_ms': round(timings[0], 1),
+        'median_ms': round(timings[len(timings) // 2], 1),
+        'runs': runs,
+        'modules': modules,
+    }
+
+
+def eager_violations(modules):
+    """LAZY_MODULES entries that were imported at startup, with how many submodules each pulled in."""
+    violations = {}
+    for lazy in LAZY_MODULES:
+        prefix = lazy if lazy.endswith('.') else lazy + '.'
+        hits = [m for m in modules if m == lazy or m.startswith(prefix)]
+        if hits:
+            violations[lazy] = len(hits)
+    return violations
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fail when app startup import cost regresses")
+    parser.add_argument('--budget-ms', type=float, default=250.0,
+                        help="Max best-of-N cost of `import app` beyond streamlit/pandas/numpy")
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--output', help="Write the measurement JSON to this path")
+    parser.add_argument('--compare', help="Baseline JSON from a previous --output")
+    parser.add_argument('--threshold', type=float, default=0.25, help="Allowed slowdown vs baseline")
+    args = parser.parse_args(argv)
+
+    result = measure_startup(args.runs)
+    failures = []
+
+    print(f"import app: best {result['best_ms']:.1f} ms, median {result['median_ms']:.1f} ms "
+          f"({len(result['modules'])} modules beyond the framework)")
+
+    eager = eager_violations(result['modules'])
+    if eager:
+        failures.append("eagerly imported at startup: "
+                        + ", ".join(f"{name.rstrip('.')} ({count} modules)" for name, count in eager.items()))
+    if result['best_ms'] > args.budget_ms:
+        failures.append(f"{result['best_ms']:.1f} ms exceeds the {args.budget_ms:.0f} ms budget")
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+        change = result['best_ms'] / baseline['best_ms'] - 1 if baseline['best_ms'] else 0.0
+        print(f"vs baseline {baseline['best_ms']:.1f} ms: {change:+.1%}")
+        if change > args.threshold:
+            failures.append(f"regressed {change:+.1%} vs baseline (allowed {args.threshold:.0%})")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=2)
+
+    for failure in failures:
+        print(f"❌ {failure}")
+    if not failures:
+        print("✓ Startup import budget met")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
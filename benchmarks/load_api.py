@@ -0,0 +1,227 @@
+"""
+load_api.py - Valuation API Load Test
+🏔️ THE MOUNTAIN PATH - World of Finance
+
+Drives the local valuation service (src/service/server.py) with many
+concurrent keep-alive connections and reports latency percentiles and
+throughput. By default a server is started on a free localhost port for
+the run; --url targets one that is already running.
+
+    python -m benchmarks.load_api
+    python -m benchmarks.load_api --endpoint thesis --concurrency 32 --requests 2000
+    python -m benchmarks.load_api --batch-max 1            # batching disabled
+    python -m benchmarks.load_api --output api.json
+    python -m benchmarks.load_api --compare api.json
+
+Endpoints:
+    dcf       POST /v1/dcf with random scenarios (micro-batched kernel)
+    thesis    POST /v1/thesis on an uploaded synthetic workbook
+    evaluate  POST /v1/evaluate on an uploaded synthetic workbook
+
+--compare exits 1 when p99 latency or throughput regress beyond --threshold.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+from urllib.parse import urlsplit
+
+from benchmarks.synthetic import write_screener_workbook
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+async def _request(reader, writer, method, path, body=b'', content_type='application/json'):
+    """One keep-alive request; returns (status, decoded JSON body)."""
+    writer.write((f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Type: {content_type}\r\n"
+                  f"Content-Length: {len(body)}\r\n\r\n").encode() + body)
+    await writer.drain()
+
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b''):
+            break
+        name, _, value = line.decode().partition(':')
+        if name.lower() == 'content-length':
+            length = int(value)
+    return status, json.loads(await reader.readexactly(length))
+
+
+def _payload(endpoint, dataset_id, rng):
+    if endpoint == 'dcf':
+        return {'fcf': rng.uniform(10, 5000), 'growth_rate': rng.uniform(0.0, 0.3),
+                'wacc': rng.uniform(0.08, 0.16), 'terminal_growth': rng.uniform(0.02, 0.05)}
+    return {'dataset_id': dataset_id, 'wacc': rng.uniform(0.08, 0.16)}
+
+
+async def _client(host, port, endpoint, dataset_id, deadline, budget, latencies, errors, seed):
+    rng = random.Random(seed)
+    reader, writer = await asyncio.open_connection(host, port)
+    path = f"/v1/{endpoint}"
+    try:
+        while time.perf_counter() < deadline and budget[0] > 0:
+            budget[0] -= 1
+            body = json.dumps(_payload(endpoint, dataset_id, rng)).encode()
+            start = time.perf_counter()
+            status, _ = await _request(reader, writer, 'POST', path, body)
+            latencies.append((time.perf_counter() - start) * 1000)
+            if status != 200:
+                errors.append(status)
+    finally:
+        writer.close()
+
+
+async def run_load(host, port, endpoint='dcf', concurrency=64, requests=5000, duration=30.0):
+    """
+    Run the load and collect client-side latencies.
+
+    Returns:
+        dict with requests, errors, seconds, throughput_rps, latency percentiles
+        (ms) and the server's /v1/stats after the run
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+    dataset_id = None
+    if endpoint != 'dcf':
+        workbook = write_screener_workbook(company_name="Load Test Ltd")
+        status, result = await _request(reader, writer, 'POST', '/v1/datasets?name=load.xlsx',
+                                        workbook, 'application/octet-stream')
+        if status != 200:
+            raise RuntimeError(f"Upload failed: {result}")
+        dataset_id = result['dataset_id']
+        # Warm the worker processes outside the timed window
+        await _request(reader, writer, 'POST', f"/v1/{endpoint}", json.dumps({'dataset_id': dataset_id}).encode())
+
+    latencies, errors, budget = [], [], [requests]
+    start = time.perf_counter()
+    await asyncio.gather(*(_client(host, port, endpoint, dataset_id, start + duration, budget,
+                                   latencies, errors, seed) for seed in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    _, stats = await _request(reader, writer, 'GET', '/v1/stats')
+    writer.close()
+
+    latencies.sort()
+
+    def pct(q):
+        return round(latencies[min(len(latencies) - 1, int(q * len(latencies)))], 3) if latencies else None
+
+    return {
+        'endpoint': endpoint,
+        'concurrency': concurrency,
+        'requests': len(latencies),
+        'errors': len(errors),
+        'seconds': round(elapsed, 3),
+        'throughput_rps': round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        'p50_ms': pct(0.50),
+        'p90_ms': pct(0.90),
+        'p99_ms': pct(0.99),
+        'max_ms': round(latencies[-1], 3) if latencies else None,
+        'server': stats,
+    }
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def start_server(port, workers=None, batch_max=None, batch_wait_ms=None):
+    """Launch src.service.server in a subprocess and wait until it accepts connections."""
+    cmd = [sys.executable, '-m', 'src.service.server', '--port', str(port)]
+    for flag, value in (('--workers', workers), ('--batch-max', batch_max), ('--batch-wait-ms', batch_wait_ms)):
+        if value is not None:
+            cmd += [flag, str(value)]
+    proc = subprocess.Popen(cmd, cwd=ROOT, stdout=subprocess.DEVNULL)
+
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError("Valuation service exited during startup")
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=0.2).close()
+            return proc
+        except OSError:
+            time.sleep(0.1)
+    proc.kill()
+    raise RuntimeError("Valuation service did not start within 30s")
+
+
+def stop_server(proc, timeout=30):
+    """SIGTERM the service (it closes the listener and shuts its process pool down) and wait for it."""
+    proc.terminate()
+    try:
+        proc.wait(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.wait()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load test the local valuation API")
+    parser.add_argument('--url', help="Existing service, e.g. http://127.0.0.1:8765 (default: start one)")
+    parser.add_argument('--endpoint', choices=['dcf', 'thesis', 'evaluate'], default='dcf')
+    parser.add_argument('--concurrency', type=int, default=64, help="Concurrent keep-alive connections")
+    parser.add_argument('--requests', type=int, default=5000, help="Total requests (or until --duration)")
+    parser.add_argument('--duration', type=float, default=30.0, help="Max seconds of load")
+    parser.add_argument('--workers', type=int, help="Worker processes for a spawned server")
+    parser.add_argument('--batch-max', type=int, help="Spawned server's max DCF batch (1 = no batching)")
+    parser.add_argument('--batch-wait-ms', type=float, help="Spawned server's batching window")
+    parser.add_argument('--output', help="Write results JSON to this path")
+    parser.add_argument('--compare', help="Baseline results JSON to compare against")
+    parser.add_argument('--threshold', type=float, default=0.20, help="Allowed p99 / throughput regression")
+    args = parser.parse_args(argv)
+
+    proc = None
+    if args.url:
+        parts = urlsplit(args.url)
+        host, port = parts.hostname, parts.port or 80
+    else:
+        host, port = '127.0.0.1', _free_port()
+        proc = start_server(port, args.workers, args.batch_max, args.batch_wait_ms)
+
+    try:
+        result = asyncio.run(run_load(host, port, args.endpoint, args.concurrency, args.requests, args.duration))
+    finally:
+        if proc is not None:
+            stop_server(proc)
+
+    print(f"{result['endpoint']}: {result['requests']} requests, {result['errors']} errors "
+          f"in {result['seconds']:.2f}s at concurrency {result['concurrency']}")
+    print(f"  throughput {result['throughput_rps']:.1f} req/s | p50 {result['p50_ms']:.2f} ms | "
+          f"p90 {result['p90_ms']:.2f} ms | p99 {result['p99_ms']:.2f} ms | max {result['max_ms']:.2f} ms")
+    if result['server'].get('dcf_batches'):
+        print(f"  DCF batches: {result['server']['dcf_batches']} (mean size {result['server']['dcf_mean_batch']})")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=2)
+        print(f"✓ Results written to {args.output}")
+
+    failures = ["request errors"] if result['errors'] else []
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+        p99_change = result['p99_ms'] / baseline['p99_ms'] - 1 if baseline.get('p99_ms') else 0.0
+        rps_change = result['throughput_rps'] / baseline['throughput_rps'] - 1 if baseline.get('throughput_rps') else 0.0
+        print(f"vs baseline: p99 {p99_change:+.1%}, throughput {rps_change:+.1%}")
+        if p99_change > args.threshold:
+            failures.append(f"p99 regressed {p99_change:+.1%}")
+        if rps_change < -args.threshold:
+            failures.append(f"throughput dropped {rps_change:+.1%}")
+
+    for failure in failures:
+        print(f"❌ {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
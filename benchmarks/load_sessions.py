@@ -0,0 +1,336 @@
+"""
+load_sessions.py - Concurrent-Session Load Test of the Streamlit App
+🏔️ THE MOUNTAIN PATH - World of Finance
+
+Simulates many analysts using the real app.py at once. Every session is an
+AppTest instance (Streamlit's headless testing API) driving
+benchmarks/app_harness.py with its own synthetic workbooks; sessions run
+on concurrent threads in one process, sharing the process-wide caches the
+way sessions of one Streamlit server do.
+
+Scenarios (each in a fresh subprocess, so caches start cold and peak
+memory is per scenario):
+
+    upload  every session uploads its workbooks (parse + first render)
+    tabs    reruns and active-company switches (st.tabs renders every tab
+            on each rerun; the tab strip itself switches client-side)
+    wacc    sweeps the sidebar WACC slider
+    dcf     sweeps the DCF growth and terminal-growth sliders
+    mixed   random mix of the tabs, wacc and dcf interactions
+
+Reported per scenario: rerun latency percentiles, reruns/s across all
+sessions, CPU seconds and utilisation, and peak RSS.
+
+    python -m benchmarks.load_sessions
+    python -m benchmarks.load_sessions --sessions 30 --actions 10 --output sessions.json
+    python -m benchmarks.load_sessions --scenario wacc --scenario dcf --compare sessions.json
+
+--compare exits 1 when a scenario's p99 latency, throughput or peak memory
+regresses beyond --threshold (the acceptance gate for caching and
+rendering changes).
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.synthetic import write_universe
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HARNESS = os.path.join(ROOT, 'benchmarks', 'app_harness.py')
+
+SCENARIOS = ('upload', 'tabs', 'wacc', 'dcf', 'mixed')
+
+# Interactions each scenario draws from
+SCENARIO_ACTIONS = {
+    'tabs': ('rerun', 'company'),
+    'wacc': ('wacc',),
+    'dcf': ('growth', 'terminal'),
+    'mixed': ('rerun', 'company', 'wacc', 'growth', 'terminal'),
+}
+
+
+class PeakRSS:
+    """Samples the process's resident set size in a background thread."""
+
+    def __init__(self, interval=0.02):
+        self.interval = interval
+        self.peak = self.current()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    @staticmethod
+    def current():
+        """Resident bytes now (/proc on Linux; lifetime peak on other Unixes; 0 on Windows)."""
+        try:
+            with open('/proc/self/statm') as f:
+                return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+        except (OSError, ValueError):
+            try:
+                import resource   # Unix only
+            except ImportError:
+                return 0
+            rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            return rss if sys.platform == 'darwin' else rss * 1024
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.peak = max(self.peak, self.current())
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, self.current())
+
+
+def _cpu_seconds():
+    times = os.times()
+    return times.user + times.system
+
+
+def _widget(widgets, prefix):
+    return next(w for w in widgets if w.label.startswith(prefix))
+
+
+def _interact(at, action, rng):
+    """Perform one user interaction and rerun the script."""
+    if action == 'company' and len(at.sidebar.selectbox):
+        box = _widget(at.sidebar.selectbox, '🏢 Active Company')
+        others = [o for o in box.options if o != box.value] or box.options
+        box.select(rng.choice(others))
+    elif action == 'wacc':
+        _widget(at.sidebar.slider, 'Cost of Capital').set_value(rng.choice([8.0, 9.5, 10.0, 11.0, 12.5, 14.0]))
+    elif action == 'growth':
+        _widget(at.slider, 'Step 1').set_value(rng.choice([5.0, 10.0, 15.0, 20.0, 25.0]))
+    elif action == 'terminal':
+        _widget(at.slider, 'Step 2').set_value(rng.choice([2.0, 3.0, 4.0, 5.0]))
+    at.run()
+
+
+def _session(workbooks, timeout):
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(HARNESS, default_timeout=timeout)
+    at.session_state['bench_workbooks'] = workbooks
+    return at
+
+
+def run_scenario(scenario, paths, sessions=30, actions=10, files_per_session=2, think_ms=0.0,
+                 timeout=300, seed=0):
+    """
+    Run one scenario in this process.
+
+    Args:
+        scenario: One of SCENARIOS
+        paths: Synthetic workbook pool; session i uploads files_per_session
+               consecutive workbooks starting at i
+        sessions: Concurrent simulated sessions
+        actions: Timed interactions per session (upload: one cold run each)
+        files_per_session: Workbooks each session uploads
+        think_ms: Pause between a session's interactions
+        timeout: Per-rerun AppTest timeout (seconds)
+        seed: Interaction RNG seed
+
+    Returns:
+        dict with reruns, errors, seconds, throughput_rps, latency
+        percentiles (ms), cpu_seconds, cpu_percent and RSS figures (MiB)
+    """
+    workbooks = [[paths[(i + j) % len(paths)] for j in range(files_per_session)] for i in range(sessions)]
+    apps = [_session(w, timeout) for w in workbooks]
+    pool = ThreadPoolExecutor(max_workers=sessions)
+
+    def run_checked(at):
+        at.run()
+        if at.exception:
+            raise RuntimeError(f"App raised: {at.exception[0].value}")
+
+    # Untimed: sessions other than 'upload' start with their workbooks loaded
+    if scenario != 'upload':
+        list(pool.map(run_checked, apps))
+
+    latencies, errors = [], []
+    lock = threading.Lock()
+    start_gate = threading.Barrier(sessions)
+
+    def drive(index):
+        at = apps[index]
+        rng = random.Random(seed * 1000 + index)
+        start_gate.wait()
+        steps = [None] if scenario == 'upload' else [rng.choice(SCENARIO_ACTIONS[scenario]) for _ in range(actions)]
+        for action in steps:
+            began = time.perf_counter()
+            try:
+                if action is None:
+                    at.run()
+                else:
+                    _interact(at, action, rng)
+                error = at.exception[0].value if at.exception else None
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+            elapsed = (time.perf_counter() - began) * 1000
+            with lock:
+                latencies.append(elapsed)
+                if error:
+                    errors.append(error)
+            if think_ms:
+                time.sleep(think_ms / 1000)
+
+    rss_start = PeakRSS.current()
+    cpu_start = _cpu_seconds()
+    with PeakRSS() as rss:
+        began = time.perf_counter()
+        list(pool.map(drive, range(sessions)))
+        seconds = time.perf_counter() - began
+    cpu = _cpu_seconds() - cpu_start
+    pool.shutdown()
+
+    latencies.sort()
+
+    def pct(q):
+        return round(latencies[min(len(latencies) - 1, int(q * len(latencies)))], 2) if latencies else None
+
+    mib = 1024 * 1024
+    return {
+        'scenario': scenario,
+        'sessions': sessions,
+        'reruns': len(latencies),
+        'errors': len(errors),
+        'first_error': errors[0] if errors else None,
+        'seconds': round(seconds, 3),
+        'throughput_rps': round(len(latencies) / seconds, 2) if seconds else 0.0,
+        'p50_ms': pct(0.50),
+        'p90_ms': pct(0.90),
+        'p99_ms': pct(0.99),
+        'max_ms': round(latencies[-1], 2) if latencies else None,
+        'cpu_seconds': round(cpu, 2),
+        'cpu_percent': round(100 * cpu / seconds, 1) if seconds else 0.0,
+        'rss_start_mib': round(rss_start / mib, 1),
+        'peak_rss_mib': round(rss.peak / mib, 1),
+    }
+
+
+def _run_isolated(scenario, args, paths):
+    """Run one scenario in a fresh interpreter (cold caches, its own peak memory)."""
+    with tempfile.NamedTemporaryFile('r', suffix='.json', delete=False) as f:
+        result_path = f.name
+    cmd = [sys.executable, '-m', 'benchmarks.load_sessions', '--worker', scenario, '--result-file', result_path,
+           '--paths', os.pathsep.join(paths), '--sessions', str(args.sessions), '--actions', str(args.actions),
+           '--files-per-session', str(args.files_per_session), '--think-ms', str(args.think_ms),
+           '--timeout', str(args.timeout), '--seed', str(args.seed)]
+    try:
+        proc = subprocess.run(cmd, cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+        if proc.returncode != 0:
+            raise RuntimeError(f"Scenario {scenario} failed:\n{proc.stderr[-2000:]}")
+        with open(result_path, encoding='utf-8') as f:
+            return json.load(f)
+    finally:
+        os.unlink(result_path)
+
+
+def compare(results, baseline, threshold):
+    """Print per-scenario changes; returns the list of regressions."""
+    failures = []
+    before = {r['scenario']: r for r in baseline.get('results', [])}
+    for result in results:
+        base = before.get(result['scenario'])
+        if base is None:
+            continue
+        checks = (
+            ('p99', result['p99_ms'], base['p99_ms'], 1),
+            ('throughput', result['throughput_rps'], base['throughput_rps'], -1),
+            ('peak memory', result['peak_rss_mib'], base['peak_rss_mib'], 1),
+        )
+        changes = []
+        for label, now, then, direction in checks:
+            change = now / then - 1 if then else 0.0
+            changes.append(f"{label} {change:+.1%}")
+            if direction * change > threshold:
+                failures.append(f"{result['scenario']}: {label} {change:+.1%}")
+        print(f"  vs baseline {result['scenario']}: {', '.join(changes)}")
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Concurrent-session load test of the Streamlit app")
+    parser.add_argument('--scenario', action='append', choices=SCENARIOS,
+                        help="Scenario to run (repeatable; default: all)")
+    parser.add_argument('--sessions', type=int, default=30, help="Concurrent simulated sessions")
+    parser.add_argument('--actions', type=int, default=10, help="Timed interactions per session")
+    parser.add_argument('--files-per-session', type=int, default=2, help="Workbooks each session uploads")
+    parser.add_argument('--companies', type=int, default=12, help="Synthetic workbooks in the shared pool")
+    parser.add_argument('--think-ms', type=float, default=0.0, help="Pause between a session's interactions")
+    parser.add_argument('--timeout', type=float, default=300, help="Per-rerun timeout in seconds")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help="Write results JSON to this path")
+    parser.add_argument('--compare', help="Baseline results JSON to compare against")
+    parser.add_argument('--threshold', type=float, default=0.20, help="Allowed p99 / throughput / memory regression")
+    parser.add_argument('--worker', choices=SCENARIOS, help=argparse.SUPPRESS)
+    parser.add_argument('--result-file', help=argparse.SUPPRESS)
+    parser.add_argument('--paths', help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = run_scenario(args.worker, args.paths.split(os.pathsep), args.sessions, args.actions,
+                                  args.files_per_session, args.think_ms, args.timeout, args.seed)
+        with open(args.result_file, 'w', encoding='utf-8') as f:
+            json.dump(result, f)
+        return 0
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = write_universe(tmp, args.companies, args.seed)
+        for scenario in args.scenario or SCENARIOS:
+            result = _run_isolated(scenario, args, paths)
+            results.append(result)
+            print(f"{scenario}: {result['reruns']} reruns, {result['errors']} errors in {result['seconds']:.1f}s "
+                  f"({result['sessions']} sessions)")
+            print(f"  throughput {result['throughput_rps']:.2f} reruns/s | p50 {result['p50_ms']:.0f} ms | "
+                  f"p90 {result['p90_ms']:.0f} ms | p99 {result['p99_ms']:.0f} ms | max {result['max_ms']:.0f} ms")
+            print(f"  CPU {result['cpu_seconds']:.1f}s ({result['cpu_percent']:.0f}%) | "
+                  f"peak RSS {result['peak_rss_mib']:.0f} MiB (start {result['rss_start_mib']:.0f} MiB)")
+            if result['first_error']:
+                print(f"  first error: {result['first_error']}")
+
+    report = {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'cpus': os.cpu_count(),
+            'params': {k: getattr(args, k) for k in ('sessions', 'actions', 'files_per_session', 'companies',
+                                                     'think_ms', 'seed')},
+        },
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"✓ Results written to {args.output}")
+
+    failures = [f"{r['scenario']}: {r['errors']} rerun errors" for r in results if r['errors']]
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+        if baseline.get('meta', {}).get('params') != report['meta']['params']:
+            print("⚠️  Baseline was recorded with different parameters")
+        failures += compare(results, baseline, args.threshold)
+
+    for failure in failures:
+        print(f"❌ {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,300 @@
+"""
+run_benchmarks.py - End-to-End Performance Benchmarks
+🏔️ THE MOUNTAIN PATH - World of Finance
+
+Times every stage of the analysis pipeline on synthetic Screener.in
+workbooks (see benchmarks/synthetic.py) and records peak Python memory
+allocated per stage:
+
+    loader       UniversalScreenerLoader.get_processed_data()
+    financial    every FinancialAnalyzer table the tabs render
+    eva          EVAAnalyzer.calculate_eva()
+    dcf          calculate_dcf()
+    sensitivity  get_sensitivity_matrix() on the DCF tab's 5×5 grid
+    thesis       ThesisEngine.get_full_analysis()
+    panel        panel-level analyzers over the whole synthetic universe
+    scenarios    20 saved scenarios × every company, one batched evaluation
+    forecast     batched FCF model fits + multi-year DCF for the whole universe
+    pipeline     upload-to-render: cold AppTest run of app.py, then a rerun
+
+Results are written as JSON; --compare flags stages whose median time
+regressed beyond --threshold against a previous run (exit code 1).
+
+    python -m benchmarks.run_benchmarks --output bench.json
+    python -m benchmarks.run_benchmarks --compare bench.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.synthetic import write_screener_workbook, write_universe
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def measure(fn, repeat=5, warmup=1):
+    """
+    Time fn() `repeat` times (after `warmup` untimed calls) and measure the
+    peak memory of one extra traced call, so tracing never skews timings.
+
+    Returns:
+        dict with min/median/mean milliseconds, peak_kib and repeat
+    """
+    for _ in range(warmup):
+        fn()
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'min_ms': round(min(timings), 3),
+        'median_ms': round(statistics.median(timings), 3),
+        'mean_ms': round(statistics.fmean(timings), 3),
+        'peak_kib': round(peak / 1024, 1),
+        'repeat': repeat,
+    }
+
+
+def _quiet(fn):
+    """Run fn with the analyzers' console output discarded."""
+    def wrapper():
+        with contextlib.redirect_stdout(io.StringIO()):
+            return fn()
+    return wrapper
+
+
+def component_benchmarks(workbook, repeat=5):
+    """Per-stage benchmarks on one workbook (raw bytes)."""
+    from src.core.data_loader import UniversalScreenerLoader
+    from src.analysis.financial import FinancialAnalyzer
+    from src.analysis.eva import EVAAnalyzer
+    from src.analysis.thesis import ThesisEngine
+    from src.analysis.valuation import calculate_dcf, get_sensitivity_matrix
+
+    def load():
+        return UniversalScreenerLoader(io.BytesIO(workbook)).get_processed_data()
+
+    data, metadata = _quiet(load)()
+    if data is None:
+        raise RuntimeError("Synthetic workbook failed loader validation")
+
+    def financial():
+        analyzer = FinancialAnalyzer(data)
+        analyzer.get_profitability_metrics()
+        analyzer.get_solvency_metrics()
+        analyzer.get_efficiency_metrics()
+        analyzer.get_growth_summary()
+        analyzer.get_dilution_metrics()
+        analyzer.get_dupont_metrics()
+
+    wacc, growth, t_growth = 0.12, 0.15, 0.04
+    fcf = float(data.set_index('Report Date').loc['Net profit'].iloc[-1])
+    wacc_range = [round(wacc + i, 3) for i in [-0.02, -0.01, 0, 0.01, 0.02]]
+    growth_range = [round(growth + i, 3) for i in [-0.04, -0.02, 0, 0.02, 0.04]]
+    dcf_value = calculate_dcf(fcf, growth, wacc, t_growth)
+
+    stages = {
+        'loader': load,
+        'financial': financial,
+        'eva': lambda: EVAAnalyzer(data, wacc).calculate_eva(),
+        'dcf': lambda: calculate_dcf(fcf, growth, wacc, t_growth),
+        'sensitivity': lambda: get_sensitivity_matrix(fcf, growth_range, wacc_range, t_growth),
+        'thesis': lambda: ThesisEngine(data, dcf_value, metadata['current_price']).get_full_analysis(),
+    }
+    return {name: measure(_quiet(fn), repeat) for name, fn in stages.items()}
+
+
+def universe_panel(paths):
+    """(Company, Year) panel and current prices of the synthetic universe."""
+    from src.core.ingest import load_workbooks
+    from src.core.panel import build_panel
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        results = load_workbooks(paths, max_workers=1)
+    valid = [r for r in results if r['data'] is not None]
+    prices = {r['name']: r['metadata']['current_price'] for r in valid}
+    return build_panel({r['name']: r['data'] for r in valid}), prices
+
+
+def panel_benchmark(panel, repeat=3):
+    """Panel-level analyzers over every synthetic company at once."""
+    from src.analysis.out_of_core import evaluate_panel
+
+    result = measure(_quiet(lambda: evaluate_panel(panel)), repeat)
+    result['rows'] = len(panel)
+    return result
+
+
+def forecast_benchmark(panel, repeat=3):
+    """Fit every FCF forecasting model for the whole universe and value the ensemble paths."""
+    from src.analysis.forecast import forecast_dcf
+
+    result = measure(lambda: forecast_dcf(panel, 0.12, 0.04), repeat)
+    result['companies'] = panel.index.get_level_values('Company').nunique()
+    return result
+
+
+def scenario_benchmark(panel, prices, scenarios=20, repeat=3):
+    """Every company × scenarios saved assumption sets: one batched DCF / EVA / thesis evaluation."""
+    from src.analysis.scenarios import ScenarioEvaluator, scenario_inputs
+
+    inputs = scenario_inputs(panel, prices)
+    assumptions = {f"S{k}": {'wacc': 0.09 + 0.0025 * k, 'growth_rate': 0.05 + 0.01 * k, 'terminal_growth': 0.04}
+                   for k in range(scenarios)}
+    # Fresh evaluator per run: measures the computation, not the memo
+    result = measure(lambda: ScenarioEvaluator().evaluate(inputs, assumptions), repeat)
+    result['pairs'] = len(inputs) * scenarios
+    return result
+
+
+def pipeline_benchmark(paths, repeat=3, timeout=120):
+    """
+    Upload-to-render: a fresh AppTest session parsing every workbook and
+    rendering all tabs ('cold' - new session state, process-wide Streamlit
+    caches already populated), then widget-free reruns of one session
+    ('rerun').
+    """
+    from streamlit.testing.v1 import AppTest
+
+    harness = os.path.join(ROOT, 'benchmarks', 'app_harness.py')
+    os.environ['BENCH_WORKBOOKS'] = os.pathsep.join(paths)
+
+    def cold():
+        at = AppTest.from_file(harness, default_timeout=timeout).run()
+        if at.exception:
+            raise RuntimeError(f"App raised: {at.exception[0].value}")
+        return at
+
+    session = _quiet(cold)()
+    results = {
+        'cold': measure(_quiet(cold), repeat, warmup=0),
+        'rerun': measure(_quiet(lambda: session.run()), repeat),
+    }
+    results['cold']['files'] = len(paths)
+    return results
+
+
+def _git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                              capture_output=True, text=True, timeout=10).stdout.strip() or None
+    except Exception:
+        return None
+
+
+def run(args):
+    params = {
+        'years': args.years, 'quarters': args.quarters, 'pl_metrics': args.pl_metrics,
+        'bs_metrics': args.bs_metrics, 'cf_metrics': args.cf_metrics, 'companies': args.companies,
+    }
+    section_sizes = {k: v for k, v in params.items() if k not in ('companies',)}
+    report = {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'revision': _git_revision(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpus': os.cpu_count(),
+            'params': params,
+        },
+        'results': {},
+    }
+
+    workbook = write_screener_workbook(company_name='Benchmark Ltd', seed=args.seed, **section_sizes)
+    report['results'].update(component_benchmarks(workbook, args.repeat))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = write_universe(tmp, args.companies, args.seed, **section_sizes)
+        panel, prices = universe_panel(paths)
+        report['results']['panel'] = panel_benchmark(panel, args.repeat)
+        report['results']['scenarios'] = scenario_benchmark(panel, prices, repeat=args.repeat)
+        report['results']['forecast'] = forecast_benchmark(panel, args.repeat)
+        if not args.skip_pipeline:
+            for name, result in pipeline_benchmark(paths, max(1, args.repeat // 2)).items():
+                report['results'][f'pipeline_{name}'] = result
+
+    return report
+
+
+def compare(current, baseline, threshold):
+    """
+    Print a stage-by-stage comparison.
+
+    Returns:
+        List of stage names whose median time regressed by more than threshold.
+    """
+    regressions = []
+    if baseline.get('meta', {}).get('params') != current['meta']['params']:
+        print("⚠️  Baseline was recorded with different workbook parameters")
+    print(f"{'Stage':<18}{'Baseline ms':>14}{'Current ms':>14}{'Change':>10}")
+    for stage, result in current['results'].items():
+        before = baseline.get('results', {}).get(stage)
+        if before is None:
+            print(f"{stage:<18}{'-':>14}{result['median_ms']:>14.3f}{'new':>10}")
+            continue
+        change = result['median_ms'] / before['median_ms'] - 1 if before['median_ms'] else 0.0
+        flag = " ⚠️" if change > threshold else ""
+        print(f"{stage:<18}{before['median_ms']:>14.3f}{result['median_ms']:>14.3f}{change:>+10.1%}{flag}")
+        if change > threshold:
+            regressions.append(stage)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mountain Path performance benchmarks")
+    parser.add_argument('--output', help="Write results JSON to this path")
+    parser.add_argument('--compare', help="Baseline results JSON to compare against")
+    parser.add_argument('--threshold', type=float, default=0.20, help="Allowed median slowdown (0.20 = 20%%)")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--companies', type=int, default=8, help="Workbooks in the panel/pipeline universe")
+    parser.add_argument('--years', type=int, default=10)
+    parser.add_argument('--quarters', type=int, default=10)
+    parser.add_argument('--pl-metrics', type=int, default=15)
+    parser.add_argument('--bs-metrics', type=int, default=16)
+    parser.add_argument('--cf-metrics', type=int, default=4)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--skip-pipeline', action='store_true', help="Skip the AppTest upload-to-render stage")
+    args = parser.parse_args(argv)
+
+    report = run(args)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"✓ Results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.threshold)
+        if regressions:
+            print(f"❌ Regressed beyond {args.threshold:.0%}: {', '.join(regressions)}")
+            return 1
+        print("✓ No regressions")
+    elif not args.output:
+        print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
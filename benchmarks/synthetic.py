@@ -0,0 +1,222 @@
+"""
+synthetic.py - Synthetic Screener.in Workbook Generator
+🏔️ THE MOUNTAIN PATH - World of Finance
+
+Writes 'Data Sheet' workbooks in the layout UniversalScreenerLoader expects
+(META block at fixed rows, PROFIT & LOSS header at row 14, then QUARTERS,
+BALANCE SHEET, CASH FLOW, PRICE and DERIVED sections), with internally
+consistent, randomly drifting financials.
+
+    python -m benchmarks.synthetic out_dir --companies 20 --years 12
+"""
+
+import argparse
+import io
+import os
+from datetime import datetime, timedelta
+
+import numpy as np
+from openpyxl import Workbook
+
+PL_METRICS = [
+    'Sales', 'Raw Material Cost', 'Change in Inventory', 'Power and Fuel', 'Other Mfr. Exp',
+    'Employee Cost', 'Selling and admin', 'Other Expenses', 'Other Income', 'Depreciation',
+    'Interest', 'Profit before tax', 'Tax', 'Net profit', 'Dividend Amount',
+]
+QUARTER_METRICS = [
+    'Sales', 'Expenses', 'Other Income', 'Depreciation', 'Interest',
+    'Profit before tax', 'Tax', 'Net profit', 'Operating Profit',
+]
+BS_METRICS = [
+    'Equity Share Capital', 'Reserves', 'Borrowings', 'Other Liabilities', 'Total',
+    'Net Block', 'Capital Work in Progress', 'Investments', 'Other Assets', 'Total',
+    'Receivables', 'Inventory', 'Cash & Bank', 'No. of Equity Shares', 'New Bonus Shares', 'Face value',
+]
+CF_METRICS = [
+    'Cash from Operating Activity', 'Cash from Investing Activity',
+    'Cash from Financing Activity', 'Net Cash Flow',
+]
+
+
+def _pad(names, count, prefix):
+    """Trim or extend a metric list to `count` rows (extra rows are filler line items)."""
+    if count <= len(names):
+        return names[:count]
+    return names + [f'{prefix} Item {i}' for i in range(1, count - len(names) + 1)]
+
+
+def generate_company(years=10, quarters=10, seed=0, base_sales=None):
+    """
+    Simulated fundamentals for one company.
+
+    Returns:
+        dict with annual 'pl', 'bs', 'cf' and 'quarters' value dicts (metric -> list),
+        plus 'dates', 'quarter_dates' and scalar 'price', 'shares'.
+    """
+    rng = np.random.default_rng(seed)
+    base_sales = base_sales or float(rng.lognormal(7, 1.2))
+    growth = rng.normal(0.10, 0.06)
+    sales = base_sales * np.cumprod(1 + rng.normal(growth, 0.08, years).clip(-0.5, 1.0))
+
+    margin = np.clip(rng.normal(0.12, 0.05) + rng.normal(0, 0.02, years), -0.2, 0.45)
+    pbt = sales * margin
+    interest = sales * abs(rng.normal(0.02, 0.01))
+    tax = np.where(pbt > 0, pbt * 0.25, 0)
+    net = pbt - tax
+    depreciation = sales * abs(rng.normal(0.04, 0.01))
+    other_income = sales * abs(rng.normal(0.01, 0.005))
+    expenses = sales - pbt - interest - depreciation + other_income
+
+    raw_material = expenses * 0.55
+    pl = {
+        'Sales': sales, 'Raw Material Cost': raw_material, 'Change in Inventory': sales * rng.normal(0, 0.005, years),
+        'Power and Fuel': expenses * 0.05, 'Other Mfr. Exp': expenses * 0.08, 'Employee Cost': expenses * 0.15,
+        'Selling and admin': expenses * 0.10, 'Other Expenses': expenses * 0.07, 'Other Income': other_income,
+        'Depreciation': depreciation, 'Interest': interest, 'Profit before tax': pbt, 'Tax': tax,
+        'Net profit': net, 'Dividend Amount': np.maximum(net, 0) * 0.3,
+    }
+
+    shares = float(rng.integers(5, 500)) * 1e6
+    equity_capital = np.full(years, shares / 1e7)
+    reserves = np.maximum(np.cumsum(np.maximum(net, 0) * 0.7) + sales[0] * 0.3, 1)
+    borrowings = (equity_capital + reserves) * abs(rng.normal(0.5, 0.4))
+    other_liabilities = sales * 0.2
+    total = equity_capital + reserves + borrowings + other_liabilities
+    net_block = total * 0.45
+    receivables = sales * abs(rng.normal(0.15, 0.05))
+    inventory = sales * abs(rng.normal(0.12, 0.05))
+    cash = total * 0.05
+    bs = {
+        'Equity Share Capital': equity_capital, 'Reserves': reserves, 'Borrowings': borrowings,
+        'Other Liabilities': other_liabilities, 'Total': total, 'Net Block': net_block,
+        'Capital Work in Progress': total * 0.05, 'Investments': total * 0.10,
+        'Other Assets': total - net_block - total * 0.15, 'Receivables': receivables, 'Inventory': inventory,
+        'Cash & Bank': cash, 'No. of Equity Shares': np.full(years, shares),
+        'New Bonus Shares': np.zeros(years), 'Face value': np.ones(years),
+    }
+
+    cfo = net + depreciation - np.diff(receivables + inventory, prepend=receivables[0] + inventory[0])
+    cfi = -depreciation * 1.3
+    cff = -np.maximum(net, 0) * 0.3
+    cf = {
+        'Cash from Operating Activity': cfo, 'Cash from Investing Activity': cfi,
+        'Cash from Financing Activity': cff, 'Net Cash Flow': cfo + cfi + cff,
+    }
+
+    last_q_sales = sales[-1] / 4
+    q_sales = last_q_sales * np.cumprod(1 + rng.normal(growth / 4, 0.04, quarters))
+    q_margin = margin[-1] + rng.normal(0, 0.01, quarters)
+    q_pbt = q_sales * q_margin
+    q_tax = np.where(q_pbt > 0, q_pbt * 0.25, 0)
+    q = {
+        'Sales': q_sales, 'Expenses': q_sales * (1 - q_margin - 0.06), 'Other Income': q_sales * 0.01,
+        'Depreciation': q_sales * 0.04, 'Interest': q_sales * 0.02, 'Profit before tax': q_pbt,
+        'Tax': q_tax, 'Net profit': q_pbt - q_tax, 'Operating Profit': q_sales * (q_margin + 0.06),
+    }
+
+    end_year = 2025
+    dates = [datetime(end_year - years + i, 3, 31) for i in range(years)]
+    quarter_dates = [datetime(end_year, 3, 31) - timedelta(days=91 * (quarters - 1 - i)) for i in range(quarters)]
+    eps = net[-1] * 1e7 / shares
+    price = float(max(eps, 1) * abs(rng.normal(25, 8)))
+
+    return {
+        'pl': pl, 'bs': bs, 'cf': cf, 'quarters': q,
+        'dates': dates, 'quarter_dates': quarter_dates,
+        'price': price, 'shares': shares,
+    }
+
+
+def write_screener_workbook(target=None, company_name='Synthetic Co', years=10, quarters=10,
+                            pl_metrics=len(PL_METRICS), bs_metrics=len(BS_METRICS),
+                            cf_metrics=len(CF_METRICS), seed=0):
+    """
+    Write one synthetic 'Data Sheet' workbook.
+
+    Args:
+        target: Output path; None returns the workbook as bytes
+        company_name: Value written to the COMPANY NAME cell
+        years: Annual report columns
+        quarters: Quarterly report columns
+        pl_metrics / bs_metrics / cf_metrics: Rows per section (filler items
+            are appended beyond the standard Screener line items)
+        seed: RNG seed (same seed -> identical workbook contents)
+    """
+    company = generate_company(years, quarters, seed)
+    shares_cr = company['shares'] / 1e7
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet('Data Sheet')
+    rows = []
+
+    filler = company['pl']['Sales'] * 0.01
+
+    def section_rows(values, names, dates, header):
+        block = [[header], ['Report Date'] + dates]
+        for name in names:
+            series = values.get(name)
+            if series is None:
+                series = filler[-len(dates):] if len(dates) <= len(filler) else np.resize(filler, len(dates))
+            block.append([name] + [round(float(v), 2) for v in series])
+        return block
+
+    # META block (fixed rows read by _extract_metadata_fixed)
+    rows += [['COMPANY NAME', company_name], ['LATEST VERSION', '0.9'], ['CURRENT VERSION', '0.9'], [],
+             ['META'], ['Number of shares', round(shares_cr, 4)], ['Face Value', 1],
+             ['Current Price', round(company['price'], 2)],
+             ['Market Capitalization', round(company['price'] * shares_cr, 2)]]
+    rows += [[] for _ in range(14 - len(rows))]
+
+    rows += section_rows(company['pl'], _pad(PL_METRICS, pl_metrics, 'P&L'), company['dates'], 'PROFIT & LOSS')
+    rows += [[]]
+    rows += section_rows(company['quarters'], QUARTER_METRICS, company['quarter_dates'], 'Quarters')
+    rows += [[]]
+    rows += section_rows(company['bs'], _pad(BS_METRICS, bs_metrics, 'BS'), company['dates'], 'BALANCE SHEET')
+    rows += [[]]
+    rows += section_rows(company['cf'], _pad(CF_METRICS, cf_metrics, 'CF'), company['dates'], 'CASH FLOW:')
+    rows += [[]]
+    prices = company['price'] * np.cumprod(np.full(years, 0.9))[::-1]
+    rows += [['PRICE:'] + [round(float(p), 2) for p in prices]]
+    rows += [[], ['DERIVED:'], ['Adjusted Equity Shares in Cr'] + [round(shares_cr, 4)] * years]
+
+    for row in rows:
+        ws.append(row)
+
+    if target is None:
+        buffer = io.BytesIO()
+        wb.save(buffer)
+        return buffer.getvalue()
+    wb.save(target)
+    return target
+
+
+def write_universe(out_dir, companies=20, seed=0, **kwargs):
+    """Write `companies` workbooks to out_dir; returns the file paths."""
+    os.makedirs(out_dir, exist_ok=True)
+    paths = []
+    for i in range(companies):
+        path = os.path.join(out_dir, f'synthetic_{i:05d}.xlsx')
+        write_screener_workbook(path, company_name=f'Synthetic {i:05d} Ltd', seed=seed + i, **kwargs)
+        paths.append(path)
+    return paths
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate synthetic Screener.in 'Data Sheet' workbooks")
+    parser.add_argument('out_dir')
+    parser.add_argument('--companies', type=int, default=20)
+    parser.add_argument('--years', type=int, default=10)
+    parser.add_argument('--quarters', type=int, default=10)
+    parser.add_argument('--pl-metrics', type=int, default=len(PL_METRICS))
+    parser.add_argument('--bs-metrics', type=int, default=len(BS_METRICS))
+    parser.add_argument('--cf-metrics', type=int, default=len(CF_METRICS))
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    paths = write_universe(args.out_dir, args.companies, args.seed, years=args.years, quarters=args.quarters,
+                           pl_metrics=args.pl_metrics, bs_metrics=args.bs_metrics, cf_metrics=args.cf_metrics)
+    print(f"✓ Wrote {len(paths)} workbooks to {args.out_dir}")
+
+
+if __name__ == '__main__':
+    main()
@@ -1 +1,37 @@
+"""
+Analysis engines, resolved lazily by name.
 
+Engine modules pull in heavy dependencies (scipy for peer search, pyarrow
+for the Parquet paths), so the app looks them up here at the point of use
+instead of importing them at startup:
+
+    EVAAnalyzer = get_engine('eva')
+"""
+
+import importlib
+
+# Engine name -> (module, attribute)
+ENGINES = {
+    'financial': ('src.analysis.financial', 'FinancialAnalyzer'),
+    'dupont': ('src.analysis.dupont', 'DuPontAnalyzer'),
+    'eva': ('src.analysis.eva', 'EVAAnalyzer'),
+    'growth': ('src.analysis.growth', 'GrowthAnalyzer'),
+    'thesis': ('src.analysis.thesis', 'ThesisEngine'),
+    'ttm': ('src.analysis.ttm', 'TTMEngine'),
+    'peers': ('src.analysis.peers', 'PeerFinder'),
+    'peer_features': ('src.analysis.peers', 'fundamental_features'),
+    'sector_benchmarks': ('src.analysis.benchmarks', 'SectorBenchmarks'),
+    'benchmark_metrics': ('src.analysis.benchmarks', 'benchmark_metrics'),
+    'valuation': ('src.analysis.valuation', 'calculate_dcf'),
+    'sensitivity': ('src.analysis.valuation', 'get_sensitivity_matrix'),
+    'scenario_store': ('src.analysis.scenarios', 'ScenarioStore'),
+    'scenario_evaluator': ('src.analysis.scenarios', 'ScenarioEvaluator'),
+    'forecast': ('src.analysis.forecast', 'FCFForecaster'),
+    'backtest': ('src.analysis.backtest', 'Backtester'),
+}
+
+
+def get_engine(name):
+    """Import (on first use) and return the engine registered under name."""
+    module_name, attribute = ENGINES[name]
+    return getattr(importlib.import_module(module_name), attribute)
@@ -0,0 +1,313 @@
+"""
+backtest.py - Point-in-Time DCF and Thesis Backtest
+🏔️ THE MOUNTAIN PATH - World of Finance
+
+How well would the Mountain Score (ThesisEngine.generate_verdict rules)
+and DCF upside have predicted returns? For every fiscal year a portfolio is
+formed on BACKTEST_FORMATION_DATE using only what was public then:
+
+    - an annual report counts from period end + BACKTEST_REPORT_LAG_DAYS
+    - each company is scored on its latest public report (dropped if older
+      than BACKTEST_MAX_STALENESS_DAYS)
+    - DCF: FCF proxy (estimate_fcf_proxy) grown at the log-linear FCF trend
+      of the reports public so far (the forecast.py log_linear model), or a
+      fixed growth rate
+    - valuation check: intrinsic value per share (fair value × 1e7 /
+      No. of Equity Shares) against the price on the formation date
+    - Mountain Score: ThesisEngine.score_panel on the same rows
+
+Forward returns over BACKTEST_HORIZON_DAYS come from a local price history
+CSV, either long (Date, Company, Price) or wide (Date, one column per
+company), and are summarised by score bucket and by upside quantile.
+
+Re-evaluation is incremental: reports are replayed once, in the order they
+became public. Each formation date only folds the newly public reports
+into per-company state (latest row, running sums of the trend regression),
+then scores every company in one vectorized pass - no per-year recompute
+of the history, so ten years of 5,000 companies take seconds.
+
+    python -m src.analysis.backtest prices.csv
+    python -m src.analysis.backtest prices.csv --store data/universe --output backtest.csv
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.analysis.thesis import ThesisEngine
+from src.analysis.valuation import calculate_dcf_batch, value_per_share
+from src.core.config import (BACKTEST_FORMATION_DATE, BACKTEST_REPORT_LAG_DAYS, BACKTEST_MAX_STALENESS_DAYS,
+                             BACKTEST_HORIZON_DAYS, BACKTEST_PRICE_TOLERANCE_DAYS, FINANCIAL_DEFAULTS,
+                             FORECAST_MIN_YEARS, FORECAST_GROWTH_BOUNDS, UNIVERSE_STORE_PATH)
+from src.core.log import get_logger
+
+logger = get_logger('src.analysis.backtest')  # also when run as __main__
+
+# Panel columns the DCF and thesis rules read
+INPUT_METRICS = ['Net profit', 'Depreciation', 'Sales', 'Profit before tax', 'Equity Share Capital', 'Reserves',
+                 'Borrowings', 'No. of Equity Shares']
+
+
+def load_price_history(path):
+    """
+    Read a price history CSV.
+
+    Args:
+        path: Long (Date, Company, Price) or wide (Date + one column per company) CSV
+
+    Returns:
+        Long DataFrame with Date (datetime64), Company and Price, sorted by Date
+    """
+    frame = pd.read_csv(path)
+    if 'Date' not in frame.columns:
+        raise ValueError(f"{path}: price history needs a 'Date' column")
+    if not {'Company', 'Price'} <= set(frame.columns):
+        frame = frame.melt(id_vars='Date', var_name='Company', value_name='Price')
+    frame = frame[['Date', 'Company', 'Price']].copy()
+    frame['Date'] = pd.to_datetime(frame['Date'], errors='coerce')
+    frame['Company'] = frame['Company'].astype(str)
+    frame['Price'] = pd.to_numeric(frame['Price'], errors='coerce')
+    frame = frame.dropna()
+    return frame[frame['Price'] > 0].sort_values('Date', kind='mergesort').reset_index(drop=True)
+
+
+def prices_on(prices, companies, dates, tolerance_days=BACKTEST_PRICE_TOLERANCE_DAYS):
+    """Latest price on or before each (company, date) pair, NaN if none within tolerance."""
+    query = pd.DataFrame({'Company': np.asarray(companies, dtype=object).astype(str),
+                          'Date': pd.to_datetime(dates).astype('datetime64[ns]'), 'order': np.arange(len(companies))})
+    prices = prices.astype({'Date': 'datetime64[ns]'})
+    merged = pd.merge_asof(query.sort_values('Date', kind='mergesort'), prices, on='Date', by='Company',
+                           direction='backward', tolerance=pd.Timedelta(days=tolerance_days))
+    return merged.sort_values('order')['Price'].to_numpy(dtype=float)
+
+
+class Backtester:
+    def __init__(self, panel, prices, wacc=FINANCIAL_DEFAULTS['wacc_default'] / 100,
+                 terminal_growth=FINANCIAL_DEFAULTS['terminal_growth'], growth_rate=None,
+                 formation_date=BACKTEST_FORMATION_DATE, report_lag_days=BACKTEST_REPORT_LAG_DAYS,
+                 max_staleness_days=BACKTEST_MAX_STALENESS_DAYS, horizon_days=BACKTEST_HORIZON_DAYS,
+                 min_years=FORECAST_MIN_YEARS, growth_bounds=FORECAST_GROWTH_BOUNDS):
+        """
+        Args:
+            panel: (Company, Year) panel; Year holds period-end dates ('2024-03-31')
+            prices: load_price_history() frame
+            wacc, terminal_growth: DCF rates (decimals)
+            growth_rate: Fixed 5Y growth (decimal); None fits the point-in-time
+                         log-linear FCF trend (explicit_growth default until
+                         min_years of positive FCF are public)
+            formation_date: 'MM-DD' of each year's portfolio formation
+            report_lag_days: Days after period end before a report is public
+            max_staleness_days: Oldest latest-report age still scored
+            horizon_days: Forward-return window
+            min_years, growth_bounds: Trend fit settings (see forecast.py)
+        """
+        panel = panel.dropna(how='all')
+        self.panel = panel.reindex(columns=INPUT_METRICS).fillna(0)
+        self.prices = prices
+        self.wacc = wacc
+        self.terminal_growth = terminal_growth
+        self.growth_rate = growth_rate
+        self.formation_date = formation_date
+        self.report_lag = pd.Timedelta(days=report_lag_days)
+        self.max_staleness = pd.Timedelta(days=max_staleness_days)
+        self.horizon = pd.Timedelta(days=horizon_days)
+        self.min_years = min_years
+        self.growth_bounds = growth_bounds
+
+    def formation_dates(self):
+        """One formation date per fiscal year, from the first report that can be public."""
+        periods = pd.to_datetime(self.panel.index.get_level_values('Year'), errors='coerce').dropna()
+        if periods.empty:
+            return []
+        first, last = (periods.min() + self.report_lag).year, (periods.max() + self.report_lag).year
+        dates = [pd.Timestamp(f"{year}-{self.formation_date}") for year in range(first, last + 1)]
+        return [d for d in dates if d >= periods.min() + self.report_lag]
+
+    def run(self):
+        """
+        Score every company on every formation date and attach forward returns.
+
+        Returns:
+            DataFrame indexed by (Formation Date, Company) with the report
+            used, DCF inputs and value, price, upside, ROE, D/E, Mountain
+            Score and Forward Return %
+        """
+        codes, companies = pd.factorize(self.panel.index.get_level_values('Company'))
+        periods = pd.to_datetime(self.panel.index.get_level_values('Year'), errors='coerce')
+        values = self.panel.to_numpy(dtype=float)
+        fcf_all = values[:, 0] + values[:, 1] * 0.3   # estimate_fcf_proxy()
+        t_all = (periods.year + (periods.month - 1) / 12).to_numpy(dtype=float)   # annual reports one apart
+
+        # Reports in the order they became public
+        public = (periods + self.report_lag).to_numpy()
+        order = np.argsort(public, kind='mergesort')
+        order = order[~pd.isna(public[order])]
+
+        n = len(companies)
+        latest = np.full((n, values.shape[1]), np.nan)
+        latest_period = np.full(n, np.datetime64('NaT'), dtype='datetime64[ns]')
+        latest_fcf = np.full(n, np.nan)
+        sums = np.zeros((5, n))   # running Σw, Σt, Σt², Σy, Σty of ln FCF ~ a + b·t
+
+        frames = []
+        cursor = 0
+        for date in self.formation_dates():
+            # Fold in the reports that became public since the last formation date
+            stop = np.searchsorted(public[order], np.datetime64(date), side='right')
+            batch = order[cursor:stop]
+            cursor = stop
+            if len(batch):
+                batch = batch[np.lexsort((periods.to_numpy()[batch], codes[batch]))]
+                positive = batch[fcf_all[batch] > 0]
+                t, y = t_all[positive], np.log(fcf_all[positive])
+                for k, term in enumerate((np.ones_like(t), t, t * t, y, t * y)):
+                    np.add.at(sums[k], codes[positive], term)
+                # Latest report per company: last of each company's run in the sorted batch
+                last = batch[np.r_[codes[batch][1:] != codes[batch][:-1], True]]
+                newer = ~(latest_period[codes[last]] >= periods.to_numpy()[last])
+                last = last[newer]
+                latest[codes[last]] = values[last]
+                latest_period[codes[last]] = periods.to_numpy()[last]
+                latest_fcf[codes[last]] = fcf_all[last]
+
+            live = ~np.isnat(latest_period) & (latest_period >= np.datetime64(date - self.max_staleness))
+            if live.any():
+                frames.append(self._score(date, companies, live, latest, latest_period, latest_fcf, sums))
+
+        if not frames:
+            return pd.DataFrame()
+        result = pd.concat(frames)
+
+        # Forward returns: price on the formation date vs horizon later
+        end = prices_on(self.prices, result.index.get_level_values('Company'),
+                        result.index.get_level_values('Formation Date') + self.horizon)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            result['Forward Return %'] = ((end / result['Price'].to_numpy() - 1) * 100).round(2)
+        return result
+
+    def _growth(self, sums, latest_fcf):
+        """Point-in-time 5Y growth: fitted log-linear FCF trend where enough positive years are public."""
+        if self.growth_rate is not None:
+            return np.full(sums.shape[1], float(self.growth_rate))
+        s0, st, stt, sy, sty = sums
+        with np.errstate(divide='ignore', invalid='ignore'):
+            slope = (s0 * sty - st * sy) / (s0 * stt - st * st)
+        fitted = (s0 >= self.min_years) & (latest_fcf > 0) & np.isfinite(slope)
+        growth = np.clip(np.expm1(np.where(fitted, slope, 0.0)), *self.growth_bounds)
+        return np.where(fitted, growth, FINANCIAL_DEFAULTS['explicit_growth'])
+
+    def _score(self, date, companies, live, latest, latest_period, latest_fcf, sums):
+        """DCF, valuation check and Mountain Score for every live company on one formation date."""
+        rows = pd.DataFrame(latest[live], columns=INPUT_METRICS)
+        names = companies[live]
+        fcf = latest_fcf[live]
+        growth = self._growth(sums[:, live], fcf)
+        fair_value = calculate_dcf_batch(fcf, growth, self.wacc, self.terminal_growth)
+
+        price = prices_on(self.prices, names, np.full(len(names), date))
+        per_share = value_per_share(fair_value, rows['No. of Equity Shares'].to_numpy())
+        with np.errstate(divide='ignore', invalid='ignore'):
+            upside = (per_share / price - 1) * 100
+
+        thesis = ThesisEngine.score_panel(rows, per_share, price)
+        return pd.DataFrame({
+            'Report': latest_period[live],
+            'FCF': fcf.round(2),
+            'Growth %': (growth * 100).round(2),
+            'Fair Value': fair_value.round(2),
+            'Value / Share': per_share.round(2),
+            'Price': price,
+            'Upside %': upside.round(2),
+            'ROE %': thesis['ROE %'].to_numpy().round(2),
+            'D/E': thesis['D/E'].to_numpy().round(2),
+            'Mountain Score': thesis['Mountain Score'].to_numpy(),
+        }, index=pd.MultiIndex.from_arrays([np.full(len(names), date), names],
+                                           names=['Formation Date', 'Company']))
+
+
+def bucket_returns(results, signal='Mountain Score', buckets=5):
+    """
+    Forward returns by signal bucket.
+
+    Args:
+        results: Backtester.run() frame
+        signal: 'Mountain Score' (one bucket per score) or a continuous column
+                such as 'Upside %' (quantile buckets formed per formation date,
+                1 = lowest)
+        buckets: Quantile buckets for a continuous signal
+
+    Returns:
+        DataFrame per bucket: observations, mean / median forward return,
+        hit rate (share of positive returns) and mean of the per-date averages
+    """
+    frame = results.dropna(subset=['Forward Return %', signal])
+    if frame.empty:
+        return pd.DataFrame(columns=['Observations', 'Mean Return %', 'Median Return %', 'Hit Rate %',
+                                     'Mean of Yearly Means %'])
+    if signal == 'Mountain Score':
+        bucket = frame[signal].astype(int)
+    else:
+        ranks = frame.groupby(level='Formation Date')[signal].rank(method='first', pct=True)
+        bucket = np.ceil(ranks * buckets).clip(1, buckets).astype(int)
+    grouped = frame.assign(Bucket=bucket.to_numpy()).groupby('Bucket')['Forward Return %']
+    yearly = frame.assign(Bucket=bucket.to_numpy()).groupby(['Bucket', pd.Grouper(level='Formation Date')])[
+        'Forward Return %'].mean().groupby(level='Bucket').mean()
+    summary = pd.DataFrame({
+        'Observations': grouped.size(),
+        'Mean Return %': grouped.mean(),
+        'Median Return %': grouped.median(),
+        'Hit Rate %': grouped.apply(lambda r: (r > 0).mean() * 100),
+        'Mean of Yearly Means %': yearly,
+    }).round(2)
+    summary.index.name = signal if signal == 'Mountain Score' else f"{signal} bucket"
+    return summary
+
+
+def main(argv=None):
+    from src.core.universe_store import UniverseStore
+
+    parser = argparse.ArgumentParser(description="Point-in-time backtest of the Mountain Score and DCF upside")
+    parser.add_argument('prices', help="Price history CSV (Date, Company, Price - or one column per company)")
+    parser.add_argument('--store', default=UNIVERSE_STORE_PATH, help="Universe store holding the fundamentals")
+    parser.add_argument('--wacc', type=float, default=FINANCIAL_DEFAULTS['wacc_default'], help="WACC %%")
+    parser.add_argument('--terminal-growth', type=float, default=FINANCIAL_DEFAULTS['terminal_growth'] * 100,
+                        help="Terminal growth %%")
+    parser.add_argument('--growth', type=float, help="Fixed 5Y growth %% (default: point-in-time FCF trend)")
+    parser.add_argument('--horizon-days', type=int, default=BACKTEST_HORIZON_DAYS, help="Forward-return window")
+    parser.add_argument('--buckets', type=int, default=5, help="Upside quantile buckets")
+    parser.add_argument('--output', help="Write every (formation date, company) observation to this CSV")
+    args = parser.parse_args(argv)
+
+    store = UniverseStore.open_current(args.store)
+    if store is None:
+        print(f"❌ No universe published under {args.store}")
+        return 1
+
+    started = time.perf_counter()
+    backtester = Backtester(store.panel(), load_price_history(args.prices), args.wacc / 100,
+                            args.terminal_growth / 100, None if args.growth is None else args.growth / 100,
+                            horizon_days=args.horizon_days)
+    results = backtester.run()
+    elapsed = time.perf_counter() - started
+    if results.empty:
+        print("❌ No formation date had any public report")
+        return 1
+
+    dates = results.index.get_level_values('Formation Date')
+    print(f"✓ {len(results)} observations, {dates.nunique()} formation dates "
+          f"({dates.min():%Y-%m-%d} .. {dates.max():%Y-%m-%d}) in {elapsed:.1f}s; "
+          f"{results['Forward Return %'].notna().sum()} with forward returns")
+    print("\nForward return by Mountain Score:")
+    print(bucket_returns(results).to_string())
+    print(f"\nForward return by DCF upside quantile (1 = lowest of {args.buckets}):")
+    print(bucket_returns(results, 'Upside %', args.buckets).to_string())
+    if args.output:
+        results.to_csv(args.output)
+        print(f"\n✓ Written to {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,361 @@
+"""
+benchmarks.py - Streaming Sector Percentile Benchmarks
+🏔️ THE MOUNTAIN PATH - World of Finance
+
+Keeps one mergeable t-digest per (sector, fiscal year, metric). Companies
+stream in, each digest stays bounded at ~compression centroids regardless of
+how many companies it has seen, and percentile queries are an interpolation
+over those centroids - no sorting of the full panel per query.
+
+Digests serialize to plain dicts, so worker processes can each build a
+partial SectorBenchmarks and the parent merges them.
+
+Each (company, fiscal year) contribution is recorded (its sector and
+metric values, a few floats per pair). A re-ingested pair is skipped while
+its values are unchanged; a restated one replaces the old values, and the
+(sector, fiscal year) digests it touches are rebuilt from the recorded
+contributions - t-digests cannot remove a value.
+"""
+
+import math
+import threading
+
+import pandas as pd
+import numpy as np
+
+from src.analysis.dupont import DuPontAnalyzer
+from src.analysis.eva import EVAAnalyzer
+from src.core.log import get_logger
+from src.core.panel import find_column
+
+logger = get_logger(__name__)
+
+BENCHMARK_METRICS = ['ROE %', 'Net Margin %', 'Debt-to-Equity', 'EVA']
+DEFAULT_SECTOR = 'Unclassified'
+
+
+class TDigest:
+    def __init__(self, compression=100):
+        """
+        Merging t-digest (Dunning & Ertl) for streaming quantile estimates.
+
+        Args:
+            compression: Accuracy/size trade-off; the digest holds at most
+                         ~compression centroids (tails are kept finer than the median)
+        """
+        self.compression = compression
+        self.count = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self._means = np.empty(0)
+        self._weights = np.empty(0)
+        self._cum = np.empty(0)
+        self._cum_means = np.empty(0)
+        self._buffer_means = []
+        self._buffer_weights = []
+
+    def add(self, value, weight=1.0):
+        """Add one observation."""
+        self.update(np.array([value], dtype=float), np.array([weight], dtype=float))
+
+    def update(self, values, weights=None):
+        """Add many observations (NaN/inf are ignored)."""
+        values = np.asarray(values, dtype=float)
+        weights = np.ones_like(values) if weights is None else np.asarray(weights, dtype=float)
+        finite = np.isfinite(values)
+        values, weights = values[finite], weights[finite]
+        if len(values) == 0:
+            return self
+
+        self._buffer_means.append(values)
+        self._buffer_weights.append(weights)
+        self.count += weights.sum()
+        self.min = min(self.min, values.min())
+        self.max = max(self.max, values.max())
+
+        if sum(len(b) for b in self._buffer_means) >= 5 * self.compression:
+            self._compress()
+        return self
+
+    def merge(self, other):
+        """Fold another digest into this one."""
+        other._compress()
+        if other.count == 0:
+            return self
+        self._buffer_means.append(other._means.copy())
+        self._buffer_weights.append(other._weights.copy())
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._compress()
+        return self
+
+    def _compress(self):
+        if not self._buffer_means:
+            return
+
+        means = np.concatenate([self._means] + self._buffer_means)
+        weights = np.concatenate([self._weights] + self._buffer_weights)
+        self._buffer_means, self._buffer_weights = [], []
+
+        order = np.argsort(means, kind='mergesort')
+        means, weights = means[order], weights[order]
+        total = weights.sum()
+
+        # k1 scale function: centroid may grow while k(q_right) - k(q_left) <= 1
+        def k(q):
+            return self.compression / (2 * math.pi) * math.asin(2 * min(max(q, 0.0), 1.0) - 1)
+
+        new_means, new_weights = [means[0]], [weights[0]]
+        q_left = 0.0
+        k_left = k(q_left)
+        for m, w in zip(means[1:], weights[1:]):
+            q_right = q_left + (new_weights[-1] + w) / total
+            if k(q_right) - k_left <= 1:
+                merged = new_weights[-1] + w
+                new_means[-1] += (m - new_means[-1]) * w / merged
+                new_weights[-1] = merged
+            else:
+                q_left += new_weights[-1] / total
+                k_left = k(q_left)
+                new_means.append(m)
+                new_weights.append(w)
+
+        self._means = np.array(new_means)
+        self._weights = np.array(new_weights)
+
+        # Cumulative weight at each centroid's centre, padded with the extremes
+        centres = np.cumsum(self._weights) - self._weights / 2
+        self._cum = np.concatenate([[0.0], centres, [self.count]])
+        self._cum_means = np.concatenate([[self.min], self._means, [self.max]])
+
+    def cdf(self, x):
+        """Fraction of observations <= x (scalar or array)."""
+        self._compress()
+        if self.count == 0:
+            return np.full(np.shape(x), np.nan) if np.ndim(x) else np.nan
+        if self.min == self.max:
+            return np.where(np.asarray(x) < self.min, 0.0, np.where(np.asarray(x) > self.max, 1.0, 0.5))
+        return np.interp(x, self._cum_means, self._cum) / self.count
+
+    def quantile(self, q):
+        """Value below which a fraction q of observations fall (scalar or array)."""
+        self._compress()
+        if self.count == 0:
+            return np.nan
+        return np.interp(np.asarray(q) * self.count, self._cum, self._cum_means)
+
+    def to_dict(self):
+        self._compress()
+        return {
+            'compression': self.compression,
+            'count': self.count,
+            'min': self.min,
+            'max': self.max,
+            'means': self._means.tolist(),
+            'weights': self._weights.tolist(),
+        }
+
+    @classmethod
+    def from_dict(cls, payload):
+        digest = cls(payload['compression'])
+        if payload['count'] > 0:
+            digest.update(payload['means'], payload['weights'])
+            digest.min, digest.max = payload['min'], payload['max']
+            digest._compress()
+        return digest
+
+
+def benchmark_metrics(panel, wacc=0.12):
+    """
+    ROE, Net Margin, D/E and EVA for every (Company, Year) of a panel, in one pass.
+    """
+    dupont = DuPontAnalyzer(panel).calculate()
+    eva = EVAAnalyzer.calculate_panel(panel, wacc)
+
+    equity = np.zeros(len(panel))
+    for keyword in ['Equity Share Capital', 'Reserves']:
+        col = find_column(panel, keyword)
+        if col is not None:
+            equity += panel[col].to_numpy(dtype=float)
+    debt_col = find_column(panel, 'Borrowings')
+    debt = panel[debt_col].to_numpy(dtype=float) if debt_col is not None else np.zeros(len(panel))
+
+    return pd.DataFrame({
+        'ROE %': dupont['ROE %'],
+        'Net Margin %': dupont['Net Margin %'],
+        'Debt-to-Equity': np.divide(debt, equity, out=np.zeros(len(panel)), where=equity != 0),
+        'EVA': eva['EVA'],
+    }, index=panel.index)
+
+
+def fiscal_year(period):
+    """'2024-03-31' -> '2024' so companies with different year-ends share a bucket."""
+    return str(period)[:4]
+
+
+class SectorBenchmarks:
+    def __init__(self, compression=100):
+        """
+        Per-(sector, fiscal year, metric) t-digests.
+
+        Args:
+            compression: t-digest compression for every digest
+        """
+        self.compression = compression
+        self.digests = {}
+        self._seen = {}   # (company, fiscal year) -> (sector, metric values) folded in
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def ingest(self, metrics, sectors=None):
+        """
+        Stream companies into the benchmarks.
+
+        Args:
+            metrics: benchmark_metrics() frame indexed by (Company, Year)
+            sectors: Mapping company -> sector (missing -> 'Unclassified')
+
+        (company, fiscal year) pairs already ingested with the same values are
+        skipped, so re-uploading a company only adds its new years; restated
+        values replace the old ones.
+        """
+        sectors = sectors or {}
+        frame = metrics.reset_index()
+        frame['FY'] = frame['Year'].map(fiscal_year)
+        frame['Sector'] = frame['Company'].map(lambda c: sectors.get(c, DEFAULT_SECTOR))
+
+        with self._lock:
+            fresh, restated = [], set()
+            values = map(tuple, frame[BENCHMARK_METRICS].to_numpy(dtype=float).tolist())
+            for company, fy, sector, row in zip(frame['Company'], frame['FY'], frame['Sector'], values):
+                contribution = (sector, row)
+                previous = self._seen.get((company, fy))
+                if previous is None:
+                    fresh.append(True)
+                else:
+                    fresh.append(False)
+                    if previous == contribution or _same_contribution(previous, contribution):
+                        continue
+                    restated.update({(previous[0], fy), (sector, fy)})
+                self._seen[(company, fy)] = contribution
+
+            # Buckets with a restated pair are rebuilt (new pairs included)
+            frame = frame[np.array(fresh, dtype=bool)]
+            for (sector, fy), group in frame.groupby(['Sector', 'FY']):
+                if (sector, fy) in restated:
+                    continue
+                for metric in BENCHMARK_METRICS:
+                    self._digest(sector, fy, metric).update(group[metric].to_numpy())
+            self._rebuild(restated)
+        return self
+
+    def _rebuild(self, buckets):
+        """Recompute the digests of (sector, fiscal year) buckets from the recorded contributions (lock held)."""
+        if not buckets:
+            return
+        for sector, fy in buckets:
+            for metric in BENCHMARK_METRICS:
+                self.digests.pop((sector, fy, metric), None)
+        grouped = {}
+        for (_, fy), (sector, values) in self._seen.items():
+            if (sector, fy) in buckets:
+                grouped.setdefault((sector, fy), []).append(values)
+        for (sector, fy), rows in grouped.items():
+            matrix = np.array(rows, dtype=float)
+            for i, metric in enumerate(BENCHMARK_METRICS):
+                self._digest(sector, fy, metric).update(matrix[:, i])
+
+    def _digest(self, sector, fy, metric):
+        key = (sector, fy, metric)
+        if key not in self.digests:
+            self.digests[key] = TDigest(self.compression)
+        return self.digests[key]
+
+    def percentile(self, sector, period, metric, value):
+        """Percentile rank (0-100) of value within its sector and fiscal year."""
+        # Under the lock: cdf() compresses pending values, and sessions query
+        # and ingest the shared benchmarks from concurrent script threads
+        with self._lock:
+            digest = self.digests.get((sector, fiscal_year(period), metric))
+            if digest is None or digest.count == 0:
+                return np.nan
+            return float(digest.cdf(value)) * 100
+
+    def company_percentiles(self, metrics, sector=DEFAULT_SECTOR):
+        """
+        Percentile of every metric, every year, for one company.
+
+        Args:
+            metrics: benchmark_metrics() rows for the company (indexed by Year
+                     or (Company, Year))
+
+        Returns:
+            DataFrame indexed by Year with one percentile column per metric.
+        """
+        years = metrics.index.get_level_values('Year') if isinstance(metrics.index, pd.MultiIndex) else metrics.index
+        result = pd.DataFrame(index=pd.Index(years, name='Year'))
+        for metric in BENCHMARK_METRICS:
+            result[f'{metric} Pctl'] = [
+                self.percentile(sector, year, metric, value)
+                for year, value in zip(years, metrics[metric].to_numpy())
+            ]
+        return result.round(1)
+
+    def peer_count(self, sector, period):
+        digest = self.digests.get((sector, fiscal_year(period), BENCHMARK_METRICS[0]))
+        return int(digest.count) if digest is not None else 0
+
+    def merge(self, other):
+        """
+        Fold another (e.g. worker-process) SectorBenchmarks into this one.
+
+        Workers should hold disjoint companies. Pairs both sides hold are not
+        counted twice: other's values win, and the buckets they touch are
+        rebuilt from the recorded contributions (with a warning).
+        """
+        with self._lock:
+            overlap = self._seen.keys() & other._seen.keys()
+            affected = set()
+            for company, fy in overlap:
+                affected.update({(self._seen[(company, fy)][0], fy), (other._seen[(company, fy)][0], fy)})
+            if overlap:
+                logger.warning("Merging benchmarks that share %d (company, fiscal year) pairs; "
+                               "rebuilding %d sector-year digests", len(overlap), len(affected))
+            for key, digest in other.digests.items():
+                if key[:2] in affected:
+                    continue
+                if key in self.digests:
+                    self.digests[key].merge(digest)
+                else:
+                    self.digests[key] = TDigest.from_dict(digest.to_dict())
+            self._seen.update(other._seen)
+            self._rebuild(affected)
+        return self
+
+    def to_dict(self):
+        return {
+            'compression': self.compression,
+            'digests': [[list(key), digest.to_dict()] for key, digest in self.digests.items()],
+            'seen': [[company, fy, sector, list(values)] for (company, fy), (sector, values) in self._seen.items()],
+        }
+
+    @classmethod
+    def from_dict(cls, payload):
+        benchmarks = cls(payload['compression'])
+        benchmarks.digests = {tuple(key): TDigest.from_dict(d) for key, d in payload['digests']}
+        benchmarks._seen = {(company, fy): (sector, tuple(values)) for company, fy, sector, values in payload['seen']}
+        return benchmarks
+
+
+def _same_contribution(a, b):
+    """Equal (sector, metric values) contributions, NaN equal to NaN."""
+    return a[0] == b[0] and np.array_equal(a[1], b[1], equal_nan=True)
@@ -0,0 +1,82 @@
+"""
+dupont.py - DuPont Decomposition Engine
+🏔️ THE MOUNTAIN PATH - World of Finance
+
+3-Step:  ROE = Net Margin × Asset Turnover × Equity Multiplier
+5-Step:  ROE = Tax Burden × Interest Burden × EBIT Margin × Asset Turnover × Equity Multiplier
+
+Runs on a (Company, Year) × metric panel (see src/core/panel.py), so one
+vectorized pass covers every period of every company in a universe screen.
+"""
+
+import pandas as pd
+import numpy as np
+
+from src.core.panel import company_panel, find_column
+from src.core.profiler import profile_methods
+
+
+@profile_methods()
+class DuPontAnalyzer:
+    def __init__(self, panel):
+        """
+        Initialize DuPont Analyzer.
+
+        Args:
+            panel: DataFrame with one row per (company, period) and metric
+                   columns; build with build_panel() / company_panel(), or pass
+                   a single loader frame through DuPontAnalyzer.from_loader_frame()
+        """
+        self.panel = panel
+
+    @classmethod
+    def from_loader_frame(cls, df):
+        """Build an analyzer for a single UniversalScreenerLoader frame."""
+        return cls(company_panel(df))
+
+    def _column(self, keyword):
+        """Metric column as a float array (zeros when the metric is absent)."""
+        col = find_column(self.panel, keyword)
+        if col is None:
+            return np.zeros(len(self.panel))
+        return self.panel[col].to_numpy(dtype=float)
+
+    def calculate(self):
+        """
+        Computes the 3-step and 5-step DuPont breakdown for every row.
+
+        Returns DataFrame (same index as the panel) with:
+        - Net Margin %, Asset Turnover, Equity Multiplier, ROE %
+        - Tax Burden, Interest Burden, EBIT Margin %, ROE (5-Step) %
+        """
+        net_profit = self._column('Net profit')
+        sales = self._column('Sales')
+        pbt = self._column('Profit before tax')
+        interest = self._column('Interest')
+        total_assets = self._column('Total')
+        equity = self._column('Equity Share Capital') + self._column('Reserves')
+        ebit = pbt + interest
+
+        def ratio(num, den):
+            return np.divide(num, den, out=np.zeros_like(num), where=den != 0)
+
+        net_margin = ratio(net_profit, sales)
+        asset_turnover = ratio(sales, total_assets)
+        equity_multiplier = ratio(total_assets, equity)
+
+        tax_burden = ratio(net_profit, pbt)
+        interest_burden = ratio(pbt, ebit)
+        ebit_margin = ratio(ebit, sales)
+
+        dupont = pd.DataFrame({
+            'Net Margin %': net_margin * 100,
+            'Asset Turnover': asset_turnover,
+            'Equity Multiplier': equity_multiplier,
+            'ROE %': net_margin * asset_turnover * equity_multiplier * 100,
+            'Tax Burden': tax_burden,
+            'Interest Burden': interest_burden,
+            'EBIT Margin %': ebit_margin * 100,
+            'ROE (5-Step) %': tax_burden * interest_burden * ebit_margin * asset_turnover * equity_multiplier * 100,
+        }, index=self.panel.index)
+
+        return dupont.round(4)
@@ -8,6 +8,12 @@ CORRECTED: Works with Screener.in data loader structure
 import pandas as pd
 import numpy as np
 
+from src.core.log import get_logger
+from src.core.profiler import profile_methods
+
+logger = get_logger(__name__)
+
+@profile_methods()
 class EVAAnalyzer:
     def __init__(self, df, wacc=0.12):
         """
@@ -97,14 +103,12 @@ class EVAAnalyzer:
             # Reset index for cleaner output
             eva_df = eva_df.reset_index(drop=True)
             
-            print(f"✓ EVA analysis complete: {len(eva_df)} periods analyzed")
+            logger.debug("EVA analysis complete: %d periods analyzed", len(eva_df))
             
             return eva_df
             
-        except Exception as e:
-            print(f"❌ Error in EVA calculation: {e}")
-            import traceback
-            traceback.print_exc()
+        except Exception:
+            logger.exception("Error in EVA calculation")
             
             # Return empty DataFrame on error
             return pd.DataFrame({
@@ -116,3 +120,40 @@ class EVAAnalyzer:
                 'ROIC %': [],
                 'Tax Rate %': []
             })
+
+    @staticmethod
+    def calculate_panel(panel, wacc=0.12):
+        """
+        Vectorized EVA for a (Company, Year) × metric panel (see src/core/panel.py).
+        
+        Same definitions as calculate_eva(), evaluated for every row in one pass.
+        wacc is a scalar or one rate per row (e.g. a row per scenario).
+        
+        Returns DataFrame (same index as the panel) with:
+        - NOPAT, Invested Capital, Capital Charge, EVA, ROIC %, Tax Rate %
+        """
+        def column(name):
+            if name in panel.columns:
+                return panel[name].to_numpy(dtype=float)
+            return np.zeros(len(panel))
+        
+        pbt = column('Profit before tax')
+        interest = column('Interest')
+        tax = column('Tax')
+        
+        ebit = pbt + interest
+        tax_rate = np.divide(tax, pbt, out=np.full(len(panel), 0.25), where=pbt != 0).clip(0, 1)
+        nopat = ebit * (1 - tax_rate)
+        
+        invested_capital = column('Equity Share Capital') + column('Reserves') + column('Borrowings')
+        capital_charge = invested_capital * wacc
+        roic_pct = np.divide(nopat, invested_capital, out=np.zeros(len(panel)), where=invested_capital != 0) * 100
+        
+        return pd.DataFrame({
+            'NOPAT': nopat,
+            'Invested Capital': invested_capital,
+            'Capital Charge': capital_charge,
+            'EVA': nopat - capital_charge,
+            'ROIC %': roic_pct,
+            'Tax Rate %': tax_rate * 100
+        }, index=panel.index).round(2)
@@ -8,7 +8,12 @@ CORRECTED: Works with Screener.in data loader structure
 import pandas as pd
 import numpy as np
 
+from src.analysis.dupont import DuPontAnalyzer
+from src.core.panel import find_column, report_periods
+from src.core.profiler import profile_methods
 
+
+@profile_methods()
 class FinancialAnalyzer:
     def __init__(self, df):
         """
@@ -42,12 +47,14 @@ class FinancialAnalyzer:
         if self.df_transposed is None or len(self.date_columns) == 0:
             return pd.Series(0.0, index=range(len(self.date_columns) if self.date_columns else 0))
         
-        for col in self.df_transposed.columns:
-            if keyword.lower() in str(col).lower():
-                series = self.df_transposed[col]
-                if isinstance(series, pd.DataFrame):
-                    series = series.iloc[:, 0]
-                return series.reset_index(drop=True)
+        # Exact label first (as in calculate_panel): 'Inventory' must not
+        # resolve to the P&L's 'Change in Inventory'
+        col = find_column(self.df_transposed, keyword)
+        if col is not None:
+            series = self.df_transposed[col]
+            if isinstance(series, pd.DataFrame):
+                series = series.iloc[:, 0]
+            return series.reset_index(drop=True)
         return pd.Series(0.0, index=range(len(self.date_columns)))
 
     def get_profitability_metrics(self):
@@ -82,12 +89,14 @@ class FinancialAnalyzer:
         metrics = pd.DataFrame()
         
         sales = self._get_clean_series('Sales')
+        total_assets = self._get_clean_series('Total')
         inventory = self._get_clean_series('Inventory')
         receivables = self._get_clean_series('Receivables')
         
         with np.errstate(divide='ignore', invalid='ignore'):
-            # Asset Turnover (normalized for P&L-only data)
-            metrics['Asset Turnover'] = np.where(sales.values != 0, sales.values / np.maximum(sales.values, 1), 1)
+            # Asset Turnover = Sales / Total Assets (balance sheet 'Total')
+            metrics['Asset Turnover'] = np.where(total_assets.values != 0, 
+                                                 sales.values / np.where(total_assets.values != 0, total_assets.values, 1), 0)
             
             # Inventory Turnover
             metrics['Inventory Turnover'] = np.where(inventory.values != 0, 
@@ -105,8 +114,10 @@ class FinancialAnalyzer:
         """Calculates YoY growth rates."""
         metrics = pd.DataFrame()
         
-        sales = self._get_clean_series('Sales')
-        profit = self._get_clean_series('Profit before tax')
+        # Report dates only: a trailing 'TTM' column is not a fiscal year
+        annual = np.isin(self.date_columns, report_periods(self.df))
+        sales = self._get_clean_series('Sales')[annual]
+        profit = self._get_clean_series('Profit before tax')[annual]
         
         with np.errstate(divide='ignore', invalid='ignore'):
             # Sales Growth %
@@ -122,7 +133,7 @@ class FinancialAnalyzer:
             metrics['Sales Growth %'] = metrics['Sales Growth %'].replace([np.inf, -np.inf], 0)
             metrics['Profit Growth %'] = metrics['Profit Growth %'].replace([np.inf, -np.inf], 0)
         
-        metrics['Year'] = self.date_columns
+        metrics['Year'] = [col for col, is_annual in zip(self.date_columns, annual) if is_annual]
         return metrics.fillna(0)
 
     def get_dilution_metrics(self):
@@ -144,3 +155,51 @@ class FinancialAnalyzer:
         
         metrics['Year'] = self.date_columns
         return metrics.fillna(0)
+
+    def get_dupont_metrics(self):
+        """Calculates the 3-step and 5-step DuPont decomposition of ROE."""
+        metrics = DuPontAnalyzer.from_loader_frame(self.df).calculate().reset_index(drop=True)
+        metrics['Year'] = self.date_columns
+        return metrics.fillna(0)
+
+    @staticmethod
+    def calculate_panel(panel):
+        """
+        Vectorized ratio set for a (Company, Year) × metric panel (see src/core/panel.py).
+        
+        Same definitions as the per-company get_*_metrics() methods; growth rates
+        are computed within each company (rows must be sorted by Company, Year).
+        """
+        def column(keyword):
+            col = find_column(panel, keyword)
+            if col is None:
+                return np.zeros(len(panel))
+            return panel[col].to_numpy(dtype=float)
+        
+        def ratio(num, den):
+            return np.divide(num, den, out=np.zeros(len(panel)), where=den != 0)
+        
+        pat = column('Net Profit')
+        sales = column('Sales')
+        inventory = column('Inventory')
+        pbt = column('Profit before tax')
+        equity = column('Equity Share Capital') + column('Reserves')
+        
+        companies = panel.index.get_level_values('Company')
+        first_row = np.ones(len(panel), dtype=bool)
+        first_row[1:] = companies[1:] != companies[:-1]
+        prev_sales = np.where(first_row, np.nan, np.roll(sales, 1))
+        prev_pbt = np.where(first_row, np.nan, np.roll(pbt, 1))
+        
+        metrics = pd.DataFrame({
+            'ROE %': ratio(pat, equity) * 100,
+            'Net Margin %': ratio(pat, sales) * 100,
+            'Debt-to-Equity': ratio(column('Borrowings'), equity),
+            'Asset Turnover': ratio(sales, column('Total')),
+            'Inventory Turnover': np.where(inventory != 0, sales / np.maximum(inventory, 1), 0),
+            'Debtor Days': ratio(column('Receivables'), sales) * 365,
+            'Sales Growth %': (sales - prev_sales) / np.maximum(prev_sales, 1) * 100,
+            'Profit Growth %': (pbt - prev_pbt) / np.maximum(np.abs(prev_pbt), 1) * 100,
+        }, index=panel.index)
+        
+        return metrics.fillna(0)
@@ -2,6 +2,10 @@
 import pandas as pd
 import numpy as np
 
+from src.core.panel import find_column
+from src.core.profiler import profile_methods
+
+@profile_methods()
 class GrowthAnalyzer:
     def __init__(self, df):
         self.df = df[0] if isinstance(df, tuple) else df
@@ -28,3 +32,26 @@ class GrowthAnalyzer:
                 summary[m] = {f"{p}Y CAGR": self.calculate_cagr(self.df[m], p) for p in periods}
         
         return pd.DataFrame(summary).T
+
+    @staticmethod
+    def calculate_panel(panel, periods=(3, 5, 10)):
+        """
+        Rolling CAGR (%) for every (Company, Year) row of a panel.
+        Uses the same rule as calculate_cagr: NaN when either end is <= 0 or
+        the company has fewer than `periods` prior years.
+        """
+        result = pd.DataFrame(index=panel.index)
+        companies = panel.index.get_level_values('Company')
+        
+        for label, keyword in [('Sales', 'Sales'), ('Net Profit', 'Net profit')]:
+            col = find_column(panel, keyword)
+            if col is None:
+                continue
+            series = panel[col].astype(float)
+            for p in periods:
+                start = series.groupby(companies).shift(p)
+                valid = (start > 0) & (series > 0)
+                cagr = (series / start.where(valid)) ** (1 / p) - 1
+                result[f"{label} {p}Y CAGR %"] = cagr * 100
+        
+        return result
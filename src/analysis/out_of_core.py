@@ -0,0 +1,172 @@
+"""
+out_of_core.py - Chunked Panel Evaluation over Partitioned Parquet
+🏔️ THE MOUNTAIN PATH - World of Finance
+
+Runs the panel-level analyzers (FinancialAnalyzer, EVAAnalyzer,
+GrowthAnalyzer, ThesisEngine) over a Parquet panel that does not fit in
+memory:
+
+- Column projection: only the metrics the analyzers read are decoded
+- Predicate pushdown: frequency / year / company filters are applied by the
+  scanner, skipping partitions and row groups
+- Bounded chunks: batch size is derived from a memory budget; a company is
+  never split across chunks (its trailing rows are carried to the next one)
+- Incremental output: each chunk's results are appended to a Parquet file
+  before the next chunk is read
+
+Peak memory ≈ memory_budget_mb, independent of universe size.
+"""
+
+import argparse
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from src.analysis.financial import FinancialAnalyzer
+from src.analysis.eva import EVAAnalyzer
+from src.analysis.growth import GrowthAnalyzer
+from src.analysis.thesis import ThesisEngine
+from src.core.parquet_store import open_panel_dataset
+
+# Metrics read by the panel analyzers (column projection)
+REQUIRED_METRICS = [
+    'Sales', 'Net profit', 'Profit before tax', 'Interest', 'Tax',
+    'Equity Share Capital', 'Reserves', 'Borrowings', 'Total',
+    'Inventory', 'Receivables',
+]
+
+# Working-set multiplier: Arrow batch + pandas copy + analyzer temporaries + results
+_WORKING_SET_FACTOR = 12
+
+
+def evaluate_panel(panel, wacc=0.12):
+    """All panel-level analyzers on one in-memory chunk, joined on (Company, Year)."""
+    eva = EVAAnalyzer.calculate_panel(panel, wacc)[['NOPAT', 'Invested Capital', 'EVA', 'ROIC %']]
+    thesis = ThesisEngine.score_panel(panel)[['Mountain Score', 'Verdict']]
+    return pd.concat([
+        FinancialAnalyzer.calculate_panel(panel),
+        eva,
+        GrowthAnalyzer.calculate_panel(panel),
+        thesis,
+    ], axis=1)
+
+
+class OutOfCoreRunner:
+    def __init__(self, root, memory_budget_mb=256, frequency='annual', years=None, companies=None):
+        """
+        Initialize the chunked runner.
+
+        Args:
+            root: Partitioned Parquet root (see src/core/parquet_store.py)
+            memory_budget_mb: Target peak working set for one chunk
+            frequency: 'annual' or 'quarterly' partition to scan
+            years: Optional (first, last) inclusive report-date bounds, e.g. ('2015', '2024-12-31')
+            companies: Optional list of companies to restrict the scan to
+        """
+        self.dataset = open_panel_dataset(root)
+        self.memory_budget_mb = memory_budget_mb
+
+        predicate = ds.field('Frequency') == frequency
+        if years is not None:
+            first, last = years
+            predicate &= (ds.field('Year') >= str(first)) & (ds.field('Year') <= str(last))
+        if companies is not None:
+            predicate &= ds.field('Company').isin([str(c) for c in companies])
+        self.predicate = predicate
+
+        available = set(self.dataset.schema.names)
+        self.columns = ['Company', 'Year'] + [m for m in REQUIRED_METRICS if m in available]
+
+    @property
+    def batch_rows(self):
+        """Rows per chunk so that the working set stays within the budget."""
+        bytes_per_row = len(self.columns) * 8 * _WORKING_SET_FACTOR
+        return max(1000, int(self.memory_budget_mb * 1024 * 1024 / bytes_per_row))
+
+    def iter_chunks(self):
+        """Yield (Company, Year) panels of at most ~batch_rows rows, whole companies only."""
+        pending, pending_rows = [], 0
+        fragments = sorted(self.dataset.get_fragments(filter=self.predicate), key=lambda f: f.path)
+
+        for fragment in fragments:
+            scanner = fragment.scanner(schema=self.dataset.schema, columns=self.columns,
+                                       filter=self.predicate, batch_size=self.batch_rows)
+            for batch in scanner.to_batches():
+                if batch.num_rows == 0:
+                    continue
+                pending.append(batch.to_pandas())
+                pending_rows += batch.num_rows
+                if pending_rows < self.batch_rows:
+                    continue
+
+                # Hold back the last company - its history may continue in the next batch
+                chunk = pd.concat(pending, ignore_index=True)
+                tail = (chunk['Company'] == chunk['Company'].iloc[-1]).to_numpy()
+                pending = [chunk[tail]]
+                pending_rows = int(tail.sum())
+                if not tail.all():
+                    yield self._to_panel(chunk[~tail])
+
+        # Files never split a company, so whatever remains is complete
+        if pending_rows:
+            yield self._to_panel(pd.concat(pending, ignore_index=True))
+
+    @staticmethod
+    def _to_panel(frame):
+        panel = frame.set_index(['Company', 'Year'])
+        return panel.apply(pd.to_numeric, errors='coerce').fillna(0)
+
+    def run(self, output_path, wacc=0.12, on_chunk=None):
+        """
+        Evaluate every chunk and append results to a Parquet file.
+
+        Args:
+            output_path: Destination .parquet file
+            wacc: Cost of capital for EVA
+            on_chunk: Optional callback(chunk_number, rows) for progress reporting
+
+        Returns:
+            dict with 'chunks', 'rows', 'batch_rows'
+        """
+        writer = None
+        chunks = rows = 0
+        try:
+            for panel in self.iter_chunks():
+                results = evaluate_panel(panel, wacc).reset_index()
+                table = pa.Table.from_pandas(results, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(output_path, table.schema)
+                writer.write_table(table.cast(writer.schema))
+                chunks += 1
+                rows += len(results)
+                if on_chunk is not None:
+                    on_chunk(chunks, rows)
+        finally:
+            if writer is not None:
+                writer.close()
+
+        return {'chunks': chunks, 'rows': rows, 'batch_rows': self.batch_rows}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Out-of-core panel evaluation over partitioned Parquet")
+    parser.add_argument('source', help="Partitioned Parquet root")
+    parser.add_argument('output', help="Results .parquet file")
+    parser.add_argument('--memory-mb', type=int, default=256, help="Peak working-set budget per chunk")
+    parser.add_argument('--frequency', choices=['annual', 'quarterly'], default='annual')
+    parser.add_argument('--from-year', help="First report date (inclusive), e.g. 2015")
+    parser.add_argument('--to-year', default='9999', help="Last report date (inclusive)")
+    parser.add_argument('--wacc', type=float, default=12.0, help="WACC in percent")
+    args = parser.parse_args(argv)
+
+    years = (args.from_year, args.to_year) if args.from_year else None
+    runner = OutOfCoreRunner(args.source, args.memory_mb, args.frequency, years)
+    summary = runner.run(args.output, args.wacc / 100,
+                         on_chunk=lambda n, rows: print(f"✓ Chunk {n}: {rows} rows written"))
+    print(f"✓ Done: {summary['rows']} rows in {summary['chunks']} chunks ({summary['batch_rows']} rows/chunk)")
+
+
+if __name__ == '__main__':
+    main()
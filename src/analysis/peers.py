@@ -0,0 +1,190 @@
+"""
+peers.py - k-Nearest-Neighbour Peer Discovery
+🏔️ THE MOUNTAIN PATH - World of Finance
+
+Each company is a point in standardized fundamentals space
+(size, margin, ROE, leverage, growth). A scipy cKDTree answers
+"which k companies look most like this one?" in well under a millisecond.
+
+Incremental ingestion: new companies land in a small brute-force buffer
+that is searched alongside the tree; the tree (and the scaling statistics)
+are rebuilt only once the buffer outgrows a fraction of the index. Small
+indexes (under min_rebuild companies) and companies that break a feature
+fitted as constant rebuild at once, so a one-company seed never leaves
+later companies ranked on unscaled features.
+"""
+
+import threading
+
+import pandas as pd
+import numpy as np
+from scipy.spatial import cKDTree
+
+from src.core.panel import find_column
+
+FEATURES = ['Size (log Sales)', 'Net Margin %', 'ROE %', 'Debt-to-Equity', 'Sales Growth %']
+
+
+def fundamental_features(panel):
+    """
+    Latest-period fundamentals vector per company.
+
+    Args:
+        panel: (Company, Year) × metric panel from build_panel()
+
+    Returns:
+        DataFrame indexed by Company with the FEATURES columns.
+    """
+    if panel.empty:
+        return pd.DataFrame(columns=FEATURES)
+
+    def column(keyword):
+        col = find_column(panel, keyword)
+        return panel[col].astype(float) if col is not None else pd.Series(0.0, index=panel.index)
+
+    sales = column('Sales')
+    net_profit = column('Net profit')
+    equity = column('Equity Share Capital') + column('Reserves')
+    debt = column('Borrowings')
+
+    def ratio(num, den):
+        return (num / den.where(den != 0)).fillna(0)
+
+    prev_sales = sales.groupby(level='Company').shift(1)
+    features = pd.DataFrame({
+        'Size (log Sales)': np.log1p(sales.clip(lower=0)),
+        'Net Margin %': ratio(net_profit, sales) * 100,
+        'ROE %': ratio(net_profit, equity) * 100,
+        'Debt-to-Equity': ratio(debt, equity),
+        'Sales Growth %': ratio(sales - prev_sales, prev_sales.abs()) * 100,
+    }, index=panel.index)
+
+    return features.groupby(level='Company').last()
+
+
+class PeerFinder:
+    def __init__(self, rebuild_fraction=0.1, min_rebuild=32, clip_z=5.0):
+        """
+        Initialize Peer Finder.
+
+        Args:
+            rebuild_fraction: Rebuild the tree once the buffer exceeds this share of the index
+            min_rebuild: ...or this many companies, whichever is larger (an
+                         index smaller than this rebuilds on every add)
+            clip_z: Clip standardized features at ±clip_z so one extreme ratio
+                    (e.g. ROE on near-zero equity) cannot dominate the distance
+        """
+        self.rebuild_fraction = rebuild_fraction
+        self.min_rebuild = min_rebuild
+        self.clip_z = clip_z
+
+        self._lock = threading.RLock()
+        self._raw = {}            # company -> raw feature vector (source of truth)
+        self._tree = None
+        self._tree_names = []
+        self._tree_index = {}     # company -> row in the tree
+        self._tree_stale = set()  # companies whose tree point was superseded
+        self._buffer = {}         # company -> raw vector added since last rebuild
+        self._mean = np.zeros(len(FEATURES))
+        self._std = np.ones(len(FEATURES))
+        self._constant = np.zeros(len(FEATURES), dtype=bool)   # features with no spread at the last fit
+
+    def __len__(self):
+        return len(self._raw)
+
+    def __contains__(self, company):
+        return company in self._raw
+
+    def add(self, features):
+        """
+        Insert or update companies.
+
+        Args:
+            features: DataFrame indexed by Company with FEATURES columns
+                      (see fundamental_features)
+        """
+        values = features.reindex(columns=FEATURES).fillna(0).to_numpy(dtype=float)
+        with self._lock:
+            for company, vector in zip(features.index, values):
+                if company in self._tree_index:
+                    self._tree_stale.add(company)
+                self._raw[company] = vector
+                self._buffer[company] = vector
+
+            threshold = max(self.min_rebuild, self.rebuild_fraction * len(self._tree_names))
+            # A constant feature was fitted with a placeholder std of 1: any
+            # new value there needs real scaling statistics
+            unscaled = (self._constant & (values != self._mean)).any()
+            if (self._tree is None or len(self._tree_names) < self.min_rebuild or unscaled
+                    or len(self._buffer) > threshold):
+                self.rebuild()
+
+    def rebuild(self):
+        """Refit scaling statistics and rebuild the tree over the whole universe."""
+        with self._lock:
+            names = list(self._raw)
+            matrix = np.array([self._raw[n] for n in names]) if names else np.empty((0, len(FEATURES)))
+
+            if len(names) > 0:
+                self._mean = matrix.mean(axis=0)
+                std = matrix.std(axis=0)
+                self._constant = std == 0
+                self._std = np.where(self._constant, 1.0, std)
+
+            self._tree_names = names
+            self._tree_index = {name: i for i, name in enumerate(names)}
+            self._tree = cKDTree(self._scale(matrix)) if len(names) > 0 else None
+            self._tree_stale = set()
+            self._buffer = {}
+
+    def _scale(self, matrix):
+        return np.clip((matrix - self._mean) / self._std, -self.clip_z, self.clip_z)
+
+    def nearest(self, company, k=5):
+        """
+        The k companies closest to `company` (excluding itself).
+
+        Returns:
+            List of (company, distance) tuples, closest first.
+        """
+        with self._lock:
+            if company not in self._raw:
+                raise KeyError(f"{company} is not in the peer index")
+
+            point = self._scale(self._raw[company])
+            candidates = {}
+
+            # 1. Tree search (over-fetch to skip self and superseded points)
+            if self._tree is not None:
+                fetch = min(len(self._tree_names), k + 1 + len(self._tree_stale))
+                dist, idx = self._tree.query(point, k=fetch)
+                for d, i in zip(np.atleast_1d(dist), np.atleast_1d(idx)):
+                    name = self._tree_names[i]
+                    if name != company and name not in self._tree_stale:
+                        candidates[name] = float(d)
+
+            # 2. Brute-force over companies ingested since the last rebuild
+            if self._buffer:
+                names = list(self._buffer)
+                scaled = self._scale(np.array(list(self._buffer.values())))
+                for name, d in zip(names, np.linalg.norm(scaled - point, axis=1)):
+                    if name != company:
+                        candidates[name] = float(d)
+
+            return sorted(candidates.items(), key=lambda item: item[1])[:k]
+
+    def query(self, company, k=5):
+        """
+        nearest() as a table for display.
+
+        Returns:
+            DataFrame indexed by Company with 'Distance' and the raw FEATURES.
+        """
+        nearest = self.nearest(company, k)
+        result = pd.DataFrame(
+            [self._raw[name] for name, _ in nearest],
+            index=pd.Index([name for name, _ in nearest], name='Company'),
+            columns=FEATURES,
+        )
+        result.insert(0, 'Distance', [d for _, d in nearest])
+        return result
@@ -2,6 +2,9 @@
 import pandas as pd
 import numpy as np
 
+from src.core.profiler import profile_methods
+
+@profile_methods()
 class RiskAnalyzer:
     def __init__(self, df):
         self.df = df
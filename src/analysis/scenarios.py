@@ -0,0 +1,316 @@
+"""
+scenarios.py - Saved Valuation Scenarios with Batched Evaluation
+🏔️ THE MOUNTAIN PATH - World of Finance
+
+A scenario is a named assumption set - WACC, 5Y growth and terminal growth
+(decimals) - saved per company (bear / base / bull ...) or for every
+company as a house view:
+
+    store = ScenarioStore()
+    store.save('TCS', 'Bull', wacc=0.11, growth_rate=0.20, terminal_growth=0.05)
+    store.save(HOUSE, 'House WACC 13%', wacc=0.13, growth_rate=0.15, terminal_growth=0.04)
+
+ScenarioEvaluator runs every (company, scenario) pair through the DCF, EVA
+and thesis engines in one vectorized call (calculate_dcf_batch,
+EVAAnalyzer.calculate_panel, ThesisEngine.score_panel over one row per
+pair), so 20 scenarios across 200 holdings are a single 4,000-row batch.
+Results are memoized by (company inputs hash, assumption hash) with LRU
+eviction: re-evaluating after one new scenario only computes its column.
+
+Compare every saved scenario across the published universe:
+
+    python -m src.analysis.scenarios
+    python -m src.analysis.scenarios --output scenarios.csv
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from src.analysis.eva import EVAAnalyzer
+from src.analysis.thesis import ThesisEngine
+from src.analysis.valuation import calculate_dcf_batch, estimate_fcf_proxy_panel, value_per_share
+from src.core.config import SCENARIO_STORE_PATH, SCENARIO_CACHE_ENTRIES, UNIVERSE_STORE_PATH
+from src.core.log import get_logger
+from src.core.session_data import approx_nbytes
+
+logger = get_logger('src.analysis.scenarios')  # also when run as __main__
+
+ASSUMPTIONS = ('wacc', 'growth_rate', 'terminal_growth')
+HOUSE = '*'   # Company key of scenarios that apply to every company
+
+RESULT_COLUMNS = ['WACC %', 'Growth %', 'Terminal Growth %', 'FCF', 'Fair Value', 'Value / Share', 'Market Price',
+                  'Upside %', 'EVA', 'ROIC %', 'Mountain Score', 'Verdict']
+
+
+def assumption_hash(assumptions):
+    """Stable hash of an assumption set (rates rounded to 1e-6, extra keys ignored)."""
+    values = [round(float(assumptions[name]), 6) for name in ASSUMPTIONS]
+    return hashlib.sha1(json.dumps(values).encode()).hexdigest()[:16]
+
+
+class ScenarioStore:
+    def __init__(self, path=SCENARIO_STORE_PATH):
+        """
+        Named assumption sets per company, persisted as one JSON file.
+
+        Args:
+            path: JSON file (created on first save)
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._scenarios = self._load()   # company -> {name: assumptions}
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning("Could not read scenario store %s: %s", self.path, e)
+            return {}
+
+    def _write(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp = f"{self.path}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(self._scenarios, f, indent=2, sort_keys=True)
+        os.replace(tmp, self.path)
+
+    def save(self, company, name, wacc, growth_rate, terminal_growth):
+        """
+        Save (or overwrite) a named scenario.
+
+        Args:
+            company: Company name, or HOUSE for a scenario every company gets
+            name: Scenario name (e.g. 'Bear')
+            wacc, growth_rate, terminal_growth: Decimals (0.12 = 12%)
+        """
+        name = str(name).strip()
+        if not name:
+            raise ValueError("Scenario name is required")
+        scenario = {'wacc': float(wacc), 'growth_rate': float(growth_rate),
+                    'terminal_growth': float(terminal_growth), 'saved': time.strftime('%Y-%m-%dT%H:%M:%S')}
+        with self._lock:
+            self._scenarios.setdefault(company, {})[name] = scenario
+            self._write()
+        return scenario
+
+    def delete(self, company, name):
+        """Remove a scenario; returns False if it did not exist."""
+        with self._lock:
+            scenarios = self._scenarios.get(company, {})
+            if name not in scenarios:
+                return False
+            del scenarios[name]
+            if not scenarios:
+                del self._scenarios[company]
+            self._write()
+        return True
+
+    def scenarios(self, company):
+        """House scenarios plus the company's own (which win on a name clash), by name."""
+        with self._lock:
+            merged = {**self._scenarios.get(HOUSE, {}), **self._scenarios.get(company, {})}
+            return {name: dict(s) for name, s in merged.items()}
+
+    def companies(self):
+        with self._lock:
+            return [c for c in self._scenarios if c != HOUSE]
+
+    def __len__(self):
+        with self._lock:
+            return sum(len(s) for s in self._scenarios.values())
+
+
+def scenario_inputs(panel, market_prices=None):
+    """
+    Latest-year row of every company in a panel - the row the DCF (FCF proxy),
+    EVA and thesis engines read - plus its market price.
+
+    Args:
+        panel: (Company, Year) panel (build_panel() / UniverseStore.panel())
+        market_prices: Optional mapping company -> current price
+
+    Returns:
+        DataFrame indexed by Company
+    """
+    # Universe panels hold all-NaN rows for periods a company did not report
+    reported = panel.dropna(how='all')
+    latest = reported.groupby(level='Company', sort=False).tail(1).droplevel('Year').fillna(0)
+    prices = market_prices or {}
+    latest['Market Price'] = [float(prices.get(company) or 0.0) for company in latest.index]
+    return latest
+
+
+class ScenarioEvaluator:
+    def __init__(self, max_entries=SCENARIO_CACHE_ENTRIES):
+        """
+        Batched, memoized scenario evaluation.
+
+        Args:
+            max_entries: (company inputs, assumptions) results kept, least recently used evicted
+        """
+        self.max_entries = max_entries
+        self._results = OrderedDict()   # (inputs hash, assumption hash) -> result row
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def evaluate(self, inputs, scenarios):
+        """
+        Evaluate scenarios for every company of inputs.
+
+        Args:
+            inputs: scenario_inputs() frame (one row per company)
+            scenarios: Either {name: assumptions}, applied to every company, or a
+                       ScenarioStore (each company gets its own plus the house scenarios)
+
+        Returns:
+            DataFrame indexed by (Company, Scenario) with RESULT_COLUMNS
+        """
+        if isinstance(scenarios, ScenarioStore):
+            pairs = [(i, name, s) for i, company in enumerate(inputs.index)
+                     for name, s in scenarios.scenarios(company).items()]
+        else:
+            pairs = [(i, name, s) for i in range(len(inputs)) for name, s in scenarios.items()]
+        return self.evaluate_pairs(inputs, pairs)
+
+    def evaluate_pairs(self, inputs, pairs):
+        """
+        Args:
+            inputs: scenario_inputs() frame
+            pairs: [(row position in inputs, scenario name, assumptions), ...]
+        """
+        index = pd.MultiIndex.from_tuples([(inputs.index[i], name) for i, name, _ in pairs],
+                                          names=['Company', 'Scenario'])
+        if not pairs:
+            return pd.DataFrame(columns=RESULT_COLUMNS, index=index)
+
+        # One hash per company row (every metric plus the price) and per assumption set
+        row_hashes = pd.util.hash_pandas_object(inputs, index=True).to_numpy()
+        keys = [(int(row_hashes[i]), assumption_hash(s)) for i, _, s in pairs]
+
+        rows = [None] * len(pairs)
+        with self._lock:
+            for n, key in enumerate(keys):
+                cached = self._results.get(key)
+                if cached is not None:
+                    self._results.move_to_end(key)
+                    rows[n] = cached
+        missing = [n for n, row in enumerate(rows) if row is None]
+
+        if missing:
+            computed = self._compute(inputs, [pairs[n] for n in missing])
+            with self._lock:
+                for n, row in zip(missing, computed):
+                    rows[n] = row
+                    self._results[keys[n]] = row
+                    self._results.move_to_end(keys[n])
+                while len(self._results) > self.max_entries:
+                    self._results.popitem(last=False)
+        with self._lock:
+            self.hits += len(pairs) - len(missing)
+            self.misses += len(missing)
+
+        return pd.DataFrame.from_records(rows, index=index, columns=RESULT_COLUMNS)
+
+    @staticmethod
+    def _compute(inputs, pairs):
+        """One vectorized DCF / EVA / thesis pass over one panel row per (company, scenario) pair."""
+        positions = np.array([i for i, _, _ in pairs])
+        rows = inputs.iloc[positions]
+        wacc, growth, t_growth = (np.array([float(s[name]) for _, _, s in pairs]) for name in ASSUMPTIONS)
+        price = rows['Market Price'].to_numpy(dtype=float)
+
+        fcf = estimate_fcf_proxy_panel(rows)
+        fair_value = calculate_dcf_batch(fcf, growth, wacc, t_growth)
+        # Fair value is total ₹ Cr; the price and the valuation check are per share
+        shares = rows['No. of Equity Shares'].to_numpy(dtype=float) if 'No. of Equity Shares' in rows.columns \
+            else np.zeros(len(pairs))
+        per_share = value_per_share(fair_value, shares)
+        eva = EVAAnalyzer.calculate_panel(rows, wacc)
+        thesis = ThesisEngine.score_panel(rows, per_share, price)
+
+        valid = (per_share > 0) & (price > 0)
+        upside = np.divide(per_share, price, out=np.ones(len(pairs)), where=valid) * 100 - 100
+        result = pd.DataFrame({
+            'WACC %': wacc * 100,
+            'Growth %': growth * 100,
+            'Terminal Growth %': t_growth * 100,
+            'FCF': fcf,
+            'Fair Value': fair_value.round(2),
+            'Value / Share': per_share.round(2),
+            'Market Price': price,
+            'Upside %': np.where(valid, upside, np.nan).round(1),
+            'EVA': eva['EVA'].to_numpy(),
+            'ROIC %': eva['ROIC %'].to_numpy(),
+            'Mountain Score': thesis['Mountain Score'].to_numpy(),
+            'Verdict': thesis['Verdict'].to_numpy(),
+        })
+        return result.to_dict('records')
+
+    def stats(self):
+        with self._lock:
+            return {'entries': len(self._results), 'hits': self.hits, 'misses': self.misses}
+
+    def nbytes(self):
+        """Approximate memory held by the memo (entries × the size of one result row)."""
+        with self._lock:
+            if not self._results:
+                return 0
+            key, row = next(iter(self._results.items()))
+            return len(self._results) * (approx_nbytes(key) + approx_nbytes(row))
+
+    def clear(self):
+        with self._lock:
+            self._results.clear()
+
+
+def main(argv=None):
+    from src.core.universe_store import UniverseStore
+
+    parser = argparse.ArgumentParser(description="Evaluate every saved scenario across the published universe")
+    parser.add_argument('--store', default=UNIVERSE_STORE_PATH, help="Universe store to evaluate")
+    parser.add_argument('--scenarios', default=SCENARIO_STORE_PATH, help="Scenario store (JSON)")
+    parser.add_argument('--output', help="Write the (Company, Scenario) table to this CSV")
+    args = parser.parse_args(argv)
+
+    store = UniverseStore.open_current(args.store)
+    if store is None:
+        print(f"❌ No universe published under {args.store}")
+        return 1
+    scenarios = ScenarioStore(args.scenarios)
+    if not len(scenarios):
+        print(f"❌ No scenarios saved in {args.scenarios}")
+        return 1
+
+    prices = {company: store.company_metadata(company).get('current_price', 0) for company in store.companies}
+    inputs = scenario_inputs(store.panel(), prices)
+    started = time.perf_counter()
+    results = ScenarioEvaluator().evaluate(inputs, scenarios)
+    elapsed = (time.perf_counter() - started) * 1000
+
+    print(f"✓ {len(results)} company × scenario results for {len(inputs)} companies in {elapsed:.0f} ms")
+    summary = results.groupby(level='Scenario').agg(
+        companies=('Fair Value', 'size'), median_upside=('Upside %', 'median'),
+        investable=('Mountain Score', lambda s: int((s >= 2).sum())))
+    print(summary.to_string())
+    if args.output:
+        results.to_csv(args.output)
+        print(f"✓ Written to {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
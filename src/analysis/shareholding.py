@@ -1,6 +1,9 @@
 
 import pandas as pd
 
+from src.core.profiler import profile_methods
+
+@profile_methods()
 class CapitalAnalyzer:
     def __init__(self, df):
         self.df = df
@@ -8,9 +8,15 @@ CORRECTED: Works with corrected data loader and analyzer structure
 import pandas as pd
 import numpy as np
 
+from src.core.log import get_logger
+from src.core.profiler import profile_methods
 
+logger = get_logger(__name__)
+
+
+@profile_methods()
 class ThesisEngine:
-    def __init__(self, data, dcf_val, market_price):
+    def __init__(self, data, dcf_val, market_price, metrics=None):
         """
         Investment Thesis Generation Engine.
         
@@ -19,11 +25,13 @@ class ThesisEngine:
                   'Report Date' column (metric names), date columns (values)
             dcf_val: Intrinsic value from DCF calculation
             market_price: Current market price
+            metrics: Optional metrics already extracted from the same data
+                     (e.g. prefetched), skipping _extract_metrics()
         """
         self.data = data
         self.dcf_val = dcf_val
         self.market_price = market_price
-        self.metrics = self._extract_metrics()
+        self.metrics = metrics if metrics is not None else self._extract_metrics()
 
     def _extract_metrics(self):
         """
@@ -69,7 +77,7 @@ class ThesisEngine:
             return metrics
             
         except Exception as e:
-            print(f"⚠️  Error extracting metrics for thesis: {e}")
+            logger.warning("Error extracting metrics for thesis: %s", e)
             return {
                 'net_profit': 0,
                 'sales': 0,
@@ -143,7 +151,8 @@ class ThesisEngine:
         
         return analysis
 
-    def _get_verdict_text(self, score):
+    @staticmethod
+    def _get_verdict_text(score):
         """Get verdict based on score."""
         if score >= 3:
             return "🏔️ STRONG BUY - Investable Grade"
@@ -165,3 +174,48 @@ class ThesisEngine:
             return "Moderate"
         else:
             return "Low"
+
+    @classmethod
+    def score_panel(cls, panel, dcf_values=None, market_prices=None):
+        """
+        Vectorized Mountain Score for every row of a (Company, Year) × metric panel.
+        
+        Applies the generate_verdict() rules (valuation, ROE > 15%, D/E < 1.0)
+        to all rows at once.
+        
+        Args:
+            panel: DataFrame from build_panel() / UniverseStore.panel()
+            dcf_values: Optional array/Series of intrinsic values aligned to the panel
+            market_prices: Optional array/Series of market prices aligned to the panel
+        
+        Returns:
+            DataFrame with ROE %, D/E, Profit Margin %, Mountain Score, Verdict
+        """
+        n = len(panel)
+        
+        def column(name):
+            if name in panel.columns:
+                return panel[name].to_numpy(dtype=float)
+            return np.zeros(n)
+        
+        equity = column('Equity Share Capital') + column('Reserves')
+        positive_equity = equity > 0
+        roe = np.divide(column('Net profit'), equity, out=np.zeros(n), where=positive_equity) * 100
+        de_ratio = np.divide(column('Borrowings'), equity, out=np.zeros(n), where=positive_equity)
+        sales = column('Sales')
+        margin = np.divide(column('Profit before tax'), sales, out=np.zeros(n), where=sales > 0) * 100
+        
+        score = (roe > 15).astype(int) + (de_ratio < 1.0).astype(int)
+        if dcf_values is not None and market_prices is not None:
+            dcf_values = np.asarray(dcf_values, dtype=float)
+            market_prices = np.asarray(market_prices, dtype=float)
+            score += ((dcf_values > 0) & (market_prices > 0) & (dcf_values > market_prices)).astype(int)
+        
+        verdicts = {s: cls._get_verdict_text(s) for s in range(4)}
+        return pd.DataFrame({
+            'ROE %': roe,
+            'D/E': de_ratio,
+            'Profit Margin %': margin,
+            'Mountain Score': score,
+            'Verdict': [verdicts[s] for s in score],
+        }, index=panel.index)
@@ -0,0 +1,124 @@
+"""
+ttm.py - Trailing-Twelve-Month Engine
+🏔️ THE MOUNTAIN PATH - World of Finance
+
+Keeps a rolling four-quarter window per flow metric (Sales, Net profit, ...).
+Each new quarter updates the running sums in O(1) per metric:
+
+    TTM_new = TTM_old + Q_new - Q_dropped
+
+so results-season updates never re-sum history.
+"""
+
+from collections import deque
+
+import pandas as pd
+
+from src.core.profiler import profile_methods
+
+
+@profile_methods()
+class TTMEngine:
+    def __init__(self, window=4):
+        """
+        Initialize TTM Engine.
+
+        Args:
+            window: Number of quarters in the trailing window (default 4)
+        """
+        self.window = window
+        self.periods = deque(maxlen=window)
+        self._values = {}
+        self._sums = {}
+
+    @classmethod
+    def from_quarterly(cls, quarterly_df, window=4):
+        """Seed an engine from the loader's quarterly frame ('Report Date' layout)."""
+        engine = cls(window)
+        engine.extend(quarterly_df)
+        return engine
+
+    def update(self, period, values):
+        """
+        Push one quarter into the window.
+
+        Args:
+            period: Quarter-end date string ('YYYY-MM-DD')
+            values: Mapping of metric name -> quarterly value
+
+        Re-sending the latest period (a restated quarter) replaces it in place.
+        """
+        restated = len(self.periods) > 0 and self.periods[-1] == period
+        if not restated:
+            self.periods.append(period)
+
+        for metric, value in values.items():
+            value = float(value)
+            window = self._values.get(metric)
+            if window is None:
+                window = self._values[metric] = deque(maxlen=self.window)
+                self._sums[metric] = 0.0
+
+            if restated and window:
+                self._sums[metric] += value - window[-1]
+                window[-1] = value
+                continue
+
+            if len(window) == self.window:
+                self._sums[metric] -= window[0]
+            window.append(value)
+            self._sums[metric] += value
+
+    def extend(self, quarterly_df):
+        """Push every quarter of a loader frame that is newer than the last one seen."""
+        if quarterly_df is None or quarterly_df.empty:
+            return self
+
+        df_t = quarterly_df.set_index('Report Date').T
+        df_t = df_t.loc[:, ~df_t.columns.duplicated()]
+
+        for period, row in df_t.sort_index().iterrows():
+            period = str(period)
+            if self.periods and period < self.periods[-1]:
+                continue
+            self.update(period, pd.to_numeric(row, errors='coerce').fillna(0).to_dict())
+        return self
+
+    @property
+    def is_complete(self):
+        """True once a full window of quarters has been seen."""
+        return len(self.periods) == self.window
+
+    @property
+    def latest_period(self):
+        return self.periods[-1] if self.periods else None
+
+    def get_ttm(self):
+        """Current trailing sums, metric name -> value."""
+        return dict(self._sums)
+
+    def apply_to(self, annual_df, label='TTM'):
+        """
+        Append a TTM column to an annual loader frame.
+
+        Flow metrics covered by the quarterly block take their trailing sums;
+        balance sheet items and P&L lines Screener does not report quarterly
+        carry the latest annual value. Returns the frame unchanged until a
+        full window is available.
+
+        The label is not a report date: period-over-period consumers (growth,
+        sector fiscal-year buckets, forecasts) skip it via
+        src.core.panel.report_periods() / annual_frame().
+        """
+        if not self.is_complete:
+            return annual_df
+
+        date_columns = [col for col in annual_df.columns if col != 'Report Date']
+        if not date_columns:
+            return annual_df
+
+        ttm = self.get_ttm()
+        result = annual_df.copy()
+        latest = result[date_columns[-1]]
+        result[label] = [ttm.get(metric, value) for metric, value in zip(result['Report Date'], latest)]
+        return result
@@ -2,6 +2,9 @@
 import numpy as np
 import pandas as pd
 
+from src.core.profiler import profiled
+
+@profiled('valuation.calculate_dcf')
 def calculate_dcf(fcf, growth_rate, wacc_decimal, terminal_growth):
     """
     Standard 2-Stage DCF Model
@@ -39,17 +42,124 @@ def calculate_dcf(fcf, growth_rate, wacc_decimal, terminal_growth):
     # Final safety check: Valuation cannot be negative
     return max(0, intrinsic_value)
 
+def calculate_dcf_batch(fcf, growth_rate, wacc_decimal, terminal_growth):
+    """
+    Vectorized calculate_dcf(): same 2-stage model for many scenarios in one
+    call. Inputs are scalars or arrays that broadcast together; returns a
+    float array of intrinsic values (0 where WACC <= terminal growth, never
+    negative), matching calculate_dcf() element by element.
+    """
+    fcf, growth, wacc, t_growth = np.broadcast_arrays(
+        *(np.asarray(x, dtype=float) for x in (fcf, growth_rate, wacc_decimal, terminal_growth)))
+    years = np.arange(1, 6)
+
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        # Stage 1: compounded year by year exactly as calculate_dcf() does
+        steps = np.stack([fcf] + [1 + growth] * 5, axis=-1)
+        flows = np.multiply.accumulate(steps, axis=-1)[..., 1:]
+        pv_explicit = (flows / (1 + wacc[..., None]) ** years).sum(axis=-1)
+
+        # Stage 2: Gordon Growth terminal value, discounted from year 5
+        terminal_value = flows[..., -1] * (1 + t_growth) / (wacc - t_growth)
+        intrinsic = pv_explicit + terminal_value / (1 + wacc) ** 5
+
+    return np.where(wacc <= t_growth, 0.0, np.maximum(intrinsic, 0))
+
+def calculate_dcf_paths(fcf_paths, wacc_decimal, terminal_growth):
+    """
+    Multi-year DCF over explicit FCF paths (e.g. src/analysis/forecast.py):
+    each path's years are discounted, and the last year grows into a Gordon
+    terminal value. fcf_paths is (..., years); rates broadcast against the
+    leading dimensions. A path growing at a constant g reproduces
+    calculate_dcf(fcf, g, ...). Returns 0 where WACC <= terminal growth,
+    never negative.
+    """
+    paths = np.asarray(fcf_paths, dtype=float)
+    wacc = np.asarray(wacc_decimal, dtype=float)
+    t_growth = np.asarray(terminal_growth, dtype=float)
+    years = np.arange(1, paths.shape[-1] + 1)
+
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        pv_explicit = (paths / (1 + wacc[..., None]) ** years).sum(axis=-1)
+        terminal_value = paths[..., -1] * (1 + t_growth) / (wacc - t_growth)
+        intrinsic = pv_explicit + terminal_value / (1 + wacc) ** years[-1]
+
+    return np.where(wacc <= t_growth, 0.0, np.maximum(np.nan_to_num(intrinsic), 0))
+
+@profiled('valuation.get_sensitivity_matrix')
 def get_sensitivity_matrix(fcf, growth_range, wacc_range, terminal_growth):
     """
     Generates data for the Heatmap in the UI.
     """
-    results = {}
-    for g in growth_range:
-        column = []
-        for w in wacc_range:
-            # Calculate fair value for each combination
-            val = calculate_dcf(fcf, g, w, terminal_growth)
-            column.append(val)
-        results[g] = column
-        
-    return pd.DataFrame(results, index=wacc_range)
+    # One vectorized call over the whole WACC x growth grid
+    grid = calculate_dcf_batch(fcf, np.asarray(growth_range, dtype=float)[None, :],
+                               np.asarray(wacc_range, dtype=float)[:, None], terminal_growth)
+    return pd.DataFrame(grid, index=wacc_range, columns=growth_range)
+
+def estimate_fcf_proxy(data):
+    """
+    Conservative institutional FCF proxy for the latest period of a loader
+    frame: Net profit + 30% of Depreciation (non-cash add-back).
+    """
+    latest = data.set_index('Report Date').iloc[:, -1]
+    latest = latest[~latest.index.duplicated(keep='first')]
+    pat = float(pd.to_numeric(latest.get('Net profit', 0), errors='coerce') or 0)
+    depreciation = float(pd.to_numeric(latest.get('Depreciation', 0), errors='coerce') or 0)
+    return pat + depreciation * 0.3
+
+
+def estimate_fcf_proxy_panel(panel):
+    """Vectorized estimate_fcf_proxy() for every row of a (Company, Year) panel."""
+    def column(name):
+        if name in panel.columns:
+            return panel[name].to_numpy(dtype=float)
+        return np.zeros(len(panel))
+
+    return column('Net profit') + column('Depreciation') * 0.3
+
+
+def shares_outstanding(data):
+    """Absolute share count ('No. of Equity Shares') of the latest period of a loader frame (0 if not reported)."""
+    latest = data.set_index('Report Date').iloc[:, -1]
+    latest = latest[~latest.index.duplicated(keep='first')]
+    return float(pd.to_numeric(latest.get('No. of Equity Shares', 0), errors='coerce') or 0)
+
+
+def value_per_share(fair_value, shares):
+    """
+    Intrinsic value per share (₹) - comparable with the market price - from a
+    total DCF fair value (₹ Cr) and an absolute share count. Scalars or arrays;
+    NaN where the share count is missing.
+    """
+    fair_value = np.asarray(fair_value, dtype=float)
+    shares = np.asarray(shares, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        per_share = np.where(shares > 0, fair_value * 1e7 / shares, np.nan)
+    return float(per_share) if per_share.ndim == 0 else per_share
+
+
+def sensitivity_ranges(wacc_decimal, growth_rate, terminal_growth):
+    """
+    WACC / growth grid centred on the inputs (±2pp WACC, ±4pp growth), with
+    WACC values at or below terminal growth dropped.
+    """
+    wacc_range = [round(wacc_decimal + i, 3) for i in [-0.02, -0.01, 0, 0.01, 0.02]]
+    growth_range = [round(growth_rate + i, 3) for i in [-0.04, -0.02, 0, 0.02, 0.04]]
+    return [w for w in wacc_range if w > terminal_growth], growth_range
+
+
+def dcf_defaults(data, wacc_decimal, growth_rate, terminal_growth):
+    """
+    Everything the DCF tab shows at its default assumptions (FCF proxy, fair
+    value and sensitivity grid), so it can be computed ahead of time.
+    """
+    fcf = estimate_fcf_proxy(data)
+    wacc_range, growth_range = sensitivity_ranges(wacc_decimal, growth_rate, terminal_growth)
+    return {
+        'fcf': fcf,
+        'wacc': wacc_decimal,
+        'growth_rate': growth_rate,
+        'terminal_growth': terminal_growth,
+        'fair_value': calculate_dcf(fcf, growth_rate, wacc_decimal, terminal_growth) if wacc_decimal > terminal_growth else 0.0,
+        'matrix': get_sensitivity_matrix(fcf, growth_range, wacc_range, terminal_growth) if wacc_range else None,
+    }
@@ -25,7 +25,7 @@ COLORS = {
 }
 
 # =============================================================================
-# NAVIGATION (The 9-Tab Architecture)
+# NAVIGATION (The 10-Tab Architecture)
 # =============================================================================
 TABS = [
     "📊 Dashboard",      # Index 0
@@ -36,7 +36,8 @@ TABS = [
     "⚖️ Solvency",       # Index 5
     "⚡ Efficiency",     # Index 6
     "🚀 Growth",         # Index 7
-    "📝 Thesis"          # Index 8
+    "📝 Thesis",         # Index 8
+    "💹 Peers"           # Index 9
 ]
 
 # =============================================================================
@@ -46,6 +47,86 @@ FINANCIAL_DEFAULTS = {
     "risk_free_rate": 0.07,          # 7.0%
     "market_return": 0.12,           # 12.0%
     "terminal_growth": 0.04,         # 4.0%
+    "explicit_growth": 0.15,         # 15.0% DCF stage-1 growth
     "tax_rate": 0.25,                # 25% Corporate Tax
     "wacc_default": 12.0             # Default WACC percentage
 }
+
+# =============================================================================
+# INGESTION
+# =============================================================================
+UPLOAD_MAX_WORKERS = 8               # Bounded pool for concurrent workbook parsing
+UPLOAD_PROCESS_MIN_FILES = 2         # Batches this large parse in worker processes on multi-core hosts
+SECTOR_MAP_PATH = "data/sectors.csv"  # Optional Company,Sector mapping for sector benchmarks
+UNIVERSE_STORE_PATH = "data/universe"  # Memory-mapped company × period × metric store
+INGEST_STATE_PATH = "data/ingest_state"  # Per-company section fingerprints for differential re-ingestion
+
+# =============================================================================
+# WATCH FOLDER
+# =============================================================================
+WATCH_PATH = "data"                  # Folder polled for dropped Screener.in exports (top level only)
+WATCH_POLL_SECONDS = 2.0             # Seconds between scans
+WATCH_DEBOUNCE_SECONDS = 3.0         # A file must stop changing this long before it is ingested
+WATCH_MAX_WORKERS = 2                # Ingestion threads
+
+# =============================================================================
+# BACKGROUND PREFETCH
+# =============================================================================
+PREFETCH_MAX_WORKERS = 2             # Shared pool computing non-visible tabs after upload
+PREFETCH_WAIT_SECONDS = 0.25         # Bounded wait for fresh results before rendering the tabs that show them
+PREFETCH_POLL_SECONDS = 0.5          # Placeholder refresh interval while results are still computing
+SIDEBAR_WACC_DEFAULT = 10.0          # Initial WACC slider value (%) - watch-folder pre-warm keys on it
+
+# =============================================================================
+# SESSION MEMORY
+# =============================================================================
+SESSION_MEMORY_BUDGET_MB = 256       # Parsed uploads + derived results per session (LRU evicted, recomputed on demand)
+PROCESS_MEMORY_BUDGET_MB = 2048      # Same, summed over every session in the server process
+RATIO_CACHE_ENTRIES = 64             # Cached ratio-table sets (datasets), all sessions
+
+# =============================================================================
+# SCENARIOS
+# =============================================================================
+SCENARIO_STORE_PATH = "data/scenarios.json"  # Saved named DCF / EVA assumption sets per company
+SCENARIO_CACHE_ENTRIES = 20000       # Memoized (company inputs × assumptions) results, least recently used evicted
+
+# =============================================================================
+# FCF FORECASTING
+# =============================================================================
+FORECAST_HORIZON = 5                 # Projected years feeding the multi-year DCF
+FORECAST_MIN_YEARS = 3               # History needed to fit a model (else: hold the latest value)
+FORECAST_GROWTH_BOUNDS = (-0.30, 0.50)  # Fitted annual growth is clipped to this range
+FORECAST_DAMPING = 0.8               # Damped trend: each year's increment is this fraction of the last
+FORECAST_MAX_PERSISTENCE = 0.95      # Margin model: cap on year-to-year persistence of margin deviations
+
+# =============================================================================
+# BACKTEST
+# =============================================================================
+BACKTEST_FORMATION_DATE = "06-30"    # Month-day each fiscal year's portfolio is formed (after March results)
+BACKTEST_REPORT_LAG_DAYS = 90        # An annual report counts as public this long after its period end
+BACKTEST_MAX_STALENESS_DAYS = 550    # Companies whose latest public report is older are left out
+BACKTEST_HORIZON_DAYS = 365          # Forward-return window
+BACKTEST_PRICE_TOLERANCE_DAYS = 31   # Latest price on or before a date may be this old (monthly files work)
+
+# =============================================================================
+# DISPLAY
+# =============================================================================
+DISPLAY_CACHE_ENTRIES = 256          # Cached Arrow display tables (dataset × view), all sessions
+CHART_CACHE_ENTRIES = 256            # Cached chart frames / figures (dataset × view × params)
+CHART_MAX_POINTS = 1000              # Per-series point budget; longer series are LTTB-downsampled
+
+# =============================================================================
+# VALUATION SERVICE
+# =============================================================================
+SERVICE_HOST = "127.0.0.1"           # Local-only by default
+SERVICE_PORT = 8765
+SERVICE_BATCH_MAX = 512              # Max DCF requests fused into one vectorized kernel call
+SERVICE_BATCH_WAIT_MS = 2.0          # How long the first request of a batch waits for company
+SERVICE_MAX_BODY_MB = 20             # Upload / request body limit
+SERVICE_DATASET_CACHE = 256          # Parsed workbooks kept in memory (least recently used evicted)
+
+# =============================================================================
+# REPORTS
+# =============================================================================
+REPORT_CHART_DPI = 110               # Resolution of the PNG charts embedded in reports
+REPORT_CHART_CACHE = ".chart_cache"  # Rendered-chart cache directory (inside the output folder)
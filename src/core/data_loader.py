@@ -4,10 +4,29 @@ Corrected Universal Screener Loader for Screener.in Financial Data
 Properly handles Screener.in Excel export format with robust error handling
 """
 
+import hashlib
+
 import pandas as pd
 import numpy as np
 from datetime import datetime
 
+from src.core.log import get_logger, counters, PARSE_FAILURES, VALIDATION_REJECTS, SHARE_MISMATCHES
+from src.core.profiler import profiled, span
+
+logger = get_logger(__name__)
+
+
+# Column-0 labels that open a new section of the 'Data Sheet'
+SECTION_HEADERS = ('PROFIT & LOSS', 'QUARTERS', 'BALANCE SHEET', 'CASH FLOW', 'PRICE', 'DERIVED')
+
+# Fingerprinted sections -> column-0 keyword of their header row
+# ('metadata' is every row above the first section header)
+SECTIONS = {
+    'pl': 'PROFIT',
+    'quarters': 'QUARTERS',
+    'balance_sheet': 'BALANCE SHEET',
+    'cash_flow': 'CASH FLOW',
+}
 
 class UniversalScreenerLoader:
     """
@@ -16,6 +35,7 @@ class UniversalScreenerLoader:
     Structure Expected:
     - Rows 0-8: Metadata (Company Name, Shares, Current Price, Market Cap)
     - Rows 15-29: P&L Annual Data with datetime headers
+    - Rows 39-50: Quarterly Results (QUARTERS section)
     - Rows 55-70: Balance Sheet Data
     - Rows 80-84: Cash Flow Data
     """
@@ -30,31 +50,110 @@ class UniversalScreenerLoader:
             'company_name': "Unknown Entity"
         }
         self.excel_data = None
+        self.quarterly_data = None
+        self.fingerprints = {}
+        self.sections = {}
+        self._section_rows = {}
+        self._previous = None
+        
+    @profiled('loader.get_processed_data')
+    def get_processed_data(self, previous=None):
+        """
+        Main entry point to load and clean the Excel data.
         
-    def get_processed_data(self):
-        """Main entry point to load and clean the Excel data."""
+        Args:
+            previous: Optional state() of an earlier load of the same company,
+                      or a callable(company_name) returning one (or None);
+                      sections whose fingerprint is unchanged are reused
+                      instead of re-extracted
+        """
+        self._previous = None if callable(previous) else previous
         try:
             # Load the 'Data Sheet' from Screener Excel
-            self.excel_data = pd.read_excel(self.file, sheet_name='Data Sheet', header=None)
+            with span('loader.read_excel'):
+                self.excel_data = pd.read_excel(self.file, sheet_name='Data Sheet', header=None)
+            
+            with span('loader.fingerprint'):
+                self.fingerprints = self.section_fingerprints()
             
             # 1. Extract Metadata (Company, Market Cap, Price, Shares)
-            self._extract_metadata_fixed()
+            with span('loader.metadata'):
+                if self._unchanged('metadata'):
+                    self.metadata = dict(previous['metadata'])
+                else:
+                    self._extract_metadata_fixed()
+                if callable(previous):
+                    self._previous = previous(self.metadata['company_name'])
             
             # 2. Extract P&L Financial Table (Annual data)
-            processed_df = self._extract_financial_table_robust()
+            with span('loader.financial_table'):
+                processed_df = self._extract_financial_table_robust()
             
             # 3. Validation checks
-            if not self._validate_data(processed_df):
+            with span('loader.validate'):
+                valid = self._validate_data(processed_df)
+            if not valid:
                 return None, None
             
+            # 4. Extract Quarterly Results (optional - annual analysis works without it)
+            with span('loader.quarterly'):
+                self.quarterly_data = self._extract_quarterly_table()
+            
             return processed_df, self.metadata
             
-        except Exception as e:
-            print(f"❌ Error loading data: {e}")
-            import traceback
-            traceback.print_exc()
+        except Exception:
+            counters.increment(PARSE_FAILURES)
+            logger.exception("Error loading workbook")
             return None, None
 
+    def section_fingerprints(self):
+        """
+        Content hash of each section's raw cells (see SECTIONS), so a re-export
+        can be diffed section by section. Also records where each section starts.
+        """
+        df = self.excel_data
+        labels = df.iloc[:, 0]
+        headers = []
+        for i, cell in labels.items():
+            if isinstance(cell, str) and cell.strip().upper().startswith(SECTION_HEADERS):
+                headers.append(i)
+                for name, keyword in SECTIONS.items():
+                    if name not in self._section_rows and cell.strip().upper().startswith(keyword):
+                        self._section_rows[name] = i
+
+        def digest(block):
+            return hashlib.sha1(repr(block.to_numpy().tolist()).encode()).hexdigest()
+
+        fingerprints = {'metadata': digest(df.iloc[:headers[0] if headers else len(df)])}
+        for name, start in self._section_rows.items():
+            stop = next((h for h in headers if h > start), len(df))
+            fingerprints[name] = digest(df.iloc[start:stop])
+        return fingerprints
+
+    def state(self):
+        """What a later load of the same company needs to skip unchanged sections."""
+        return {'fingerprints': dict(self.fingerprints), 'sections': dict(self.sections),
+                'metadata': dict(self.metadata)}
+
+    def _unchanged(self, name):
+        previous = self._previous
+        return (previous is not None and name in self.fingerprints
+                and previous['fingerprints'].get(name) == self.fingerprints[name]
+                and (name == 'metadata' or name in previous['sections']))
+
+    def _section(self, name):
+        """
+        Extracted (DataFrame, headers) of a named section, reused from the
+        previous load when its fingerprint is unchanged.
+        """
+        if name not in self.sections:
+            if self._unchanged(name):
+                self.sections[name] = self._previous['sections'][name]
+            else:
+                row = self._section_rows.get(name)
+                self.sections[name] = self._extract_section(row) if row is not None else (None, [])
+        return self.sections[name]
+
     def _extract_metadata_fixed(self):
         """
         Extract metadata from FIXED row positions in Screener.in format.
@@ -87,25 +186,30 @@ class UniversalScreenerLoader:
             if market_cap > 0 and current_price > 0:
                 calculated_shares = market_cap / current_price
                 if abs(calculated_shares - shares) / shares > 0.05:
-                    print(f"⚠️  Warning: Share count mismatch. Excel: {shares:.2f}Cr, Calculated: {calculated_shares:.2f}Cr")
+                    counters.increment(SHARE_MISMATCHES)
+                    logger.warning("Share count mismatch. Excel: %.2fCr, Calculated: %.2fCr",
+                                   shares, calculated_shares, extra={'company': company_name})
             
-            print(f"✓ Metadata extracted:")
-            print(f"  Company: {self.metadata['company_name']}")
-            print(f"  Current Price: ₹{self.metadata['current_price']:.2f}")
-            print(f"  Market Cap: ₹{self.metadata['market_cap']:.2f} Cr")
-            print(f"  Total Shares: {self.metadata['total_shares']:.2f} Cr")
+            logger.debug("Metadata extracted: company=%s price=%.2f market_cap=%.2fCr shares=%.2fCr",
+                         self.metadata['company_name'], self.metadata['current_price'],
+                         self.metadata['market_cap'], self.metadata['total_shares'])
             
         except Exception as e:
-            print(f"⚠️  Error extracting metadata: {e}")
+            logger.warning("Error extracting metadata: %s", e)
 
     def _extract_financial_table_robust(self):
         """
-        Extract P&L financial data from Screener.in format.
+        Extract annual financial data from Screener.in format.
         
         Structure:
         - Row 14: Section header "PROFIT & LOSS"
         - Row 15: Headers with datetime objects (2016-03-31, 2017-03-31, ...)
         - Rows 16+: Financial line items with numerical data
+        - "BALANCE SHEET" and "CASH FLOW" sections follow the same layout
+        
+        Balance sheet and cash flow rows are stacked below the P&L rows and
+        aligned to the P&L report dates, so ratio engines (DuPont, EVA) can
+        read assets, equity and debt from the same frame.
         
         Returns DataFrame with:
         - Index: Financial metric names (Sales, Profit, etc.)
@@ -117,74 +221,126 @@ class UniversalScreenerLoader:
             # Find P&L section (Row 14 contains "PROFIT & LOSS")
             pl_section_row = 14
             if not isinstance(df.iloc[pl_section_row, 0], str) or 'PROFIT' not in str(df.iloc[pl_section_row, 0]):
-                for i in range(len(df)):
-                    if pd.notnull(df.iloc[i, 0]) and 'PROFIT' in str(df.iloc[i, 0]).upper():
-                        pl_section_row = i
-                        break
-            
-            # Row with headers (next row after section header)
-            header_row = pl_section_row + 1
-            
-            # Extract headers (dates) from columns 1 onwards
-            headers = df.iloc[header_row, 1:].tolist()
-            
-            # Convert datetime objects to string format 'YYYY-MM-DD'
-            headers = [self._format_date(h) for h in headers]
-            
-            # Extract data rows (starting from header_row + 1)
-            data_rows = []
-            for row_idx in range(header_row + 1, len(df)):
-                metric_name = df.iloc[row_idx, 0]
-                
-                # Stop if we hit the next section
-                if pd.notnull(metric_name) and isinstance(metric_name, str):
-                    if any(keyword in metric_name.upper() for keyword in ['QUARTERS', 'BALANCE', 'CASH FLOW']):
-                        break
-                
-                # Extract numeric values for this metric
-                if pd.notnull(metric_name) and metric_name.strip():
-                    values = []
-                    for col_idx in range(1, 1 + len(headers)):
-                        val = self._safe_float(df.iloc[row_idx, col_idx])
-                        values.append(val)
-                    
-                    data_rows.append({
-                        'Metric': str(metric_name).strip(),
-                        'values': values
-                    })
-            
-            # Create DataFrame
-            if not data_rows:
-                print("❌ No financial data found in P&L section")
+                pl_section_row = self._find_section_row('PROFIT')
+            if pl_section_row == self._section_rows.get('pl'):
+                result_df, headers = self._section('pl')
+            else:
+                result_df, headers = self._extract_section(pl_section_row)
+            
+            if result_df is None:
+                logger.error("No financial data found in P&L section")
                 return None
             
-            # Build the final dataframe
-            final_data = []
-            for row in data_rows:
-                row_dict = {'Report Date': row['Metric']}
-                for col_idx, date_str in enumerate(headers):
-                    row_dict[date_str] = row['values'][col_idx]
-                final_data.append(row_dict)
-            
-            result_df = pd.DataFrame(final_data)
+            # Balance sheet & cash flow share the annual report dates
+            for section in ['balance_sheet', 'cash_flow']:
+                section_df, _ = self._section(section)
+                if section_df is not None:
+                    section_df = section_df.reindex(columns=result_df.columns).fillna(0)
+                    result_df = pd.concat([result_df, section_df], ignore_index=True)
             
-            # Clean numeric columns
-            for col in result_df.columns:
-                if col != 'Report Date':
-                    result_df[col] = pd.to_numeric(result_df[col], errors='coerce').fillna(0)
+            # Balance sheet repeats 'Total' (liabilities & assets side); keep the first
+            result_df = result_df.drop_duplicates(subset='Report Date', keep='first').reset_index(drop=True)
             
-            print(f"✓ Financial data extracted: {len(result_df)} metrics × {len(headers)} periods")
-            print(f"  Date range: {headers[0]} to {headers[-1]}")
-            print(f"  Metrics: {', '.join(result_df['Report Date'].head(5).tolist())}...")
+            logger.debug("Financial data extracted: %d metrics × %d periods (%s to %s)",
+                         len(result_df), len(headers), headers[0], headers[-1])
             
             return result_df
             
+        except Exception:
+            logger.exception("Error extracting financial table")
+            return None
+
+    def _extract_quarterly_table(self):
+        """
+        Extract the QUARTERS block (last ~10 quarters of P&L flows).
+        
+        Returns DataFrame in the same 'Report Date' layout as the annual data,
+        with quarter-end dates as columns, or None if the section is missing.
+        """
+        try:
+            if 'quarters' not in self._section_rows:
+                logger.info("No QUARTERS section found - TTM figures unavailable")
+                return None
+            
+            quarterly_df, headers = self._section('quarters')
+            if quarterly_df is None:
+                return None
+            
+            logger.debug("Quarterly data extracted: %d metrics × %d quarters", len(quarterly_df), len(headers))
+            return quarterly_df
+            
         except Exception as e:
-            print(f"❌ Error extracting financial table: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.warning("Error extracting quarterly table: %s", e)
             return None
 
+    def _find_section_row(self, keyword):
+        """Return the row index of the first column-0 cell starting with keyword."""
+        df = self.excel_data
+        for i in range(len(df)):
+            cell = df.iloc[i, 0]
+            if pd.notnull(cell) and str(cell).strip().upper().startswith(keyword):
+                return i
+        return None
+
+    def _extract_section(self, section_row):
+        """
+        Extract one Screener.in section (header row + metric rows).
+        
+        The row after the section header holds the report dates; metric rows
+        follow until the next section header.
+        
+        Returns:
+            (DataFrame in 'Report Date' layout, list of date headers) or (None, headers)
+        """
+        df = self.excel_data
+        
+        # Row with headers (next row after section header)
+        header_row = section_row + 1
+        
+        # Extract headers (dates) from columns 1 onwards
+        # Convert datetime objects to string format 'YYYY-MM-DD'
+        headers = [self._format_date(h) for h in df.iloc[header_row, 1:].tolist()]
+        
+        # Extract data rows (starting from header_row + 1)
+        data_rows = []
+        for row_idx in range(header_row + 1, len(df)):
+            metric_name = df.iloc[row_idx, 0]
+            
+            # Stop if we hit the next section
+            if pd.notnull(metric_name) and isinstance(metric_name, str):
+                if metric_name.strip().upper().startswith(SECTION_HEADERS):
+                    break
+            
+            # Extract numeric values for this metric
+            if pd.notnull(metric_name) and str(metric_name).strip():
+                values = [self._safe_float(df.iloc[row_idx, col_idx]) for col_idx in range(1, 1 + len(headers))]
+                data_rows.append({
+                    'Metric': str(metric_name).strip(),
+                    'values': values
+                })
+        
+        if not data_rows:
+            return None, headers
+        
+        # Build the final dataframe (skip columns without a parseable date)
+        final_data = []
+        for row in data_rows:
+            row_dict = {'Report Date': row['Metric']}
+            for col_idx, date_str in enumerate(headers):
+                if date_str is not None:
+                    row_dict[date_str] = row['values'][col_idx]
+            final_data.append(row_dict)
+        
+        result_df = pd.DataFrame(final_data)
+        
+        # Clean numeric columns
+        for col in result_df.columns:
+            if col != 'Report Date':
+                result_df[col] = pd.to_numeric(result_df[col], errors='coerce').fillna(0)
+        
+        headers = [h for h in headers if h is not None]
+        return result_df, headers
+
     def _safe_float(self, value):
         """Safely convert value to float, handling various data types."""
         if pd.isna(value):
@@ -213,29 +369,28 @@ class UniversalScreenerLoader:
             parsed = pd.to_datetime(date_obj)
             return parsed.strftime('%Y-%m-%d')
             
-        except Exception as e:
-            print(f"⚠️  Could not format date: {date_obj}")
+        except Exception:
+            logger.debug("Could not format date: %r", date_obj)
             return None
 
     def _validate_data(self, df):
         """Validate that extracted data is reasonable."""
+        reason = None
         if df is None or df.empty:
-            print("❌ Validation failed: Empty dataframe")
-            return False
-        
-        if 'Report Date' not in df.columns:
-            print("❌ Validation failed: 'Report Date' column missing")
-            return False
-        
-        if len(df) < 5:
-            print(f"⚠️  Warning: Only {len(df)} metrics found (expected at least 5)")
-            return False
+            reason = "Empty dataframe"
+        elif 'Report Date' not in df.columns:
+            reason = "'Report Date' column missing"
+        elif len(df) < 5:
+            reason = f"Only {len(df)} metrics found (expected at least 5)"
+        elif len(df.columns) < 4:
+            reason = f"Only {len(df.columns) - 1} years of data (expected at least 3)"
         
-        if len(df.columns) < 4:
-            print(f"⚠️  Warning: Only {len(df.columns) - 1} years of data (expected at least 3)")
+        if reason is not None:
+            counters.increment(VALIDATION_REJECTS)
+            logger.warning("Validation failed: %s", reason, extra={'company': self.metadata['company_name']})
             return False
         
-        print("✓ Data validation passed")
+        logger.debug("Data validation passed")
         return True
 
 
@@ -0,0 +1,350 @@
+"""
+differential.py - Differential Workbook Re-Ingestion
+🏔️ THE MOUNTAIN PATH - World of Finance
+
+A Screener.in re-export after a new quarter usually changes one section and
+leaves the rest of the workbook byte-for-byte identical. The ingestor keeps,
+per company, the loader's section fingerprints (metadata, P&L, quarters,
+balance sheet, cash flow), the extracted section frames and the analyzer
+views built from them. Ingesting a new version:
+
+    1. skips the workbook entirely when the file hash is unchanged
+    2. re-extracts only the sections whose fingerprint changed
+    3. recomputes only the views that depend on a changed section
+       (VIEW_DEPENDENCIES), reusing the rest
+    4. returns a change summary for the company
+
+The annual frame is aligned to the P&L report dates, so every annual view
+depends on 'pl' as well as on the sections it reads rows from.
+
+    python -m src.core.differential data/workbooks --state data/ingest_state
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import os
+import pickle
+import re
+import threading
+import time
+
+from src.analysis.eva import EVAAnalyzer
+from src.analysis.financial import FinancialAnalyzer
+from src.analysis.thesis import ThesisEngine
+from src.analysis.ttm import TTMEngine
+from src.analysis.valuation import calculate_dcf, estimate_fcf_proxy, shares_outstanding, value_per_share
+from src.core.config import FINANCIAL_DEFAULTS, INGEST_STATE_PATH
+from src.core.data_loader import UniversalScreenerLoader
+from src.core.log import get_logger
+
+logger = get_logger('src.core.differential')  # also when run as __main__
+
+# View -> (loader sections it reads, parameters it takes), in build order
+VIEW_DEPENDENCIES = {
+    'profitability': (('pl', 'balance_sheet'), ()),
+    'solvency': (('pl', 'balance_sheet'), ()),
+    'efficiency': (('pl', 'balance_sheet'), ()),
+    'eva': (('pl', 'balance_sheet'), ('wacc',)),
+    'dcf': (('pl',), ('wacc', 'growth_rate', 'terminal_growth')),
+    'ttm': (('quarters',), ()),
+    'thesis_metrics': (('pl', 'balance_sheet'), ()),
+    'thesis': (('pl', 'balance_sheet', 'metadata'), ('wacc', 'growth_rate', 'terminal_growth')),
+}
+
+VIEWS = tuple(VIEW_DEPENDENCIES)
+
+
+def _build_view(view, data, metadata, quarterly, params, views):
+    """Compute one view; `views` holds the views built before it."""
+    if view in ('profitability', 'solvency', 'efficiency'):
+        analyzer = FinancialAnalyzer(data)
+        return getattr(analyzer, f"get_{view}_metrics")()
+    if view == 'eva':
+        return EVAAnalyzer(data, params['wacc']).calculate_eva()
+    if view == 'dcf':
+        fcf = estimate_fcf_proxy(data)
+        return {'fcf': fcf, 'fair_value': calculate_dcf(fcf, params['growth_rate'], params['wacc'],
+                                                         params['terminal_growth'])}
+    if view == 'ttm':
+        return TTMEngine.from_quarterly(quarterly).get_ttm() if quarterly is not None else {}
+    if view == 'thesis_metrics':
+        return ThesisEngine(data, 0.0, 0.0).metrics
+    if view == 'thesis':
+        fair_value = views['dcf']['fair_value'] if 'dcf' in views else _build_view(
+            'dcf', data, metadata, quarterly, params, views)['fair_value']
+        price = float(metadata.get('current_price') or 0.0)
+        per_share = value_per_share(fair_value, shares_outstanding(data))
+        return ThesisEngine(data, per_share, price, metrics=views.get('thesis_metrics')).get_full_analysis()
+    raise ValueError(f"Unknown view {view!r}")
+
+
+def _periods(frame):
+    return [c for c in frame.columns if c != 'Report Date'] if frame is not None else []
+
+
+def _changed_metrics(old, new):
+    """Annual metrics whose values differ on the periods both versions report."""
+    if old is None or new is None:
+        return []
+    common = [p for p in _periods(new) if p in set(_periods(old))]
+    a = old.drop_duplicates('Report Date').set_index('Report Date')[common]
+    b = new.drop_duplicates('Report Date').set_index('Report Date')[common]
+    changed = [m for m in b.index if m not in a.index]
+    shared = b.index.intersection(a.index)
+    diff = (a.loc[shared] - b.loc[shared]).abs().max(axis=1) > 1e-9
+    changed += list(diff.index[diff])
+    return sorted(set(changed) | {m for m in a.index if m not in b.index})
+
+
+def format_change_summary(changes):
+    """One-line description of a change summary, for logs and status lines."""
+    if changes['status'] != 'updated':
+        return changes['status']
+    parts = [f"changed {', '.join(changes['changed_sections'])}"]
+    if changes['added_periods']:
+        parts.append(f"+{', '.join(changes['added_periods'])}")
+    if changes['removed_periods']:
+        parts.append(f"-{', '.join(changes['removed_periods'])}")
+    if changes['changed_metrics']:
+        parts.append(f"{len(changes['changed_metrics'])} metric(s) revised")
+    parts.append(f"{len(changes['recomputed'])} view(s) recomputed, {len(changes['reused'])} reused")
+    return 'updated: ' + '; '.join(parts)
+
+
+def _read(source, name=None):
+    """(workbook bytes, display name) of a path, bytes or file-like source."""
+    if isinstance(source, (str, os.PathLike)):
+        name = name or os.path.basename(source)
+        with open(source, 'rb') as f:
+            payload = f.read()
+    elif isinstance(source, (bytes, bytearray)):
+        payload = bytes(source)
+    else:
+        name = name or getattr(source, 'name', None)
+        payload = source.getvalue() if hasattr(source, 'getvalue') else source.read()
+    return payload, name or 'workbook'
+
+
+class DifferentialIngestor:
+    def __init__(self, state_dir=None, views=VIEWS, params=None, states=None):
+        """
+        Args:
+            state_dir: Directory persisting per-company state between runs
+                       (None keeps it in memory, for this ingestor's lifetime)
+            views: Views to maintain (() = section reuse and change summaries only)
+            params: wacc / growth_rate / terminal_growth as decimals
+                    (defaults: FINANCIAL_DEFAULTS)
+            states: In-memory state mapping (get / item assignment) used when
+                    state_dir is None, e.g. a SessionDataManager namespace
+        """
+        self.state_dir = state_dir
+        self.views = tuple(views)
+        self.params = {
+            'wacc': FINANCIAL_DEFAULTS['wacc_default'] / 100,
+            'growth_rate': FINANCIAL_DEFAULTS['explicit_growth'],
+            'terminal_growth': FINANCIAL_DEFAULTS['terminal_growth'],
+        }
+        self.params.update(params or {})
+        self._states = {} if states is None else states
+        self._file_index = {}
+        self._lock = threading.Lock()
+        if state_dir:
+            os.makedirs(state_dir, exist_ok=True)
+            index = os.path.join(state_dir, 'index.json')
+            if os.path.exists(index):
+                with open(index, encoding='utf-8') as f:
+                    self._file_index = json.load(f)
+
+    # ---- persistence -----------------------------------------------------
+
+    def _state_path(self, company):
+        slug = re.sub(r'[^A-Za-z0-9]+', '-', company).strip('-').lower() or 'company'
+        return os.path.join(self.state_dir, f"{slug[:60]}-{hashlib.sha1(company.encode()).hexdigest()[:8]}.pkl")
+
+    def _get_state(self, company):
+        with self._lock:
+            state = self._states.get(company)
+        if state is None and self.state_dir:
+            path = self._state_path(company)
+            if os.path.exists(path):
+                try:
+                    with open(path, 'rb') as f:
+                        state = pickle.load(f)
+                except Exception as e:
+                    logger.warning("Ignoring unreadable ingest state %s: %s", path, e)
+        return state
+
+    def _put_state(self, company, state):
+        with self._lock:
+            if not self.state_dir:
+                self._states[company] = state
+            self._file_index = {h: c for h, c in self._file_index.items() if c != company}
+            self._file_index[state['file_hash']] = company
+            index = dict(self._file_index)
+        if self.state_dir:
+            path = self._state_path(company)
+            tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp, 'wb') as f:
+                pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, path)
+            tmp = os.path.join(self.state_dir, f"index.json.{os.getpid()}.{threading.get_ident()}.tmp")
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(index, f)
+            os.replace(tmp, os.path.join(self.state_dir, 'index.json'))
+
+    # ---- ingestion -------------------------------------------------------
+
+    def _view_key(self, view, fingerprints):
+        sections, params = VIEW_DEPENDENCIES[view]
+        return (tuple(fingerprints.get(s) for s in sections), tuple(self.params[p] for p in params))
+
+    def _result(self, name, state, changes):
+        return {'name': name, 'data': state['data'], 'metadata': state['metadata'],
+                'quarterly': state['quarterly'], 'views': {v: state['views'][v][1] for v in self.views},
+                'changes': changes}
+
+    def _unchanged(self, file_hash, name, start):
+        """The 'unchanged' result for a file identical to its company's last version, else None."""
+        with self._lock:
+            company = self._file_index.get(file_hash)
+        previous = self._get_state(company) if company else None
+        if previous is None or previous['file_hash'] != file_hash or \
+                any(self._view_key(v, previous['fingerprints']) != previous['views'].get(v, (None,))[0]
+                    for v in self.views):
+            return None
+        changes = {'company': company, 'status': 'unchanged', 'changed_sections': [],
+                   'unchanged_sections': sorted(previous['fingerprints']), 'added_periods': [],
+                   'removed_periods': [], 'changed_metrics': [], 'recomputed': [],
+                   'reused': list(self.views), 'elapsed_ms': round((time.perf_counter() - start) * 1000, 2)}
+        return self._result(name, previous, changes)
+
+    def unchanged(self, source, name=None):
+        """
+        ingest()'s result when source is identical to its company's last
+        version (no parse needed), else None.
+        """
+        payload, name = _read(source, name)
+        return self._unchanged(hashlib.sha1(payload).hexdigest(), name, time.perf_counter())
+
+    def ingest(self, source, name=None, parsed=None):
+        """
+        Ingest one workbook, reusing whatever is unchanged since the company's
+        last version.
+
+        Args:
+            source: Raw workbook bytes, a path, or a file-like object
+            name: Display name (defaults to the file name)
+            parsed: Optional parse_workbook(..., with_state=True) result of the
+                    same bytes done elsewhere (e.g. in a worker process); the
+                    parse is skipped, the rest (change summary, views, state) runs
+
+        Returns:
+            parse_workbook()-style dict plus 'views' (view -> value) and
+            'changes' (status 'new' | 'unchanged' | 'updated' | 'invalid',
+            changed/unchanged sections, added/removed periods, revised
+            metrics, recomputed/reused views, elapsed_ms)
+        """
+        start = time.perf_counter()
+        payload, name = _read(source, name)
+        file_hash = hashlib.sha1(payload).hexdigest()
+
+        # 1. Identical file: nothing to parse or recompute
+        result = self._unchanged(file_hash, name, start)
+        if result is not None:
+            return result
+
+        # 2. Parse, reusing unchanged sections of the company's last version
+        if parsed is None:
+            loader = UniversalScreenerLoader(io.BytesIO(payload))
+            data, metadata = loader.get_processed_data(previous=self._get_state)
+            quarterly, loader_state = loader.quarterly_data, loader.state()
+        else:
+            data, metadata, quarterly = parsed['data'], parsed['metadata'], parsed['quarterly']
+            loader_state = parsed.get('state') or {'fingerprints': {}, 'sections': {}}
+        if data is None:
+            changes = {'company': None, 'status': 'invalid', 'changed_sections': [], 'unchanged_sections': [],
+                       'added_periods': [], 'removed_periods': [], 'changed_metrics': [], 'recomputed': [],
+                       'reused': [], 'elapsed_ms': round((time.perf_counter() - start) * 1000, 2)}
+            return {'name': name, 'data': None, 'metadata': None, 'quarterly': None, 'views': {},
+                    'changes': changes}
+
+        company = metadata['company_name']
+        previous = self._get_state(company)
+        fingerprints = loader_state['fingerprints']
+        old_fingerprints = previous['fingerprints'] if previous else {}
+        changed = sorted(s for s in fingerprints if old_fingerprints.get(s) != fingerprints[s])
+        changed += sorted(s for s in old_fingerprints if s not in fingerprints)
+
+        # 3. Recompute only the views whose inputs changed
+        old_views = previous['views'] if previous else {}
+        views, recomputed, reused = {}, [], []
+        for view in self.views:
+            key = self._view_key(view, fingerprints)
+            if view in old_views and old_views[view][0] == key:
+                views[view] = old_views[view]
+                reused.append(view)
+            else:
+                value = _build_view(view, data, metadata, quarterly, self.params,
+                                    {v: entry[1] for v, entry in views.items()})
+                views[view] = (key, value)
+                recomputed.append(view)
+
+        state = {'file_hash': file_hash, 'fingerprints': dict(fingerprints), 'sections': dict(loader_state['sections']),
+                 'data': data, 'metadata': metadata, 'quarterly': quarterly, 'views': views}
+        self._put_state(company, state)
+
+        old_periods, new_periods = _periods(previous['data']) if previous else [], _periods(data)
+        annual_changed = previous is not None and any(s in changed for s in ('pl', 'balance_sheet', 'cash_flow'))
+        changes = {
+            'company': company,
+            'status': 'new' if previous is None else ('updated' if changed else 'unchanged'),
+            'changed_sections': changed if previous else [],
+            'unchanged_sections': sorted(s for s in fingerprints if s not in changed) if previous else [],
+            'added_periods': [p for p in new_periods if p not in set(old_periods)] if previous else [],
+            'removed_periods': [p for p in old_periods if p not in set(new_periods)],
+            'changed_metrics': _changed_metrics(previous['data'], data) if annual_changed else [],
+            'recomputed': recomputed,
+            'reused': reused,
+            'elapsed_ms': round((time.perf_counter() - start) * 1000, 2),
+        }
+        if previous is not None:
+            logger.info("Re-ingested %s: %s", company, format_change_summary(changes))
+        return self._result(name, state, changes)
+
+    def analysis(self, result):
+        """analyze_company()-shaped dict assembled from an ingest() result's views."""
+        from src.pipeline.evaluate import build_record
+
+        views = result['views']
+        record = build_record(result['data'], result['metadata'], views['profitability'], views['solvency'],
+                              views['eva'], views['dcf']['fcf'], views['dcf']['fair_value'], views['thesis'])
+        return {'record': record, 'profitability': views['profitability'], 'solvency': views['solvency'],
+                'efficiency': views['efficiency'], 'eva': views['eva'], 'thesis': views['thesis'],
+                'assumptions': {'fcf': views['dcf']['fcf'], **self.params}}
+
+
+def main(argv=None):
+    from src.pipeline.batch import collect_sources
+
+    parser = argparse.ArgumentParser(description="Differentially (re-)ingest Screener.in workbooks")
+    parser.add_argument('inputs', nargs='+', help="Workbooks, directories or manifest .txt files")
+    parser.add_argument('--state', default=INGEST_STATE_PATH, help="Per-company ingest state directory")
+    args = parser.parse_args(argv)
+
+    ingestor = DifferentialIngestor(args.state)
+    failures = 0
+    for source in collect_sources(args.inputs):
+        result = ingestor.ingest(source['path'], source['name'])
+        changes = result['changes']
+        if result['data'] is None:
+            failures += 1
+            print(f"❌ {source['name']}: not a valid Screener.in workbook")
+            continue
+        print(f"✓ {changes['company']}: {format_change_summary(changes)} ({changes['elapsed_ms']:.0f} ms)")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
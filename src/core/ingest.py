@@ -0,0 +1,162 @@
+"""
+ingest.py - Concurrent Workbook Ingestion
+🏔️ THE MOUNTAIN PATH - World of Finance
+
+Parses many Screener.in workbooks through a bounded worker pool.
+
+parse_workbook() is the stateless entry point: it takes raw bytes (or any
+file-like object) and returns a plain dict, creating a throw-away
+UniversalScreenerLoader per call so no excel_data/metadata is ever shared
+between workers.
+
+Parsing (the openpyxl read and the section extraction) holds the GIL, so
+threads only overlap I/O. For batches on multi-core hosts, load_workbooks()
+parses in worker processes; stateful bookkeeping (e.g. a
+DifferentialIngestor) then runs in the calling process through `finish`.
+"""
+
+import contextlib
+import io
+import os
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+
+import pandas as pd
+
+from src.core.data_loader import UniversalScreenerLoader
+from src.core.log import get_logger, counters, PARSE_FAILURES
+from src.core.profiler import profiler
+
+logger = get_logger(__name__)
+
+
+def parse_workbook(source, name=None, with_state=False):
+    """
+    Stateless parse of one Screener.in workbook.
+
+    Args:
+        source: Raw workbook bytes, a path, or a file-like object
+        name: Display name (defaults to the file name)
+        with_state: Also return the loader's 'state' (section fingerprints
+                    and frames) for DifferentialIngestor.ingest(parsed=...)
+
+    Returns:
+        dict with 'name', 'data', 'metadata', 'quarterly' ('data' is None on failure)
+    """
+    if isinstance(source, (bytes, bytearray)):
+        source = io.BytesIO(source)
+
+    loader = UniversalScreenerLoader(source)
+    data, metadata = loader.get_processed_data()
+
+    result = {
+        'name': name or getattr(source, 'name', None) or str(source),
+        'data': data,
+        'metadata': metadata,
+        'quarterly': loader.quarterly_data,
+    }
+    if with_state:
+        result['state'] = loader.state()
+    return result
+
+
+def parse_workbook_state(source, name=None):
+    """parse_workbook(..., with_state=True); a picklable process-pool entry point."""
+    return parse_workbook(source, name, with_state=True)
+
+
+def load_workbooks(files, max_workers=None, use_processes=False, on_progress=None, parse=parse_workbook,
+                   finish=None, pool=None, reuse=None):
+    """
+    Parse several workbooks concurrently.
+
+    Args:
+        files: Iterable of uploaded files (Streamlit UploadedFile), paths or
+               (name, bytes) tuples
+        max_workers: Pool size (default: min(len(files), cpu_count + 4, 32))
+        use_processes: Use a process pool instead of threads. openpyxl parsing
+                       holds the GIL, so processes scale better on multi-core
+                       servers at the cost of pickling each result back.
+        on_progress: Optional callback(name, result, done, total), called from
+                     the calling thread as each file finishes
+        parse: Per-file parser, parse(payload, name) -> dict (e.g. a
+               DifferentialIngestor's ingest; stateful parsers need threads)
+        finish: Optional finish(payload, name, result) -> dict, called in the
+                calling thread on each parse result - the stateful half of a
+                process-pool parse (e.g. parse=parse_workbook_state,
+                finish=lambda p, n, r: ingestor.ingest(p, n, parsed=r))
+        pool: Optional long-lived executor to run on instead of a new pool
+              (left running); a ProcessPoolExecutor implies use_processes
+        reuse: Optional reuse(payload, name) -> dict or None, called in the
+               calling thread before a file is submitted; a result is used
+               as is (e.g. DifferentialIngestor.unchanged: an identical
+               re-upload needs no parse)
+
+    Returns:
+        List of parse_workbook() dicts in input order.
+    """
+    jobs = []
+    for f in files:
+        if isinstance(f, tuple):
+            name, payload = f
+        elif isinstance(f, (str, os.PathLike)):
+            name, payload = os.path.basename(f), f
+        else:
+            # Hand workers immutable bytes, never the shared upload buffer
+            name, payload = f.name, f.getvalue()
+        jobs.append((name, payload))
+
+    if not jobs:
+        return []
+
+    workers = max_workers or min(len(jobs), (os.cpu_count() or 1) + 4, 32)
+    use_processes = use_processes or isinstance(pool, ProcessPoolExecutor)
+    pool_cls = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+
+    # Worker-thread profiler spans are attributed to the calling rerun
+    task = parse if use_processes else profiler.bind(parse)
+
+    results = [None] * len(jobs)
+    with contextlib.ExitStack() as stack:
+        if pool is None:
+            pool = stack.enter_context(pool_cls(max_workers=workers))
+        done, futures = 0, {}
+        for i, (name, payload) in enumerate(jobs):
+            results[i] = reuse(payload, name) if reuse is not None else None
+            if results[i] is None:
+                futures[pool.submit(task, payload, name)] = i
+                continue
+            done += 1
+            if on_progress is not None:
+                on_progress(name, results[i], done, len(jobs))
+
+        for future in as_completed(futures):
+            i = futures[future]
+            done += 1
+            try:
+                results[i] = future.result()
+                if finish is not None:
+                    results[i] = finish(jobs[i][1], jobs[i][0], results[i])
+            except Exception:
+                counters.increment(PARSE_FAILURES)
+                logger.exception("Error parsing %s", jobs[i][0])
+                results[i] = {'name': jobs[i][0], 'data': None, 'metadata': None, 'quarterly': None}
+
+            if on_progress is not None:
+                on_progress(jobs[i][0], results[i], done, len(jobs))
+
+    return results
+
+
+def load_sector_map(path):
+    """
+    Read an optional Company,Sector CSV into a dict.
+    Returns an empty mapping when the file is missing or malformed.
+    """
+    if not path or not os.path.exists(path):
+        return {}
+    try:
+        df = pd.read_csv(path)
+        return dict(zip(df['Company'].astype(str).str.strip(), df['Sector'].astype(str).str.strip()))
+    except Exception as e:
+        logger.warning("Could not read sector map %s: %s", path, e)
+        return {}
@@ -0,0 +1,137 @@
+"""
+log.py - Structured Logging and Operational Counters
+🏔️ THE MOUNTAIN PATH - World of Finance
+
+Per-module loggers under the 'src' hierarchy with a non-blocking queue
+handler: callers only enqueue the record, a background listener thread does
+the formatting and stream I/O, so logging never blocks a Streamlit rerun.
+
+    logger = get_logger(__name__)
+    logger.info("Financial data extracted: %d metrics", n, extra={'company': name})
+
+Environment:
+    MOUNTAIN_LOG_LEVEL   DEBUG / INFO / WARNING (default) / ERROR
+    MOUNTAIN_LOG_FORMAT  'text' (default) or 'json' (one object per line,
+                         extra= fields included)
+
+Counters track operational events (parse failures, validation rejects,
+share-count mismatches) independently of the log level.
+"""
+
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import threading
+from collections import Counter
+
+ROOT_LOGGER = 'src'
+
+# Counter names
+PARSE_FAILURES = 'parse_failures'
+VALIDATION_REJECTS = 'validation_rejects'
+SHARE_MISMATCHES = 'share_mismatches'
+SESSION_EVICTIONS = 'session_evictions'
+SESSION_RECOMPUTES = 'session_recomputes'
+
+# LogRecord attributes that are not user-supplied extra= fields
+_RECORD_ATTRS = set(vars(logging.makeLogRecord({}))) | {'message', 'asctime', 'taskName'}
+
+_configure_lock = threading.Lock()
+_listener = None
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    def prepare(self, record):
+        # In-process queue: resolve %-args now (they may mutate later) but leave
+        # exc_info and formatting to the listener thread
+        record = logging.makeLogRecord(vars(record))
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+class _JsonFormatter(logging.Formatter):
+    def format(self, record):
+        payload = {
+            'ts': self.formatTime(record, '%Y-%m-%dT%H:%M:%S'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        payload.update({k: v for k, v in vars(record).items() if k not in _RECORD_ATTRS})
+        if record.exc_info:
+            payload['exc_info'] = self.formatException(record.exc_info)
+        return json.dumps(payload, default=str)
+
+
+class _TextFormatter(logging.Formatter):
+    def format(self, record):
+        line = super().format(record)
+        fields = {k: v for k, v in vars(record).items() if k not in _RECORD_ATTRS}
+        if fields:
+            line += ' ' + ' '.join(f'{k}={v}' for k, v in fields.items())
+        return line
+
+
+def configure_logging(level=None, fmt=None, stream=None):
+    """
+    Attach the queue handler to the 'src' logger (idempotent).
+
+    Args:
+        level: Log level name or number (default: MOUNTAIN_LOG_LEVEL or WARNING)
+        fmt: 'text' or 'json' (default: MOUNTAIN_LOG_FORMAT or text)
+        stream: Destination stream for the listener (default: stderr)
+    """
+    global _listener
+    with _configure_lock:
+        logger = logging.getLogger(ROOT_LOGGER)
+        logger.setLevel(level or os.environ.get('MOUNTAIN_LOG_LEVEL', 'WARNING').upper())
+        if _listener is not None:
+            return logger
+
+        fmt = (fmt or os.environ.get('MOUNTAIN_LOG_FORMAT', 'text')).lower()
+        handler = logging.StreamHandler(stream)
+        handler.setFormatter(_JsonFormatter() if fmt == 'json' else
+                             _TextFormatter('%(asctime)s %(levelname)s %(name)s: %(message)s'))
+
+        records = queue.SimpleQueue()
+        logger.addHandler(_QueueHandler(records))
+        logger.propagate = False
+
+        _listener = logging.handlers.QueueListener(records, handler, respect_handler_level=True)
+        _listener.start()
+        atexit.register(_listener.stop)
+        return logger
+
+
+def get_logger(name):
+    """Module logger (pass __name__); configures the queue handler on first use."""
+    if _listener is None:
+        configure_logging()
+    return logging.getLogger(name)
+
+
+class _Counters:
+    """Thread-safe event counters (cheap enough for the request path)."""
+
+    def __init__(self):
+        self._counts = Counter()
+        self._lock = threading.Lock()
+
+    def increment(self, name, n=1):
+        with self._lock:
+            self._counts[name] += n
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self._counts)
+
+    def reset(self):
+        with self._lock:
+            self._counts.clear()
+
+
+counters = _Counters()
@@ -0,0 +1,81 @@
+"""
+panel.py - Company × Period Panel Builder
+🏔️ THE MOUNTAIN PATH - World of Finance
+
+Reshapes UniversalScreenerLoader frames ('Report Date' column holding metric
+names, one column per report date) into a long panel:
+
+- Index: (Company, Year)
+- Columns: Metric names (Sales, Net profit, Total, Reserves, ...)
+
+Every universe-level engine (DuPont, screens) runs on this layout so a single
+vectorized pass covers all periods of all companies.
+"""
+
+import pandas as pd
+
+
+def report_periods(data):
+    """
+    Period columns of a loader frame that are report dates ('YYYY-MM-DD'), in
+    order. Labels such as the 'TTM' column TTMEngine.apply_to() appends are
+    not fiscal years: they stay out of period-over-period growth, fiscal-year
+    buckets and forecast histories.
+    """
+    columns = [col for col in data.columns if col != 'Report Date']
+    dates = pd.to_datetime(pd.Series(columns, dtype=str), format='%Y-%m-%d', errors='coerce')
+    return [col for col, date in zip(columns, dates) if not pd.isna(date)]
+
+
+def annual_frame(data):
+    """The loader frame without its non-date period columns (e.g. 'TTM')."""
+    periods = report_periods(data)
+    if len(periods) == len(data.columns) - 1:
+        return data
+    return data[['Report Date', *periods]]
+
+
+def company_panel(data, company="Company"):
+    """Transpose one loader frame into a (Company, Year) × metric panel."""
+    date_columns = [col for col in data.columns if col != 'Report Date']
+    panel = data.set_index('Report Date')[date_columns].T
+
+    # Screener repeats some labels (e.g. 'Total' for both sides of the balance sheet)
+    panel = panel.loc[:, ~panel.columns.duplicated()]
+    panel = panel.apply(pd.to_numeric, errors='coerce').fillna(0)
+
+    panel.index = pd.MultiIndex.from_product([[company], panel.index.astype(str)], names=['Company', 'Year'])
+    panel.columns.name = None
+    return panel
+
+
+def build_panel(datasets):
+    """
+    Stack several loader frames into one universe panel.
+
+    Args:
+        datasets: Mapping of company name -> loader DataFrame
+
+    Returns:
+        DataFrame indexed by (Company, Year) with the union of metric columns
+        (metrics missing for a company are filled with 0).
+    """
+    frames = [company_panel(df, name) for name, df in datasets.items() if df is not None]
+    if not frames:
+        return pd.DataFrame(index=pd.MultiIndex.from_tuples([], names=['Company', 'Year']))
+    return pd.concat(frames).fillna(0)
+
+
+def find_column(panel, keyword):
+    """
+    Case-insensitive metric lookup: exact label first, then substring match.
+    Returns the column label or None.
+    """
+    key = keyword.lower()
+    for col in panel.columns:
+        if str(col).strip().lower() == key:
+            return col
+    for col in panel.columns:
+        if key in str(col).lower():
+            return col
+    return None
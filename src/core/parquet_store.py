@@ -0,0 +1,85 @@
+"""
+parquet_store.py - Partitioned Parquet Panel Store
+🏔️ THE MOUNTAIN PATH - World of Finance
+
+Full-history, universe-wide panels (annual + quarterly) on disk for
+out-of-core evaluation:
+
+    <root>/Frequency=annual/part-00000.parquet
+    <root>/Frequency=quarterly/part-00000.parquet
+
+Each file holds whole companies with rows sorted by (Company, Year), so a
+sequential scan always sees a company's history contiguously, and Parquet
+row-group statistics on Company/Year let predicate filters skip data.
+"""
+
+import os
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+FREQUENCIES = ('annual', 'quarterly')
+
+
+class ParquetPanelWriter:
+    def __init__(self, root, frequency='annual', row_group_size=10000):
+        """
+        Append-only writer; every write() produces one sorted Parquet file.
+
+        Args:
+            root: Dataset root directory
+            frequency: 'annual' or 'quarterly' (hive partition value)
+            row_group_size: Rows per Parquet row group (granularity of predicate skipping)
+        """
+        if frequency not in FREQUENCIES:
+            raise ValueError(f"frequency must be one of {FREQUENCIES}")
+        self.path = os.path.join(root, f'Frequency={frequency}')
+        self.row_group_size = row_group_size
+        os.makedirs(self.path, exist_ok=True)
+        self._part = len([f for f in os.listdir(self.path) if f.endswith('.parquet')])
+        self.rows_written = 0
+
+    def write(self, panel):
+        """
+        Write a (Company, Year) × metric panel chunk. A company must not be split
+        across write() calls.
+        """
+        if panel.empty:
+            return
+        frame = panel.reset_index().sort_values(['Company', 'Year'], kind='mergesort')
+        frame['Company'] = frame['Company'].astype(str)
+        frame['Year'] = frame['Year'].astype(str)
+        frame.columns = [str(c) for c in frame.columns]
+
+        table = pa.Table.from_pandas(frame, preserve_index=False)
+        pq.write_table(table, os.path.join(self.path, f'part-{self._part:05d}.parquet'),
+                       row_group_size=self.row_group_size)
+        self._part += 1
+        self.rows_written += len(frame)
+
+
+def open_panel_dataset(root):
+    """
+    Open the partitioned dataset with a schema unified across all files
+    (companies report different line items, so files carry different columns).
+    """
+    dataset = ds.dataset(root, format='parquet', partitioning='hive')
+    schemas = [dataset.schema] + [fragment.physical_schema for fragment in dataset.get_fragments()]
+    return ds.dataset(root, format='parquet', partitioning='hive', schema=pa.unify_schemas(schemas))
+
+
+def export_universe(store, root, companies_per_file=500, frequency='annual'):
+    """
+    Stream a UniverseStore into the Parquet layout, companies_per_file at a
+    time (peak memory is one file's worth of rows, not the universe).
+    """
+    writer = ParquetPanelWriter(root, frequency)
+    for start in range(0, len(store.companies), companies_per_file):
+        block = store.values[start:start + companies_per_file]
+        names = store.companies[start:start + companies_per_file]
+        flat = block.reshape(len(names) * len(store.periods), len(store.metrics))
+        index = pd.MultiIndex.from_product([names, store.periods], names=['Company', 'Year'])
+        writer.write(pd.DataFrame(flat, index=index, columns=store.metrics).dropna(how='all'))
+    return writer.rows_written
@@ -0,0 +1,203 @@
+"""
+prefetch.py - Background Prefetch of Per-Dataset Analyses
+🏔️ THE MOUNTAIN PATH - World of Finance
+
+As soon as a dataset is parsed, the analyses behind the non-visible tabs
+(EVA, solvency, efficiency, growth, DCF defaults, thesis inputs) are
+submitted to a small shared thread pool. Tabs read results without
+blocking: a view that is not ready yet renders a placeholder and is filled
+on the next rerun.
+
+Results are cached per dataset key (content hash + parameters), LRU-bounded
+by dataset. A failed view keeps its error (so the tab can show it) and is
+not resubmitted until retry(key, view).
+
+Keys are shared by every session looking at the same dataset and
+parameters, so sessions hold them with submit(..., owner=session) and
+drop them with release(key, owner): a key's jobs are only cancelled once
+no session holds it (and never while a pre-warm submitted without an
+owner is still running). Cancelled jobs never start, and jobs already
+running have their results discarded.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait as wait_futures
+
+import pandas as pd
+
+from src.core.log import get_logger
+from src.core.profiler import profiler
+from src.core.session_data import approx_nbytes
+
+logger = get_logger(__name__)
+
+
+def dataset_key(data, *params):
+    """Stable key for a loader frame (content hash) plus any parameters the jobs depend on."""
+    digest = hashlib.sha1()
+    digest.update(pd.util.hash_pandas_object(data, index=False).to_numpy().tobytes())
+    digest.update(repr((list(data.columns), params)).encode())
+    return digest.hexdigest()
+
+
+class Prefetcher:
+    def __init__(self, max_workers=2, max_datasets=32):
+        """
+        Args:
+            max_workers: Background worker threads shared by all sessions
+            max_datasets: Datasets whose results are kept (least recently used evicted)
+        """
+        self.max_datasets = max_datasets
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='prefetch')
+        self._results = OrderedDict()   # key -> {view: value}
+        self._errors = OrderedDict()    # (key, view) -> exception
+        self._futures = {}              # (key, view) -> Future (queued or running)
+        self._owners = {}               # key -> sessions holding it
+        self._pinned = set()            # keys with ownerless (pre-warm) jobs in flight
+        self._lock = threading.Lock()
+
+    def submit(self, key, jobs, owner=None):
+        """
+        Queue the views of one dataset that are neither cached, in flight nor failed.
+
+        Args:
+            key: dataset_key() of the dataset
+            jobs: Mapping view -> zero-argument callable
+            owner: Session holding the key until release(key, owner); None
+                   (pre-warm) keeps the jobs running until they finish
+
+        Returns:
+            List of views submitted.
+        """
+        submitted = []
+        with self._lock:
+            if owner is not None:
+                self._owners.setdefault(key, set()).add(owner)
+            cached = self._results.get(key, {})
+            for view, job in jobs.items():
+                slot = (key, view)
+                if view in cached or slot in self._futures or slot in self._errors:
+                    continue
+                future = self._executor.submit(profiler.bind(self._run), slot, job)
+                self._futures[slot] = future
+                submitted.append(view)
+            if owner is None and submitted:
+                self._pinned.add(key)
+        return submitted
+
+    def _finished(self, key):
+        """Bookkeeping once a job of key is done (lock held)."""
+        if not any(k == key for k, _ in self._futures):
+            self._pinned.discard(key)
+
+    def _run(self, slot, job):
+        key, view = slot
+        try:
+            with profiler.span(f'prefetch.{view}'):
+                value = job()
+        except Exception as e:
+            logger.exception("Prefetch job %s failed", view)
+            with self._lock:
+                if self._futures.pop(slot, None) is not None:
+                    self._errors[slot] = e
+                    while len(self._errors) > self.max_datasets * 8:
+                        self._errors.popitem(last=False)
+                self._finished(key)
+            return
+
+        with self._lock:
+            # A cancelled job is no longer registered: discard its result
+            if self._futures.pop(slot, None) is None:
+                return
+            self._finished(key)
+            self._results.setdefault(key, {})[view] = value
+            self._results.move_to_end(key)
+            while len(self._results) > self.max_datasets:
+                evicted, _ = self._results.popitem(last=False)
+                for stale in [s for s in self._errors if s[0] == evicted]:
+                    del self._errors[stale]
+
+    def get(self, key, view, default=None):
+        """Cached result, or default while the job is queued, running or failed."""
+        with self._lock:
+            views = self._results.get(key)
+            if views is None or view not in views:
+                return default
+            self._results.move_to_end(key)
+            return views[view]
+
+    def ready(self, key, view):
+        with self._lock:
+            return view in self._results.get(key, {})
+
+    def error(self, key, view):
+        """The exception a failed job raised, if any."""
+        with self._lock:
+            return self._errors.get((key, view))
+
+    def retry(self, key, view):
+        """Forget a failed view so the next submit() runs it again."""
+        with self._lock:
+            return self._errors.pop((key, view), None) is not None
+
+    def pending(self, key):
+        """Views of key still queued or running."""
+        with self._lock:
+            return [view for k, view in self._futures if k == key]
+
+    def wait(self, key, timeout=None):
+        """Block until key's in-flight jobs finish; returns True if none remain."""
+        with self._lock:
+            futures = [f for (k, _), f in self._futures.items() if k == key]
+        if futures:
+            wait_futures(futures, timeout=timeout)
+        return not self.pending(key)
+
+    def release(self, key, owner):
+        """
+        owner no longer needs key (e.g. the session switched datasets); its
+        in-flight jobs are cancelled if no other session holds it and no
+        pre-warm is running for it.
+
+        Returns:
+            Number of jobs cancelled.
+        """
+        with self._lock:
+            owners = self._owners.get(key)
+            if owners is not None:
+                owners.discard(owner)
+                if owners:
+                    return 0
+                del self._owners[key]
+            if key in self._pinned:
+                return 0
+            return self._cancel(key)
+
+    def cancel(self, key):
+        """
+        Abandon every in-flight job of key, whoever holds it.
+
+        Returns:
+            Number of jobs cancelled.
+        """
+        with self._lock:
+            self._owners.pop(key, None)
+            self._pinned.discard(key)
+            return self._cancel(key)
+
+    def _cancel(self, key):
+        stale = [slot for slot in self._futures if slot[0] == key]
+        for slot in stale:
+            self._futures.pop(slot).cancel()
+        return len(stale)
+
+    def nbytes(self):
+        """Approximate memory held by the cached results."""
+        with self._lock:
+            results = {key: dict(views) for key, views in self._results.items()}
+        return approx_nbytes(results)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,266 @@
+"""
+profiler.py - Pipeline Stage Profiler
+🏔️ THE MOUNTAIN PATH - World of Finance
+
+Timing and allocation spans around loader stages, analyzer methods and tab
+renders. Off by default; enable with MOUNTAIN_PROFILE=1 (and optionally
+MOUNTAIN_PROFILE_TRACE=path.jsonl) or profiler.enable().
+
+    with span('loader.read_excel'):
+        ...
+
+    @profiled('render.dcf_tab')
+    def render_dcf_tab(...): ...
+
+    @profile_methods('FinancialAnalyzer')
+    class FinancialAnalyzer: ...
+
+Disabled cost is one attribute check per call. Enabled, each span records
+wall time and, when memory tracking is on, net and peak Python allocations
+(tracemalloc; peaks are process-wide, so concurrent sessions inflate them).
+Finished spans are kept per run for the sidebar panel and appended to the
+JSON-lines trace file if one is configured.
+"""
+
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+from collections import deque
+
+_TRUTHY = ('1', 'true', 'yes', 'on')
+
+
+class _Profiler:
+    def __init__(self):
+        self.enabled = False
+        self.track_memory = False
+        self.trace_path = None
+        self.recent = deque(maxlen=2000)
+        self._trace_file = None
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def enable(self, trace_path=None, track_memory=True):
+        """
+        Start recording spans.
+
+        Args:
+            trace_path: Optional JSON-lines file every finished span is appended to
+            track_memory: Record allocations via tracemalloc (slows Python allocation ~2x)
+        """
+        with self._lock:
+            if self._trace_file is not None and trace_path != self.trace_path:
+                self._trace_file.close()
+                self._trace_file = None
+            self.trace_path = trace_path
+            if trace_path and self._trace_file is None:
+                self._trace_file = open(trace_path, 'a', encoding='utf-8', buffering=1)
+            self.track_memory = track_memory
+            if track_memory and not tracemalloc.is_tracing():
+                tracemalloc.start()
+            self.enabled = True
+
+    def disable(self):
+        with self._lock:
+            self.enabled = False
+            if self._trace_file is not None:
+                self._trace_file.close()
+                self._trace_file = None
+            if self.track_memory and tracemalloc.is_tracing():
+                tracemalloc.stop()
+            self.track_memory = False
+
+    # --- Per-thread state (each Streamlit session reruns on its own thread) ---
+    def _stack(self):
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def begin_run(self, run_id=None):
+        """Start collecting spans for one script run on this thread."""
+        self._local.run_id = run_id or f'{time.time_ns():x}'
+        self._local.run_spans = []
+        self._local.run_start = time.perf_counter()
+        return self._local.run_id
+
+    def run_elapsed_ms(self):
+        """Wall time since begin_run() on this thread."""
+        start = getattr(self._local, 'run_start', None)
+        return 0.0 if start is None else (time.perf_counter() - start) * 1000
+
+    def run_spans(self):
+        """Spans finished on this thread since begin_run()."""
+        return list(getattr(self._local, 'run_spans', []))
+
+    def bind(self, fn):
+        """
+        Wrap fn so spans it records on a worker thread count towards the
+        caller's current run (thread pools only - the wrapper is not picklable).
+        """
+        if not self.enabled:
+            return fn
+        run_id = getattr(self._local, 'run_id', None)
+        run_spans = getattr(self._local, 'run_spans', None)
+
+        @functools.wraps(fn)
+        def bound(*args, **kwargs):
+            saved = (getattr(self._local, 'run_id', None), getattr(self._local, 'run_spans', None))
+            self._local.run_id, self._local.run_spans = run_id, run_spans
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self._local.run_id, self._local.run_spans = saved
+        return bound
+
+    # --- Spans ---
+    def span(self, name, **attrs):
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, attrs)
+
+    def _record(self, record):
+        self.recent.append(record)
+        run_spans = getattr(self._local, 'run_spans', None)
+        if run_spans is not None:
+            run_spans.append(record)
+        if self._trace_file is not None:
+            line = json.dumps(record, default=str)
+            with self._lock:
+                if self._trace_file is not None:
+                    self._trace_file.write(line + '\n')
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ('profiler', 'name', 'attrs', 'start', 'mem_start', 'peak')
+
+    def __init__(self, profiler, name, attrs):
+        self.profiler = profiler
+        self.name = name
+        self.attrs = attrs
+        self.peak = 0
+
+    def __enter__(self):
+        stack = self.profiler._stack()
+        stack.append(self)
+        self.mem_start = None
+        if self.profiler.track_memory and tracemalloc.is_tracing():
+            self.mem_start, peak = tracemalloc.get_traced_memory()
+            if len(stack) > 1:
+                # Hand the enclosing span its peak so far before resetting it
+                stack[-2].peak = max(stack[-2].peak, peak)
+            tracemalloc.reset_peak()
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        duration = time.perf_counter() - self.start
+        stack = self.profiler._stack()
+        stack.pop()
+
+        record = {
+            'name': self.name,
+            'run': getattr(self.profiler._local, 'run_id', None),
+            'parent': stack[-1].name if stack else None,
+            'depth': len(stack),
+            'ts': time.time(),
+            'duration_ms': round(duration * 1000, 3),
+            'thread': threading.current_thread().name,
+        }
+        if self.mem_start is not None and tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            # reset_peak() in nested spans hides earlier peaks; they were reported into self.peak
+            peak = max(peak, self.peak)
+            record['alloc_kib'] = round((current - self.mem_start) / 1024, 1)
+            record['peak_kib'] = round((peak - self.mem_start) / 1024, 1)
+            if stack:
+                stack[-1].peak = max(stack[-1].peak, peak)
+        if exc_type is not None:
+            record['error'] = exc_type.__name__
+        if self.attrs:
+            record.update(self.attrs)
+
+        self.profiler._record(record)
+        return False
+
+
+profiler = _Profiler()
+span = profiler.span
+
+
+def profiled(name=None):
+    """Decorator: run the function inside a span (name defaults to its qualname)."""
+    def decorator(fn):
+        label = name or fn.__qualname__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not profiler.enabled:
+                return fn(*args, **kwargs)
+            with _Span(profiler, label, None):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def profile_methods(prefix=None):
+    """
+    Class decorator: wrap every public method (including static and class
+    methods) in a span named '<prefix>.<method>'.
+    """
+    def decorator(cls):
+        label = prefix or cls.__name__
+        for attr, value in list(vars(cls).items()):
+            if attr.startswith('_'):
+                continue
+            if isinstance(value, staticmethod):
+                setattr(cls, attr, staticmethod(profiled(f'{label}.{attr}')(value.__func__)))
+            elif isinstance(value, classmethod):
+                setattr(cls, attr, classmethod(profiled(f'{label}.{attr}')(value.__func__)))
+            elif callable(value):
+                setattr(cls, attr, profiled(f'{label}.{attr}')(value))
+        return cls
+    return decorator
+
+
+def summarize(records):
+    """
+    Aggregate span records by name.
+
+    Returns:
+        List of dicts (name, calls, total_ms, max_ms, peak_kib) sorted by total time.
+    """
+    totals = {}
+    for record in records:
+        entry = totals.setdefault(record['name'], {
+            'name': record['name'], 'calls': 0, 'total_ms': 0.0, 'max_ms': 0.0, 'peak_kib': None,
+        })
+        entry['calls'] += 1
+        entry['total_ms'] += record['duration_ms']
+        entry['max_ms'] = max(entry['max_ms'], record['duration_ms'])
+        if 'peak_kib' in record:
+            entry['peak_kib'] = max(entry['peak_kib'] or 0.0, record['peak_kib'])
+    for entry in totals.values():
+        entry['total_ms'] = round(entry['total_ms'], 3)
+    return sorted(totals.values(), key=lambda e: e['total_ms'], reverse=True)
+
+
+if os.environ.get('MOUNTAIN_PROFILE', '').strip().lower() in _TRUTHY:
+    profiler.enable(trace_path=os.environ.get('MOUNTAIN_PROFILE_TRACE') or None,
+                    track_memory=os.environ.get('MOUNTAIN_PROFILE_MEMORY', '1').strip().lower() in _TRUTHY)
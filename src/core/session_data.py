@@ -0,0 +1,348 @@
+"""
+session_data.py - Bounded Per-Session Data Manager
+🏔️ THE MOUNTAIN PATH - World of Finance
+
+Everything a session caches (parsed uploads, ingest state, derived rows) is
+registered with its SessionDataManager together with an approximate byte
+size and, where possible, a recompute callable. Two budgets are enforced
+with least-recently-used eviction:
+
+    per session  SESSION_MEMORY_BUDGET_MB  (oldest entries of that session)
+    per process  PROCESS_MEMORY_BUDGET_MB  (oldest entries of any session)
+
+An evicted entry keeps its recompute callable and small 'info' dict; the
+next get() rebuilds it (e.g. re-parses the upload's bytes). Entries without
+one are simply dropped.
+
+The app marks each rerun with begin_run(): entries used during the current
+rerun are never evicted, so a rerun whose working set exceeds the budget
+cannot thrash (evict, recompute, evict...). end_run() at the end of the
+rerun lifts that protection and trims whatever the rerun did not use, so an
+idle session's entries are evictable by the process budget.
+
+Process-wide derived caches (prefetched analyses, display tables and chart
+frames, the scenario memo) are shared by every session and bounded by entry
+counts, not by these byte budgets. They register with register_shared() so
+process_stats() - and the performance panel - can report what they hold.
+"""
+
+import itertools
+import sys
+import threading
+import weakref
+from collections import OrderedDict
+from collections.abc import Mapping
+
+import numpy as np
+import pandas as pd
+
+from src.core.config import SESSION_MEMORY_BUDGET_MB, PROCESS_MEMORY_BUDGET_MB
+from src.core.log import get_logger, counters, SESSION_EVICTIONS, SESSION_RECOMPUTES
+
+logger = get_logger(__name__)
+
+_MIB = 1024 * 1024
+_MISSING = object()
+
+# Recency across every manager in the process (process-wide LRU)
+_clock = itertools.count()
+
+
+def approx_nbytes(obj, _seen=None):
+    """
+    Approximate memory held by obj: DataFrame/Series deep memory usage,
+    array buffers and, recursively, the contents of dicts, lists and
+    tuples (each object counted once).
+    """
+    seen = set() if _seen is None else _seen
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+
+    if isinstance(obj, (pd.DataFrame, pd.Series, pd.Index)):
+        usage = obj.memory_usage(deep=True)
+        return int(usage.sum() if hasattr(usage, 'sum') else usage)
+    if isinstance(obj, np.ndarray):
+        return int(obj.nbytes)
+    nbytes = getattr(obj, 'nbytes', None)     # pyarrow tables and arrays
+    if isinstance(nbytes, int):
+        return nbytes
+    if isinstance(obj, dict):
+        return sys.getsizeof(obj) + sum(approx_nbytes(k, seen) + approx_nbytes(v, seen) for k, v in obj.items())
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        return sys.getsizeof(obj) + sum(approx_nbytes(v, seen) for v in obj)
+    return sys.getsizeof(obj)
+
+
+class _ProcessBudget:
+    """Every live manager in the process, and the byte budget they share."""
+
+    def __init__(self, budget_bytes):
+        self.budget_bytes = budget_bytes
+        self._managers = weakref.WeakSet()
+        self._shared = {}                 # name -> cache with an nbytes() method
+        self._lock = threading.Lock()
+
+    def register(self, manager):
+        with self._lock:
+            self._managers.add(manager)
+
+    def managers(self):
+        with self._lock:
+            return list(self._managers)
+
+    def register_shared(self, name, cache):
+        with self._lock:
+            self._shared[name] = cache
+
+    def shared(self):
+        with self._lock:
+            return dict(self._shared)
+
+    @property
+    def nbytes(self):
+        return sum(m.nbytes for m in self.managers())
+
+    def enforce(self):
+        """Evict the process-wide least recently used entries until under budget."""
+        with self._lock:
+            managers = list(self._managers)
+            total = sum(m.nbytes for m in managers)
+            while total > self.budget_bytes:
+                candidates = [(m.oldest_tick(), m) for m in managers]
+                candidates = [(tick, m) for tick, m in candidates if tick is not None]
+                if not candidates:
+                    break
+                _, manager = min(candidates, key=lambda c: c[0])
+                freed = manager.evict_oldest()
+                if not freed:
+                    break
+                total -= freed
+
+
+_process_budget = _ProcessBudget(PROCESS_MEMORY_BUDGET_MB * _MIB)
+
+
+def register_shared(name, cache):
+    """
+    Report a process-wide cache (anything with an nbytes() method) in
+    process_stats(). It is not evicted by the byte budgets.
+    """
+    _process_budget.register_shared(name, cache)
+
+
+def process_stats():
+    """Process-wide totals for the performance panel."""
+    managers = _process_budget.managers()
+    return {
+        'sessions': len(managers),
+        'bytes': sum(m.nbytes for m in managers),
+        'budget_bytes': _process_budget.budget_bytes,
+        'shared': {name: cache.nbytes() for name, cache in _process_budget.shared().items()},
+    }
+
+
+class SessionDataManager:
+    def __init__(self, budget_mb=SESSION_MEMORY_BUDGET_MB):
+        """
+        Args:
+            budget_mb: Per-session budget (the per-process budget is
+                       PROCESS_MEMORY_BUDGET_MB, shared by every manager)
+        """
+        self.budget_bytes = int(budget_mb * _MIB)
+        # key -> {'value', 'nbytes', 'recompute', 'info', 'tick'}; value _MISSING once evicted
+        self._entries = OrderedDict()
+        self._lock = threading.RLock()
+        self.evictions = 0
+        self.recomputes = 0
+        self._run_start = None
+        _process_budget.register(self)
+
+    # ---- bookkeeping -----------------------------------------------------
+
+    @property
+    def nbytes(self):
+        with self._lock:
+            return sum(e['nbytes'] for e in self._entries.values() if e['value'] is not _MISSING)
+
+    def _evictable(self):
+        """Resident keys, least recently used first, that the current rerun has not used."""
+        resident = [k for k, e in self._entries.items() if e['value'] is not _MISSING]
+        if self._run_start is None:
+            return resident[:-1]    # keep the most recently used entry
+        return [k for k in resident if self._entries[k]['tick'] < self._run_start]
+
+    def oldest_tick(self):
+        """Recency of this manager's oldest evictable entry (None if there is none)."""
+        with self._lock:
+            evictable = self._evictable()
+            return self._entries[evictable[0]]['tick'] if evictable else None
+
+    def evict_oldest(self):
+        """Evict the least recently used evictable entry; returns bytes freed (0 if none)."""
+        with self._lock:
+            evictable = self._evictable()
+            if not evictable:
+                return 0
+            key = evictable[0]
+            entry = self._entries[key]
+            freed = entry['nbytes']
+            if entry['recompute'] is None:
+                del self._entries[key]
+            else:
+                entry['value'] = _MISSING
+            self.evictions += 1
+        counters.increment(SESSION_EVICTIONS)
+        logger.debug("Evicted session entry %r (%.1f KiB)", key, freed / 1024)
+        return freed
+
+    def begin_run(self):
+        """Protect everything used from now on (until the next begin_run) from eviction."""
+        self._run_start = next(_clock)
+
+    def end_run(self):
+        """The rerun is over: nothing is protected any more; trim to both budgets."""
+        self._run_start = None
+        self.enforce()
+
+    def enforce(self):
+        """Evict least recently used entries until both budgets are met (or nothing is evictable)."""
+        while self.nbytes > self.budget_bytes and self.evict_oldest():
+            pass
+        _process_budget.enforce()
+
+    # ---- mapping API -----------------------------------------------------
+
+    def put(self, key, value, recompute=None, info=None):
+        """
+        Cache value under key.
+
+        Args:
+            key: Any hashable
+            value: The object to keep
+            recompute: Optional zero-argument callable rebuilding value after eviction
+            info: Small dict kept even while the value is evicted (names, metadata)
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = {'value': value, 'nbytes': approx_nbytes(value), 'recompute': recompute,
+                                  'info': info or {}, 'tick': next(_clock)}
+        self.enforce()
+
+    def get(self, key, default=None):
+        """Cached value, recomputed if it was evicted; default if unknown (or evicted without recompute)."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            self._entries.move_to_end(key)
+            entry['tick'] = next(_clock)
+            if entry['value'] is not _MISSING:
+                return entry['value']
+            recompute = entry['recompute']
+
+        value = recompute()
+        with self._lock:
+            self.recomputes += 1
+            if self._entries.get(key) is entry:
+                entry['value'], entry['nbytes'] = value, approx_nbytes(value)
+        counters.increment(SESSION_RECOMPUTES)
+        self.enforce()
+        return value
+
+    def info(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry['info'] if entry is not None else None
+
+    def pop(self, key, default=None):
+        with self._lock:
+            entry = self._entries.pop(key, None)
+        return default if entry is None or entry['value'] is _MISSING else entry['value']
+
+    def keys(self):
+        with self._lock:
+            return list(self._entries)
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def namespace(self, name):
+        """A view of this manager whose keys are prefixed with name."""
+        return SessionNamespace(self, name)
+
+    def stats(self):
+        with self._lock:
+            resident = sum(e['value'] is not _MISSING for e in self._entries.values())
+            return {
+                'entries': len(self._entries),
+                'resident': resident,
+                'bytes': self.nbytes,
+                'budget_bytes': self.budget_bytes,
+                'evictions': self.evictions,
+                'recomputes': self.recomputes,
+            }
+
+
+class SessionNamespace:
+    """Keys of one kind (uploads, ingest state, ...) within a SessionDataManager."""
+
+    def __init__(self, manager, name):
+        self.manager = manager
+        self.name = name
+
+    def put(self, key, value, recompute=None, info=None):
+        self.manager.put((self.name, key), value, recompute, info)
+
+    def __setitem__(self, key, value):
+        self.put(key, value)
+
+    def get(self, key, default=None):
+        return self.manager.get((self.name, key), default)
+
+    def info(self, key):
+        return self.manager.info((self.name, key))
+
+    def pop(self, key, default=None):
+        return self.manager.pop((self.name, key), default)
+
+    def keys(self):
+        return [k[1] for k in self.manager.keys() if isinstance(k, tuple) and len(k) == 2 and k[0] == self.name]
+
+    def __contains__(self, key):
+        return (self.name, key) in self.manager
+
+
+class LazyRecord(Mapping):
+    """
+    Read-only dict view of a cached dict value: keys present in `info`
+    (name, metadata, ...) are answered without loading - or recomputing -
+    the value itself.
+    """
+
+    def __init__(self, source, key, info):
+        self._source = source
+        self._key = key
+        self._info = info
+
+    def _value(self):
+        value = self._source.get(self._key)
+        if value is None:
+            raise KeyError(self._key)
+        return value
+
+    def __getitem__(self, item):
+        if item in self._info:
+            return self._info[item]
+        return self._value()[item]
+
+    def __iter__(self):
+        return iter({**self._value(), **self._info})
+
+    def __len__(self):
+        return len({**self._value(), **self._info})
@@ -0,0 +1,237 @@
+"""
+universe_store.py - Shared Memory-Mapped Universe Store
+🏔️ THE MOUNTAIN PATH - World of Finance
+
+The ingested company × period × metric panel lives on disk as one float64
+cube (values.npy) plus its axis labels and company metadata (axes.json).
+Readers open it with numpy memmap, so every Streamlit session and analyzer
+in the server process shares the same OS page cache - no per-session copy,
+and cold start is just a file map.
+
+Layout:
+    <root>/CURRENT              -> name of the live version directory
+    <root>/<version>/values.npy -> float64 [company, period, metric], NaN = missing
+    <root>/<version>/axes.json  -> companies, periods, metrics, metadata
+
+Writers build a new version directory and then swap CURRENT, so open
+readers are never disturbed. publish() holds <root>/.publish.lock (and a
+process lock) across its read-merge-write, so concurrent publishers - the
+watch-folder thread, the sidebar Publish button, another process - never
+drop each other's companies.
+"""
+
+import contextlib
+import json
+import os
+import shutil
+import threading
+import time
+
+import pandas as pd
+import numpy as np
+
+from src.core.panel import build_panel
+
+try:
+    import fcntl
+except ImportError:     # Windows
+    fcntl = None
+    import msvcrt
+
+_publish_lock = threading.Lock()
+
+
+@contextlib.contextmanager
+def publish_lock(root):
+    """Exclusive lock on a store root, across threads and processes."""
+    with _publish_lock, open(os.path.join(root, '.publish.lock'), 'a+b') as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class UniverseStore:
+    def __init__(self, path):
+        """
+        Open one version directory read-only.
+
+        Args:
+            path: Version directory containing values.npy and axes.json
+        """
+        self.path = path
+        with open(os.path.join(path, 'axes.json'), encoding='utf-8') as f:
+            axes = json.load(f)
+
+        self.companies = axes['companies']
+        self.periods = axes['periods']
+        self.metrics = axes['metrics']
+        self.metadata = axes.get('metadata', {})
+        self.values = np.load(os.path.join(path, 'values.npy'), mmap_mode='r')
+
+        self._company_index = {name: i for i, name in enumerate(self.companies)}
+        self._metric_index = {name: i for i, name in enumerate(self.metrics)}
+
+    @classmethod
+    def open_current(cls, root):
+        """Open the live version under root, or return None if nothing is published."""
+        version = cls.current_version(root)
+        return cls(os.path.join(root, version)) if version else None
+
+    @staticmethod
+    def current_version(root):
+        pointer = os.path.join(root, 'CURRENT')
+        if not os.path.exists(pointer):
+            return None
+        with open(pointer, encoding='utf-8') as f:
+            return f.read().strip() or None
+
+    def __len__(self):
+        return len(self.companies)
+
+    def __contains__(self, company):
+        return company in self._company_index
+
+    @property
+    def nbytes(self):
+        return self.values.nbytes
+
+    def panel(self):
+        """
+        The whole universe as a (Company, Year) × metric DataFrame backed by the
+        memory map (read-only; no copy of the cube is made).
+        """
+        flat = self.values.reshape(len(self.companies) * len(self.periods), len(self.metrics))
+        index = pd.MultiIndex.from_product([self.companies, self.periods], names=['Company', 'Year'])
+        return pd.DataFrame(flat, index=index, columns=self.metrics, copy=False)
+
+    def metric(self, name):
+        """Company × period view of one metric (zero-copy)."""
+        return self.values[:, :, self._metric_index[name]]
+
+    def company_panel(self, company):
+        """Year × metric DataFrame for one company (zero-copy; all-NaN periods dropped)."""
+        block = self.values[self._company_index[company]]
+        frame = pd.DataFrame(block, index=pd.Index(self.periods, name='Year'), columns=self.metrics, copy=False)
+        return frame.dropna(how='all')
+
+    def company_frame(self, company):
+        """
+        One company in UniversalScreenerLoader layout ('Report Date' column of
+        metric names, one column per report date), ready for the existing tabs.
+        """
+        block = self.company_panel(company)
+        frame = block.T.fillna(0)
+        frame.insert(0, 'Report Date', frame.index)
+        return frame.reset_index(drop=True)
+
+    def company_metadata(self, company):
+        """Loader-style metadata for one company (zeros where nothing was published)."""
+        metadata = {'market_cap': 0.0, 'current_price': 0.0, 'total_shares': 0.0, 'company_name': company}
+        metadata.update(self.metadata.get(company, {}))
+        return metadata
+
+    @classmethod
+    def write(cls, root, panel, metadata=None):
+        """
+        Publish a (Company, Year) × metric panel as a new version and point
+        CURRENT at it.
+
+        Args:
+            root: Store root directory
+            panel: DataFrame indexed by (Company, Year) (see src/core/panel.py)
+            metadata: Optional mapping company -> loader metadata dict
+
+        Returns:
+            The opened UniverseStore for the new version.
+        """
+        companies = list(panel.index.get_level_values('Company').unique())
+        periods = sorted(panel.index.get_level_values('Year').unique().astype(str))
+        metrics = [str(m) for m in panel.columns]
+
+        version = f'v{time.time_ns()}'
+        path = os.path.join(root, version)
+        os.makedirs(path, exist_ok=True)
+
+        cube = np.lib.format.open_memmap(
+            os.path.join(path, 'values.npy'), mode='w+', dtype=np.float64,
+            shape=(len(companies), len(periods), len(metrics)))
+        cube[:] = np.nan
+
+        company_pos = pd.Index(companies).get_indexer(panel.index.get_level_values('Company'))
+        period_pos = pd.Index(periods).get_indexer(panel.index.get_level_values('Year').astype(str))
+        cube[company_pos, period_pos, :] = panel.to_numpy(dtype=np.float64)
+        cube.flush()
+        del cube
+
+        with open(os.path.join(path, 'axes.json'), 'w', encoding='utf-8') as f:
+            json.dump({
+                'companies': [str(c) for c in companies],
+                'periods': periods,
+                'metrics': metrics,
+                'metadata': {str(k): v for k, v in (metadata or {}).items()},
+            }, f)
+
+        # Atomic publish: readers see either the old or the new version
+        pointer_tmp = os.path.join(root, f'CURRENT.{os.getpid()}.tmp')
+        with open(pointer_tmp, 'w', encoding='utf-8') as f:
+            f.write(version)
+        os.replace(pointer_tmp, os.path.join(root, 'CURRENT'))
+
+        return cls(path)
+
+    @classmethod
+    def publish(cls, root, datasets, metadata=None, keep=2):
+        """
+        Merge loader frames into the live universe and publish a new version.
+
+        Args:
+            root: Store root directory
+            datasets: Mapping company -> loader DataFrame (replaces existing rows)
+            metadata: Optional mapping company -> loader metadata dict
+            keep: Number of versions to retain on disk
+
+        Returns:
+            The opened UniverseStore for the new version.
+        """
+        os.makedirs(root, exist_ok=True)
+        panel = build_panel(datasets)
+        merged_metadata = {}
+
+        # Read-merge-write under the lock: a concurrent publish merged into
+        # the same CURRENT would otherwise drop this one's companies (or vice versa)
+        with publish_lock(root):
+            current = cls.open_current(root)
+            if current is not None:
+                retained = [c for c in current.companies if c not in datasets]
+                if retained:
+                    existing = current.panel().loc[retained].dropna(how='all')
+                    panel = pd.concat([existing, panel]).fillna(0)
+                merged_metadata.update({c: current.metadata[c] for c in retained if c in current.metadata})
+
+            merged_metadata.update(metadata or {})
+            store = cls.write(root, panel, merged_metadata)
+            cls.prune(root, keep)
+        return store
+
+    @staticmethod
+    def prune(root, keep=2):
+        """
+        Delete all but the newest `keep` versions. Processes that still map an
+        older version keep reading it: unlinked files stay valid while mapped.
+        """
+        live = UniverseStore.current_version(root)
+        versions = sorted(d for d in os.listdir(root) if os.path.isdir(os.path.join(root, d)))
+        for version in versions[:-keep]:
+            if version == live:
+                continue
+            shutil.rmtree(os.path.join(root, version), ignore_errors=True)
@@ -0,0 +1,235 @@
+"""
+watcher.py - Watch-Folder Auto-Ingestion
+🏔️ THE MOUNTAIN PATH - World of Finance
+
+Drop Screener.in exports into a folder (WATCH_PATH, default data/) and they
+are ingested without the sidebar uploader:
+
+    1. the folder is polled every WATCH_POLL_SECONDS; a workbook is only
+       picked up once its size and mtime have been stable for
+       WATCH_DEBOUNCE_SECONDS, so half-copied files are never parsed
+    2. new or changed workbooks go through a DifferentialIngestor
+       (UniversalScreenerLoader, unchanged sections reused) on a small
+       thread pool
+    3. everything that changed in one poll is published to the universe
+       store as one new version
+    4. an on_published(store, companies) hook lets the app pre-warm its
+       per-dataset caches before anyone opens those companies
+
+Standalone daemon (the app picks up each published version on its next rerun):
+
+    python -m src.core.watcher
+    python -m src.core.watcher exports/ --store data/universe --once
+
+Inside the Streamlit server, set MOUNTAIN_WATCH=1 to run it as a background
+thread that also pre-warms the analysis caches (src/ui/cache.py).
+"""
+
+import argparse
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from src.core.config import (WATCH_PATH, WATCH_POLL_SECONDS, WATCH_DEBOUNCE_SECONDS, WATCH_MAX_WORKERS,
+                             UNIVERSE_STORE_PATH, INGEST_STATE_PATH)
+from src.core.differential import DifferentialIngestor, format_change_summary
+from src.core.log import get_logger, counters, PARSE_FAILURES
+from src.core.universe_store import UniverseStore
+
+logger = get_logger('src.core.watcher')  # also when run as __main__
+
+WORKBOOK_EXTENSIONS = ('.xlsx', '.xlsm')
+
+
+def _is_candidate(name):
+    """Workbooks only; skip Excel lock files (~$x.xlsx), hidden and temporary files."""
+    return name.lower().endswith(WORKBOOK_EXTENSIONS) and not name.startswith(('~$', '.'))
+
+
+class FolderWatcher:
+    def __init__(self, directory, debounce=WATCH_DEBOUNCE_SECONDS):
+        """
+        Args:
+            directory: Folder to poll (top level only)
+            debounce: Seconds a file's size and mtime must stay unchanged
+        """
+        self.directory = directory
+        self.debounce = debounce
+        self._settled = {}    # path -> signature already handed out
+        self._pending = {}    # path -> (signature, first seen with it)
+
+    def scan(self, now=None):
+        """Paths that are new or changed and have stopped changing, oldest first."""
+        now = time.monotonic() if now is None else now
+        try:
+            entries = [e for e in os.scandir(self.directory) if e.is_file() and _is_candidate(e.name)]
+        except FileNotFoundError:
+            return []
+
+        present = set()
+        ready = []
+        for entry in entries:
+            stat = entry.stat()
+            signature = (stat.st_size, stat.st_mtime_ns)
+            present.add(entry.path)
+            if self._settled.get(entry.path) == signature:
+                continue
+            seen = self._pending.get(entry.path)
+            if seen is None or seen[0] != signature:
+                self._pending[entry.path] = (signature, now)
+            elif now - seen[1] >= self.debounce:
+                ready.append((stat.st_mtime_ns, entry.path))
+
+        # Deleted files are forgotten (a re-created file is ingested again)
+        for path in [p for p in list(self._settled) + list(self._pending) if p not in present]:
+            self._settled.pop(path, None)
+            self._pending.pop(path, None)
+        return [path for _, path in sorted(ready)]
+
+    def settle(self, path):
+        """Mark path's pending signature as handled until the file changes again."""
+        seen = self._pending.pop(path, None)
+        if seen is not None:
+            self._settled[path] = seen[0]
+
+
+class WatchService:
+    def __init__(self, directory=WATCH_PATH, store_root=UNIVERSE_STORE_PATH, state_dir=INGEST_STATE_PATH,
+                 max_workers=WATCH_MAX_WORKERS, poll_interval=WATCH_POLL_SECONDS,
+                 debounce=WATCH_DEBOUNCE_SECONDS, on_published=None):
+        """
+        Args:
+            directory: Watched folder
+            store_root: Universe store the ingested companies are published to
+            state_dir: DifferentialIngestor state (section fingerprints per company)
+            max_workers: Ingestion threads
+            poll_interval: Seconds between scans
+            debounce: See FolderWatcher
+            on_published: Optional callback(store, companies) after each publish
+        """
+        self.watcher = FolderWatcher(directory, debounce)
+        self.store_root = store_root
+        self.ingestor = DifferentialIngestor(state_dir, views=())
+        self.poll_interval = poll_interval
+        self.on_published = on_published
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='watch')
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _ingest(self, path):
+        try:
+            return path, self.ingestor.ingest(path), None
+        except Exception as e:
+            counters.increment(PARSE_FAILURES)
+            return path, None, e
+
+    def run_once(self):
+        """
+        One poll: ingest every settled new/changed workbook and publish the
+        companies that changed.
+
+        Returns:
+            dict with 'published' (company names), 'unchanged' and 'failed' (paths)
+        """
+        summary = {'published': [], 'unchanged': [], 'failed': []}
+        paths = self.watcher.scan()
+        if not paths:
+            return summary
+
+        current = UniverseStore.open_current(self.store_root)
+        datasets, metadata = {}, {}
+        published_paths = []
+        for path, result, error in self._executor.map(self._ingest, paths):
+            if error is not None or result['data'] is None:
+                # Retried only once the file changes again
+                self.watcher.settle(path)
+                logger.warning("Watch folder: could not ingest %s: %s", os.path.basename(path),
+                               error or "not a valid Screener.in workbook")
+                summary['failed'].append(path)
+                continue
+            changes = result['changes']
+            company = changes['company']
+            if changes['status'] == 'unchanged' and current is not None and company in current:
+                self.watcher.settle(path)
+                summary['unchanged'].append(path)
+                continue
+            logger.info("Watch folder: %s (%s) %s", company, os.path.basename(path), format_change_summary(changes))
+            datasets[company] = result['data']
+            metadata[company] = result['metadata']
+            published_paths.append(path)
+
+        if datasets:
+            # Settled only once published, so a failed publish is retried next poll
+            store = UniverseStore.publish(self.store_root, datasets, metadata)
+            for path in published_paths:
+                self.watcher.settle(path)
+            summary['published'] = list(datasets)
+            if self.on_published is not None:
+                try:
+                    self.on_published(store, list(datasets))
+                except Exception:
+                    logger.exception("Watch folder: on_published hook failed")
+        return summary
+
+    def run_forever(self):
+        while not self._stop.is_set():
+            try:
+                self.run_once()
+            except Exception:
+                logger.exception("Watch folder poll failed")
+            self._stop.wait(self.poll_interval)
+
+    def start(self):
+        """Run in a daemon thread (idempotent)."""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self.run_forever, name='watch-folder', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self._executor.shutdown(wait=False)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ingest Screener.in exports dropped into a folder")
+    parser.add_argument('directory', nargs='?', default=WATCH_PATH, help=f"Folder to watch (default: {WATCH_PATH})")
+    parser.add_argument('--store', default=UNIVERSE_STORE_PATH, help="Universe store to publish to")
+    parser.add_argument('--state', default=INGEST_STATE_PATH, help="Differential ingest state directory")
+    parser.add_argument('--workers', type=int, default=WATCH_MAX_WORKERS, help="Ingestion threads")
+    parser.add_argument('--interval', type=float, default=WATCH_POLL_SECONDS, help="Seconds between polls")
+    parser.add_argument('--debounce', type=float, default=WATCH_DEBOUNCE_SECONDS,
+                        help="Seconds a file must stay unchanged before it is ingested")
+    parser.add_argument('--once', action='store_true', help="Ingest what is there now and exit")
+    args = parser.parse_args(argv)
+
+    service = WatchService(args.directory, args.store, args.state, args.workers, args.interval, args.debounce)
+    if args.once:
+        # Files already in place count as settled
+        service.watcher.debounce = 0
+        service.watcher.scan()
+        summary = service.run_once()
+        for company in summary['published']:
+            print(f"✓ {company}")
+        for path in summary['failed']:
+            print(f"❌ {os.path.basename(path)}")
+        print(f"✓ Done: {len(summary['published'])} published, {len(summary['unchanged'])} unchanged, "
+              f"{len(summary['failed'])} failed")
+        return 1 if summary['failed'] else 0
+
+    print(f"✓ Watching {os.path.abspath(args.directory)} (every {args.interval:g}s) -> {args.store}")
+    try:
+        service.run_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.stop()
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
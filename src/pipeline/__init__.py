@@ -0,0 +1,6 @@
+"""
+Headless batch pipeline: the loader, analyzers, DCF and ThesisEngine
+verdicts over many companies without the Streamlit UI.
+
+    python -m src.pipeline.batch data/workbooks --output results.jsonl
+"""
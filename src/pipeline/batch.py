@@ -0,0 +1,231 @@
+"""
+batch.py - Headless Batch Valuation and Thesis Runner
+🏔️ THE MOUNTAIN PATH - World of Finance
+
+Evaluates many companies (loader -> ratios -> EVA -> DCF -> ThesisEngine)
+across a process pool and streams one result record per company to JSON
+Lines or Parquet as each finishes.
+
+Progress is kept in a ledger next to the output: rerunning the same
+command after a crash skips every company already written. The ledger
+records the run's WACC and growth rates; resuming with different ones is
+refused (use --restart, which also discards the existing output).
+
+    python -m src.pipeline.batch data/workbooks --output results.jsonl
+    python -m src.pipeline.batch manifest.txt --output results/ --format parquet --workers 8
+    python -m src.pipeline.batch --universe data/universe --output universe.jsonl
+
+Sources may be workbook files, directories (every .xlsx inside, recursive)
+or manifest .txt files (one workbook path per line, '#' comments).
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+from src.core.config import FINANCIAL_DEFAULTS
+from src.core.log import get_logger, counters, PARSE_FAILURES
+from src.core.universe_store import UniverseStore
+from src.pipeline.evaluate import evaluate_source
+from src.pipeline.ledger import ProgressLedger, source_key
+from src.pipeline.sinks import open_sink
+
+logger = get_logger('src.pipeline.batch')  # also when run as __main__
+
+WORKBOOK_EXTENSIONS = ('.xlsx', '.xlsm')
+
+
+def collect_sources(inputs=(), universe=None):
+    """
+    Expand command-line inputs into batch sources.
+
+    Args:
+        inputs: Workbook paths, directories or manifest .txt files
+        universe: Optional published UniverseStore root; every company in it
+                  becomes a source
+
+    Returns:
+        List of source dicts for evaluate_source(), duplicates removed.
+    """
+    paths = []
+    for item in inputs:
+        if os.path.isdir(item):
+            for folder, _, files in sorted(os.walk(item)):
+                paths.extend(os.path.join(folder, f) for f in sorted(files)
+                             if f.lower().endswith(WORKBOOK_EXTENSIONS) and not f.startswith('~$'))
+        elif item.lower().endswith('.txt'):
+            base = os.path.dirname(os.path.abspath(item))
+            with open(item, encoding='utf-8') as f:
+                for line in f:
+                    line = line.strip()
+                    if line and not line.startswith('#'):
+                        paths.append(os.path.join(base, line))
+        else:
+            paths.append(item)
+
+    sources, seen = [], set()
+    for path in paths:
+        if not os.path.exists(path):
+            logger.warning("Skipping missing workbook %s", path)
+            continue
+        key = source_key(path)
+        if key not in seen:
+            seen.add(key)
+            sources.append({'key': key, 'name': os.path.basename(path), 'path': path})
+
+    if universe is not None:
+        version = UniverseStore.current_version(universe)
+        store = UniverseStore.open_current(universe)
+        if store is None:
+            raise FileNotFoundError(f"No published universe under {universe}")
+        for company in store.companies:
+            # Keyed by version: republishing the universe re-evaluates it
+            sources.append({'key': f"universe:{version}:{company}", 'name': company,
+                            'universe': universe, 'company': company})
+    return sources
+
+
+class BatchRunner:
+    def __init__(self, sink, ledger, max_workers=None, params=None, retry_failed=False):
+        """
+        Args:
+            sink: Output sink (see src/pipeline/sinks.py)
+            ledger: ProgressLedger of finished sources
+            max_workers: Process pool size (default: cpu_count)
+            params: evaluate_company() keyword arguments (wacc, growth_rate, terminal_growth)
+            retry_failed: Re-evaluate sources whose ledger entry is an error
+        """
+        self.sink = sink
+        self.ledger = ledger
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.params = params or {}
+        self.retry_failed = retry_failed
+
+    def is_done(self, key):
+        entry = self.ledger.done.get(key)
+        return entry is not None and not (self.retry_failed and entry['status'] != 'ok')
+
+    def run(self, sources, on_result=None):
+        """
+        Evaluate every source not yet in the ledger.
+
+        At most 2 × max_workers sources are in flight, so memory stays flat
+        for any universe size. Results are flushed to the sink every
+        sink.batch_size records, then marked done in the ledger.
+
+        Args:
+            sources: collect_sources() output
+            on_result: Optional callback(record, done, total)
+
+        Returns:
+            dict with 'total', 'skipped', 'ok', 'errors', 'seconds'
+        """
+        todo = [s for s in sources if not self.is_done(s['key'])]
+        summary = {'total': len(sources), 'skipped': len(sources) - len(todo), 'ok': 0, 'errors': 0}
+        start = time.perf_counter()
+        pending_records = []
+        queue = iter(todo)
+
+        with ProcessPoolExecutor(max_workers=self.max_workers) as pool:
+            in_flight = set()
+
+            def refill():
+                while len(in_flight) < 2 * self.max_workers:
+                    source = next(queue, None)
+                    if source is None:
+                        return
+                    in_flight.add(pool.submit(evaluate_source, source, self.params))
+
+            refill()
+            done_count = 0
+            while in_flight:
+                finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    in_flight.discard(future)
+                    record = future.result()
+                    done_count += 1
+                    if record['status'] == 'ok':
+                        summary['ok'] += 1
+                    else:
+                        summary['errors'] += 1
+                        counters.increment(PARSE_FAILURES)
+                        logger.warning("Evaluation failed for %s: %s", record['company'], record['error'],
+                                       extra={'source': record['source']})
+                    pending_records.append(record)
+                    if on_result is not None:
+                        on_result(record, done_count, len(todo))
+
+                if len(pending_records) >= self.sink.batch_size:
+                    self._flush(pending_records)
+                    pending_records = []
+                refill()
+
+        self._flush(pending_records)
+        summary['seconds'] = round(time.perf_counter() - start, 2)
+        return summary
+
+    def _flush(self, records):
+        if records:
+            self.sink.write(records)
+            self.ledger.mark_done(records)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless batch valuation and thesis verdicts")
+    parser.add_argument('inputs', nargs='*', help="Workbooks, directories or manifest .txt files")
+    parser.add_argument('--universe', help="Evaluate every company in a published universe store")
+    parser.add_argument('--output', required=True, help="Results .jsonl file or Parquet directory")
+    parser.add_argument('--format', choices=['jsonl', 'parquet'], help="Default: from the output extension")
+    parser.add_argument('--ledger', help="Progress ledger (default: <output>.ledger.jsonl)")
+    parser.add_argument('--restart', action='store_true',
+                        help="Discard the ledger and existing output and start over")
+    parser.add_argument('--retry-failed', action='store_true', help="Re-evaluate sources that failed before")
+    parser.add_argument('--workers', type=int, help="Worker processes (default: cpu count)")
+    parser.add_argument('--batch-size', type=int, help="Records per Parquet part file")
+    parser.add_argument('--wacc', type=float, default=None, help="WACC in percent")
+    parser.add_argument('--growth', type=float, default=None, help="DCF stage-1 growth in percent")
+    parser.add_argument('--terminal-growth', type=float, default=None, help="Terminal growth in percent")
+    args = parser.parse_args(argv)
+
+    if not args.inputs and not args.universe:
+        parser.error("give workbook inputs and/or --universe")
+
+    ledger_path = args.ledger or args.output.rstrip('/\\') + '.ledger.jsonl'
+    if args.restart and os.path.exists(ledger_path):
+        os.remove(ledger_path)
+
+    # Resolved defaults, so the ledger records what every result was computed with
+    params = {
+        'wacc': (FINANCIAL_DEFAULTS['wacc_default'] if args.wacc is None else args.wacc) / 100,
+        'growth_rate': FINANCIAL_DEFAULTS['explicit_growth'] if args.growth is None else args.growth / 100,
+        'terminal_growth': (FINANCIAL_DEFAULTS['terminal_growth'] if args.terminal_growth is None
+                            else args.terminal_growth / 100),
+    }
+    sources = collect_sources(args.inputs, args.universe)
+    try:
+        ledger = ProgressLedger(ledger_path, params)
+    except ValueError as e:
+        parser.error(str(e))
+
+    sink = open_sink(args.output, args.format, args.batch_size, restart=args.restart)
+    try:
+        with ledger:
+            runner = BatchRunner(sink, ledger, args.workers, params, args.retry_failed)
+
+            def report(record, done, total):
+                mark = '✓' if record['status'] == 'ok' else '❌'
+                print(f"{mark} [{done}/{total}] {record['company']}: "
+                      f"{record['verdict'] or record['error']} ({record['elapsed_ms']:.0f} ms)")
+
+            summary = runner.run(sources, on_result=report)
+    finally:
+        sink.close()
+
+    print(f"✓ Done: {summary['ok']} ok, {summary['errors']} failed, {summary['skipped']} already done "
+          f"of {summary['total']} in {summary['seconds']:.1f}s")
+    return 1 if summary['errors'] else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,191 @@
+"""
+evaluate.py - One-Company Headless Evaluation
+🏔️ THE MOUNTAIN PATH - World of Finance
+
+Runs what the dashboard shows for one company - ratios, EVA, DCF fair value
+and the ThesisEngine verdict - and flattens it into a single result record
+(RESULT_SCHEMA). Failures never raise: they come back as a record with
+status 'error', so one bad workbook cannot stop a batch.
+
+The DCF fair value is total ₹ Cr; upside and the thesis valuation check
+compare its per-share value (value_per_share()) with the price, as the
+backtester does.
+"""
+
+import math
+import time
+
+import pyarrow as pa
+
+from src.analysis.eva import EVAAnalyzer
+from src.analysis.financial import FinancialAnalyzer
+from src.analysis.thesis import ThesisEngine
+from src.analysis.valuation import calculate_dcf, estimate_fcf_proxy, shares_outstanding, value_per_share
+from src.core.config import FINANCIAL_DEFAULTS
+from src.core.ingest import parse_workbook
+from src.core.universe_store import UniverseStore
+
+# Column order and types of every result record (JSON Lines and Parquet)
+RESULT_SCHEMA = pa.schema([
+    ('key', pa.string()),
+    ('company', pa.string()),
+    ('source', pa.string()),
+    ('status', pa.string()),
+    ('error', pa.string()),
+    ('latest_period', pa.string()),
+    ('current_price', pa.float64()),
+    ('market_cap', pa.float64()),
+    ('fcf_proxy', pa.float64()),
+    ('fair_value', pa.float64()),
+    ('value_per_share', pa.float64()),
+    ('upside_pct', pa.float64()),
+    ('roe_pct', pa.float64()),
+    ('net_margin_pct', pa.float64()),
+    ('debt_to_equity', pa.float64()),
+    ('eva', pa.float64()),
+    ('roic_pct', pa.float64()),
+    ('mountain_score', pa.int64()),
+    ('verdict', pa.string()),
+    ('confidence', pa.string()),
+    ('elapsed_ms', pa.float64()),
+])
+
+RESULT_FIELDS = RESULT_SCHEMA.names
+
+# Universe stores opened by this worker process, by root
+_stores = {}
+
+
+def _number(value):
+    """Plain float for JSON/Arrow, None for missing or non-finite values."""
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return None
+    return value if math.isfinite(value) else None
+
+
+def _latest(frame, column):
+    if frame is None or frame.empty or column not in frame.columns:
+        return None
+    return _number(frame[column].iloc[-1])
+
+
+def build_record(data, metadata, profitability, solvency, eva, fcf, fair_value, thesis):
+    """Flatten analyzer outputs into the RESULT_FIELDS that describe the company."""
+    price = _number(metadata.get('current_price')) or 0.0
+    per_share = _number(value_per_share(fair_value, shares_outstanding(data)))
+    periods = [c for c in data.columns if c != 'Report Date']
+    return {
+        'company': metadata.get('company_name'),
+        'latest_period': str(periods[-1]) if periods else None,
+        'current_price': price,
+        'market_cap': _number(metadata.get('market_cap')),
+        'fcf_proxy': _number(fcf),
+        'fair_value': _number(fair_value),
+        'value_per_share': per_share,
+        'upside_pct': (per_share / price - 1) * 100 if per_share and per_share > 0 and price > 0 else None,
+        'roe_pct': _latest(profitability, 'ROE %'),
+        'net_margin_pct': _latest(profitability, 'Net Margin %'),
+        'debt_to_equity': _latest(solvency, 'Debt-to-Equity'),
+        'eva': _latest(eva, 'EVA'),
+        'roic_pct': _latest(eva, 'ROIC %'),
+        'mountain_score': int(thesis['score']),
+        'verdict': thesis['verdict'],
+        'confidence': thesis['confidence'],
+    }
+
+
+def analyze_company(data, metadata, wacc=None, growth_rate=None, terminal_growth=None):
+    """
+    Headless equivalent of the dashboard, DCF and thesis tabs for one company.
+
+    Args:
+        data: Loader frame ('Report Date' column of metric names, one column per period)
+        metadata: Loader metadata (company_name, current_price, market_cap, ...)
+        wacc: Discount rate as a decimal (default: FINANCIAL_DEFAULTS['wacc_default'])
+        growth_rate: DCF stage-1 growth (default: FINANCIAL_DEFAULTS['explicit_growth'])
+        terminal_growth: Perpetuity growth (default: FINANCIAL_DEFAULTS['terminal_growth'])
+
+    Returns:
+        dict with 'record' (the RESULT_FIELDS that describe the company), the
+        'profitability', 'solvency', 'efficiency' and 'eva' tables, 'thesis'
+        and the DCF 'assumptions' used
+    """
+    wacc = FINANCIAL_DEFAULTS['wacc_default'] / 100 if wacc is None else wacc
+    growth_rate = FINANCIAL_DEFAULTS['explicit_growth'] if growth_rate is None else growth_rate
+    terminal_growth = FINANCIAL_DEFAULTS['terminal_growth'] if terminal_growth is None else terminal_growth
+
+    analyzer = FinancialAnalyzer(data)
+    profitability = analyzer.get_profitability_metrics()
+    solvency = analyzer.get_solvency_metrics()
+    efficiency = analyzer.get_efficiency_metrics()
+    eva = EVAAnalyzer(data, wacc).calculate_eva()
+
+    fcf = estimate_fcf_proxy(data)
+    fair_value = calculate_dcf(fcf, growth_rate, wacc, terminal_growth)
+    price = _number(metadata.get('current_price')) or 0.0
+    per_share = value_per_share(fair_value, shares_outstanding(data))
+    thesis = ThesisEngine(data, per_share, price).get_full_analysis()
+
+    record = build_record(data, metadata, profitability, solvency, eva, fcf, fair_value, thesis)
+    return {
+        'record': record,
+        'profitability': profitability,
+        'solvency': solvency,
+        'efficiency': efficiency,
+        'eva': eva,
+        'thesis': thesis,
+        'assumptions': {'fcf': fcf, 'wacc': wacc, 'growth_rate': growth_rate, 'terminal_growth': terminal_growth},
+    }
+
+
+def evaluate_company(data, metadata, wacc=None, growth_rate=None, terminal_growth=None):
+    """Flat result record of analyze_company() (no key/source/status)."""
+    return analyze_company(data, metadata, wacc, growth_rate, terminal_growth)['record']
+
+
+def load_source(source):
+    """(data, metadata) for a batch source: a workbook path or a universe company."""
+    if 'universe' in source:
+        root = source['universe']
+        store = _stores.get(root)
+        if store is None:
+            store = _stores[root] = UniverseStore.open_current(root)
+        company = source['company']
+        metadata = {'market_cap': 0.0, 'current_price': 0.0, 'company_name': company}
+        metadata.update(store.metadata.get(company, {}))
+        return store.company_frame(company), metadata
+
+    parsed = parse_workbook(source['path'], source['name'])
+    if parsed['data'] is None:
+        raise ValueError("not a valid Screener.in workbook")
+    return parsed['data'], parsed['metadata']
+
+
+def evaluate_source(source, params=None):
+    """
+    Process-pool entry point: load and evaluate one batch source.
+
+    Args:
+        source: dict with 'key', 'name' and either 'path' (workbook) or
+                'universe' + 'company' (published UniverseStore root)
+        params: Optional dict of evaluate_company() keyword arguments
+
+    Returns:
+        Result record with every RESULT_FIELDS key.
+    """
+    start = time.perf_counter()
+    record = dict.fromkeys(RESULT_FIELDS)
+    record.update(key=source['key'], company=source['name'],
+                  source=source.get('path') or source.get('universe'))
+    try:
+        data, metadata = load_source(source)
+        record.update(evaluate_company(data, metadata, **(params or {})))
+        record['company'] = record['company'] or source['name']
+        record['status'] = 'ok'
+    except Exception as e:
+        # Reported by the parent: worker log records may not flush before the pool exits
+        record.update(status='error', error=f"{type(e).__name__}: {e}")
+    record['elapsed_ms'] = round((time.perf_counter() - start) * 1000, 2)
+    return record
@@ -0,0 +1,257 @@
+"""
+excel_export.py - Streaming Excel Export of Analyzer Outputs
+🏔️ THE MOUNTAIN PATH - World of Finance
+
+Writes ratio, EVA, DCF and verdict outputs for many companies to one
+workbook with openpyxl's write-only (streaming) mode: rows go straight to
+each sheet's temporary XML file as a company is analyzed, and nothing but
+the current company is held in memory - O(one company), not O(universe).
+
+Layouts:
+    sheets  'Summary' sheet (one row per company) + one sheet per company
+    blocks  'Summary' + a single 'Companies' sheet with one block per
+            company (no per-sheet overhead; suits very large universes)
+
+    python -m src.pipeline.excel_export data/workbooks --output analysis.xlsx
+    python -m src.pipeline.excel_export --universe data/universe --output all.xlsx --layout blocks
+"""
+
+import argparse
+import os
+import re
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, PatternFill
+
+from src.analysis.valuation import get_sensitivity_matrix, sensitivity_ranges
+from src.core.log import get_logger
+from src.pipeline.batch import collect_sources
+from src.pipeline.evaluate import RESULT_FIELDS, analyze_company, load_source
+
+logger = get_logger('src.pipeline.excel_export')  # also when run as __main__
+
+_TITLE_FONT = Font(bold=True, size=13, color='FFD700')
+_TITLE_FILL = PatternFill('solid', fgColor='001F3F')
+_HEADER_FONT = Font(bold=True)
+
+# Summary columns (key/source/status are bookkeeping, not analysis)
+SUMMARY_FIELDS = [f for f in RESULT_FIELDS if f not in ('key', 'source', 'status', 'error', 'elapsed_ms')]
+
+
+def analyze_source(source, params=None):
+    """Worker entry point: (source, analyze_company() output or None, error message or None)."""
+    try:
+        data, metadata = load_source(source)
+        return source, analyze_company(data, metadata, **(params or {})), None
+    except Exception as e:
+        return source, None, f"{type(e).__name__}: {e}"
+
+
+def iter_analyses(sources, params=None, max_workers=1):
+    """
+    analyze_source() results in input order.
+
+    With max_workers > 1 a process pool analyzes ahead of the writer, but at
+    most 2 × max_workers results are ever pending, so memory stays bounded.
+    """
+    if max_workers <= 1:
+        for source in sources:
+            yield analyze_source(source, params)
+        return
+
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        window = deque()
+        queue = iter(sources)
+        for source in queue:
+            window.append(pool.submit(analyze_source, source, params))
+            if len(window) >= 2 * max_workers:
+                yield window.popleft().result()
+        while window:
+            yield window.popleft().result()
+
+
+def _sheet_title(name, used):
+    """Valid (<= 31 chars, no []:*?/\\), unique worksheet title."""
+    base = re.sub(r'[\[\]:*?/\\]', '-', name or 'Company').strip("' ")[:31] or 'Company'
+    title, n = base, 2
+    while title.lower() in used:
+        suffix = f" ({n})"
+        title, n = base[:31 - len(suffix)] + suffix, n + 1
+    used.add(title.lower())
+    return title
+
+
+def _value(v):
+    """Cell value: plain Python scalars, blanks for missing numbers."""
+    if v is None:
+        return None
+    if hasattr(v, 'item'):
+        v = v.item()
+    if isinstance(v, float) and v != v:
+        return None
+    return v
+
+
+class StreamingExcelExporter:
+    def __init__(self, path, layout='sheets'):
+        """
+        Args:
+            path: Destination .xlsx
+            layout: 'sheets' (one sheet per company) or 'blocks' (one shared sheet)
+        """
+        if layout not in ('sheets', 'blocks'):
+            raise ValueError(f"Unknown layout {layout!r}")
+        self.path = path
+        self.layout = layout
+        self.workbook = Workbook(write_only=True)
+        self.summary = self.workbook.create_sheet('Summary')
+        self.summary.append(self._header_row(['Company sheet'] + SUMMARY_FIELDS))
+        self.blocks = self.workbook.create_sheet('Companies') if layout == 'blocks' else None
+        self._titles = {'summary', 'companies'}
+        self.companies = 0
+
+    def _cell(self, ws, value, font=None, fill=None, number_format=None):
+        cell = WriteOnlyCell(ws, value=_value(value))
+        if font is not None:
+            cell.font = font
+        if fill is not None:
+            cell.fill = fill
+        if number_format is not None:
+            cell.number_format = number_format
+        return cell
+
+    def _header_row(self, labels, ws=None):
+        ws = ws or self.summary
+        return [self._cell(ws, label, _HEADER_FONT) for label in labels]
+
+    def _table(self, ws, title, frame, label_column):
+        """One titled block: metrics as rows, periods as columns (Screener.in layout)."""
+        ws.append([self._cell(ws, title, _HEADER_FONT)])
+        table = frame.set_index(label_column)
+        ws.append(self._header_row(['Metric'] + [str(c) for c in table.index], ws))
+        for metric in table.columns:
+            ws.append([metric] + [self._cell(ws, v, number_format='#,##0.00') for v in table[metric]])
+        ws.append([])
+
+    def write_company(self, analysis):
+        """Stream one company's blocks and its Summary row."""
+        record, assumptions = analysis['record'], analysis['assumptions']
+        company = record['company'] or 'Company'
+
+        if self.layout == 'sheets':
+            ws = self.workbook.create_sheet(_sheet_title(company, self._titles))
+            location = ws.title
+        else:
+            ws = self.blocks
+            location = 'Companies'
+
+        ws.append([self._cell(ws, company, _TITLE_FONT, _TITLE_FILL)])
+        ws.append([self._cell(ws, 'Verdict', _HEADER_FONT), record['verdict'],
+                   f"Mountain Score {record['mountain_score']} / 3", f"Confidence {record['confidence']}"])
+        for check in analysis['thesis']['checks']:
+            ws.append([None, check.replace('**', '')])
+        ws.append([])
+
+        ratios = analysis['profitability'].merge(analysis['solvency'], on='Year').merge(analysis['efficiency'], on='Year')
+        self._table(ws, 'Ratios', ratios, 'Year')
+        self._table(ws, 'Economic Value Added', analysis['eva'], 'Report Date')
+
+        # DCF: assumptions, fair value and the WACC × growth sensitivity grid
+        ws.append([self._cell(ws, 'DCF Valuation', _HEADER_FONT)])
+        for label, value in (('FCF proxy', assumptions['fcf']), ('WACC', assumptions['wacc']),
+                             ('Stage-1 growth', assumptions['growth_rate']),
+                             ('Terminal growth', assumptions['terminal_growth']),
+                             ('Fair value (₹ Cr)', record['fair_value']),
+                             ('Value per share', record['value_per_share']),
+                             ('Current price', record['current_price']),
+                             ('Upside %', record['upside_pct'])):
+            fmt = '0.0%' if label in ('WACC', 'Stage-1 growth', 'Terminal growth') else '#,##0.00'
+            ws.append([label, self._cell(ws, value, number_format=fmt)])
+        wacc_range, growth_range = sensitivity_ranges(assumptions['wacc'], assumptions['growth_rate'],
+                                                      assumptions['terminal_growth'])
+        if wacc_range:
+            grid = get_sensitivity_matrix(assumptions['fcf'], growth_range, wacc_range, assumptions['terminal_growth'])
+            ws.append(self._header_row(['WACC \\ Growth'] + [f"{g:.1%}" for g in growth_range], ws))
+            for wacc, row in grid.iterrows():
+                ws.append([f"{wacc:.1%}"] + [self._cell(ws, v, number_format='#,##0') for v in row])
+        ws.append([])
+        if self.layout == 'blocks':
+            ws.append([])
+        else:
+            # Finish the sheet now: releases its temp file handle (thousands
+            # of open sheets would exhaust file descriptors)
+            ws.close()
+
+        self.summary.append([location] + [self._cell(self.summary, record.get(f)) for f in SUMMARY_FIELDS])
+        self.companies += 1
+
+    def write_error(self, source, error):
+        self.summary.append([None, source['name']] + [None] * (SUMMARY_FIELDS.index('verdict') - 1) + [f"❌ {error}"])
+
+    def close(self):
+        self.workbook.save(self.path)
+
+
+def export_workbook(sources, path, layout='sheets', params=None, max_workers=1, on_company=None):
+    """
+    Analyze and stream every source into one workbook.
+
+    Args:
+        sources: collect_sources() output
+        path: Destination .xlsx
+        layout: 'sheets' or 'blocks'
+        params: analyze_company() keyword arguments
+        max_workers: Analysis processes running ahead of the writer (1 = inline)
+        on_company: Optional callback(name, error, done, total)
+
+    Returns:
+        dict with 'companies' and 'errors'
+    """
+    exporter = StreamingExcelExporter(path, layout)
+    errors = 0
+    for done, (source, analysis, error) in enumerate(iter_analyses(sources, params, max_workers), start=1):
+        if analysis is None:
+            errors += 1
+            logger.warning("Export skipped %s: %s", source['name'], error)
+            exporter.write_error(source, error)
+        else:
+            exporter.write_company(analysis)
+        if on_company is not None:
+            on_company(source['name'] if analysis is None else analysis['record']['company'], error, done, len(sources))
+    exporter.close()
+    return {'companies': exporter.companies, 'errors': errors}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Stream analyzer outputs for many companies to Excel")
+    parser.add_argument('inputs', nargs='*', help="Workbooks, directories or manifest .txt files")
+    parser.add_argument('--universe', help="Export every company in a published universe store")
+    parser.add_argument('--output', required=True, help="Destination .xlsx")
+    parser.add_argument('--layout', choices=['sheets', 'blocks'], default='sheets')
+    parser.add_argument('--workers', type=int, default=1, help="Analysis processes (default: inline)")
+    parser.add_argument('--wacc', type=float, default=None, help="WACC in percent")
+    parser.add_argument('--growth', type=float, default=None, help="DCF stage-1 growth in percent")
+    parser.add_argument('--terminal-growth', type=float, default=None, help="Terminal growth in percent")
+    args = parser.parse_args(argv)
+
+    if not args.inputs and not args.universe:
+        parser.error("give workbook inputs and/or --universe")
+
+    params = {name: value / 100 for name, value in
+              (('wacc', args.wacc), ('growth_rate', args.growth), ('terminal_growth', args.terminal_growth))
+              if value is not None}
+
+    def report(name, error, done, total):
+        print(f"{'❌' if error else '✓'} [{done}/{total}] {name}{': ' + error if error else ''}")
+
+    summary = export_workbook(collect_sources(args.inputs, args.universe), args.output, args.layout,
+                              params, args.workers, on_company=report)
+    print(f"✓ Done: {summary['companies']} companies, {summary['errors']} failed -> {os.path.abspath(args.output)}")
+    return 1 if summary['errors'] else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,94 @@
+"""
+ledger.py - Crash-Safe Progress Ledger
+🏔️ THE MOUNTAIN PATH - World of Finance
+
+Append-only JSON Lines file with one entry per finished source. An entry
+is written (and fsynced) only after the source's result is durable in the
+output, so after a crash the ledger never claims work that was lost;
+a restarted run skips every key already in it.
+
+A torn final line (crash mid-append) is ignored on load.
+
+The first line is a header with the run parameters (WACC, growth rates);
+resuming with different parameters is refused, so one output never mixes
+assumptions.
+"""
+
+import hashlib
+import json
+import os
+import time
+
+
+def source_key(path):
+    """
+    Resume key of a workbook: path plus size and modification time, so an
+    edited or replaced file is evaluated again.
+    """
+    stat = os.stat(path)
+    raw = f"{os.path.abspath(path)}|{stat.st_size}|{stat.st_mtime_ns}"
+    return hashlib.sha1(raw.encode()).hexdigest()
+
+
+class ProgressLedger:
+    def __init__(self, path, params=None):
+        """
+        Open (or create) a ledger.
+
+        Args:
+            path: Ledger file; existing entries are loaded as already done
+            params: Run parameters the results depend on (JSON-serializable)
+
+        Raises:
+            ValueError: The ledger was written with different params
+        """
+        self.path = path
+        self.done = {}
+        self.params = None
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    if 'params' in entry:
+                        self.params = entry['params']
+                    else:
+                        self.done[entry['key']] = entry
+        if params is not None and self.params is not None and self.params != params:
+            raise ValueError(f"{path} was written with {self.params}, not {params}; "
+                             "restart the run or write to a new output")
+        self._file = open(path, 'a', encoding='utf-8')
+        if params is not None and self.params is None:
+            self.params = params
+            self._file.write(json.dumps({'params': params}) + '\n')
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def __contains__(self, key):
+        return key in self.done
+
+    def __len__(self):
+        return len(self.done)
+
+    def mark_done(self, records):
+        """Record finished results (call only once they are durable in the output)."""
+        if not records:
+            return
+        now = time.strftime('%Y-%m-%dT%H:%M:%S')
+        for record in records:
+            entry = {'key': record['key'], 'company': record['company'], 'status': record['status'], 'ts': now}
+            self.done[entry['key']] = entry
+            self._file.write(json.dumps(entry) + '\n')
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
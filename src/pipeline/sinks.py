@@ -0,0 +1,87 @@
+"""
+sinks.py - Streaming Result Outputs
+🏔️ THE MOUNTAIN PATH - World of Finance
+
+Result records are written as each company finishes. write(records) returns
+only once those records are durable, so the caller can then mark them done
+in the progress ledger.
+
+- JsonlSink: one JSON object per line, appended and fsynced per write
+- ParquetSink: a directory of part files, one per write, each written to a
+  temporary name and renamed into place (a crash never leaves a partial
+  file behind); read the directory with pyarrow.dataset / pd.read_parquet
+
+Both append to existing output on resume; restart=True discards it first.
+"""
+
+import json
+import os
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from src.pipeline.evaluate import RESULT_SCHEMA
+
+
+class JsonlSink:
+    # Records are appended one write at a time
+    batch_size = 1
+
+    def __init__(self, path, restart=False):
+        self.path = path
+        self._file = open(path, 'w' if restart else 'a', encoding='utf-8')
+
+    def write(self, records):
+        for record in records:
+            self._file.write(json.dumps(record, ensure_ascii=False) + '\n')
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self):
+        self._file.close()
+
+
+class ParquetSink:
+    def __init__(self, directory, batch_size=500, restart=False):
+        """
+        Args:
+            directory: Output directory for part-NNNNN.parquet files (appended
+                       to on resume)
+            batch_size: Records per part file
+            restart: Delete the directory's existing part files first
+        """
+        self.directory = directory
+        self.batch_size = batch_size
+        os.makedirs(directory, exist_ok=True)
+        if restart:
+            for f in os.listdir(directory):
+                if f.startswith('part-') and f.endswith(('.parquet', '.parquet.tmp')):
+                    os.remove(os.path.join(directory, f))
+        parts = [int(f[5:-8]) for f in os.listdir(directory)
+                 if f.startswith('part-') and f.endswith('.parquet') and f[5:-8].isdigit()]
+        self._next_part = max(parts, default=-1) + 1
+
+    def write(self, records):
+        if not records:
+            return
+        table = pa.Table.from_pylist(records, schema=RESULT_SCHEMA)
+        path = os.path.join(self.directory, f"part-{self._next_part:05d}.parquet")
+        tmp = path + '.tmp'
+        pq.write_table(table, tmp)
+        os.replace(tmp, path)
+        self._next_part += 1
+
+    def close(self):
+        pass
+
+
+def open_sink(path, fmt=None, batch_size=None, restart=False):
+    """
+    Sink for an output path; the format follows the extension unless given
+    ('.jsonl' / '.json' -> JSON Lines, anything else -> Parquet directory).
+    restart=True discards any existing output.
+    """
+    fmt = fmt or ('jsonl' if path.endswith(('.jsonl', '.json')) else 'parquet')
+    if fmt == 'jsonl':
+        return JsonlSink(path, restart)
+    return ParquetSink(path, batch_size or 500, restart)
@@ -0,0 +1,6 @@
+"""
+One-page company reports (static HTML, optional PDF) rendered in parallel
+from the analyzer outputs.
+
+    python -m src.reports.render data/workbooks --output reports/
+"""
@@ -0,0 +1,103 @@
+"""
+charts.py - Cached Report Chart Images
+🏔️ THE MOUNTAIN PATH - World of Finance
+
+Report charts are rendered with matplotlib (Agg) to PNG and cached on disk
+by a hash of their inputs, so re-running the weekly batch only redraws the
+charts whose numbers changed. Cached files are shared by every worker
+process (written to a temporary name, then renamed into place).
+"""
+
+import base64
+import hashlib
+import io
+import json
+import os
+
+from src.core.config import REPORT_CHART_DPI
+
+# Bump when chart styling changes so stale cached images are not reused
+CHART_STYLE_VERSION = 1
+
+_NAVY, _GOLD, _GREEN, _RED = '#001f3f', '#FFD700', '#2e7d32', '#c62828'
+
+_plt = None
+
+
+def _pyplot():
+    """matplotlib.pyplot on the non-interactive Agg backend, imported on first use."""
+    global _plt
+    if _plt is None:
+        import matplotlib
+        matplotlib.use('Agg')
+        import matplotlib.pyplot as plt
+        _plt = plt
+    return _plt
+
+
+def _cached_png(cache_dir, kind, payload, draw):
+    """PNG bytes for (kind, payload), drawing with draw(fig, ax) only on a cache miss."""
+    digest = hashlib.sha1(json.dumps([CHART_STYLE_VERSION, REPORT_CHART_DPI, kind, payload],
+                                     default=str).encode()).hexdigest()
+    path = os.path.join(cache_dir, f"{kind}-{digest}.png") if cache_dir else None
+    if path and os.path.exists(path):
+        with open(path, 'rb') as f:
+            return f.read()
+
+    plt = _pyplot()
+    fig, ax = plt.subplots(figsize=(4.2, 2.4), dpi=REPORT_CHART_DPI)
+    try:
+        draw(fig, ax)
+        ax.spines[['top', 'right']].set_visible(False)
+        ax.tick_params(labelsize=7)
+        # Fixed margins: every report chart has the same layout, and
+        # tight_layout() would cost as much as drawing the chart
+        fig.subplots_adjust(left=0.14, right=0.98, top=0.88, bottom=0.13)
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format='png')
+    finally:
+        plt.close(fig)
+
+    png = buffer.getvalue()
+    if path:
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, 'wb') as f:
+            f.write(png)
+        os.replace(tmp, path)
+    return png
+
+
+def data_uri(png):
+    return "data:image/png;base64," + base64.b64encode(png).decode('ascii')
+
+
+def _labels(periods):
+    return [str(p)[:4] for p in periods]
+
+
+def returns_chart(profitability, cache_dir=None):
+    """ROE % and Net Margin % history (line chart)."""
+    periods = _labels(profitability['Year'])
+    roe = [round(float(v), 4) for v in profitability['ROE %']]
+    margin = [round(float(v), 4) for v in profitability['Net Margin %']]
+
+    def draw(fig, ax):
+        ax.plot(periods, roe, color=_NAVY, marker='o', markersize=3, label='ROE %')
+        ax.plot(periods, margin, color=_GOLD, marker='o', markersize=3, label='Net Margin %')
+        ax.set_title('Returns (%)', fontsize=9, color=_NAVY)
+        ax.legend(fontsize=7, frameon=False)
+
+    return _cached_png(cache_dir, 'returns', [periods, roe, margin], draw)
+
+
+def eva_chart(eva, cache_dir=None):
+    """EVA per period (bars, green above zero, red below)."""
+    periods = _labels(eva['Report Date'])
+    values = [round(float(v), 4) for v in eva['EVA'].fillna(0)]
+
+    def draw(fig, ax):
+        ax.bar(periods, values, color=[_GREEN if v >= 0 else _RED for v in values])
+        ax.axhline(0, color='#5b6470', linewidth=0.6)
+        ax.set_title('Economic Value Added (₹ Cr)', fontsize=9, color=_NAVY)
+
+    return _cached_png(cache_dir, 'eva', [periods, values], draw)
@@ -0,0 +1,229 @@
+"""
+render.py - Parallel One-Page Company Reports
+🏔️ THE MOUNTAIN PATH - World of Finance
+
+Renders one self-contained HTML page per company (price, market cap, ROE,
+D/E, EVA, DCF fair value and range, Mountain Score verdict, two charts)
+from the same analyzer outputs the app uses, across a process pool.
+Charts are cached by their inputs (src/reports/charts.py); an index.html
+summarizing every company is written at the end.
+
+    python -m src.reports.render data/workbooks --output reports/
+    python -m src.reports.render holdings.txt --output reports/ --workers 8 --pdf
+    python -m src.reports.render --universe data/universe --output reports/
+
+--pdf also writes <company>.pdf next to each page and needs the optional
+weasyprint package.
+"""
+
+import argparse
+import html
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from src.analysis.valuation import get_sensitivity_matrix, sensitivity_ranges
+from src.core.config import REPORT_CHART_CACHE
+from src.core.log import get_logger
+from src.pipeline.batch import collect_sources
+from src.pipeline.evaluate import analyze_company, load_source
+from src.reports.charts import returns_chart, eva_chart, data_uri
+from src.reports.template import REPORT_TEMPLATE, INDEX_TEMPLATE
+
+logger = get_logger('src.reports.render')  # also when run as __main__
+
+_VERDICT_COLORS = {3: '#2e7d32', 2: '#558b2f', 1: '#f9a825', 0: '#c62828'}
+
+
+def _money(value, suffix=''):
+    return '—' if value is None else f"₹{value:,.2f}{suffix}"
+
+
+def _pct(value):
+    return '—' if value is None else f"{value:.1f}%"
+
+
+def _markdown_bold(text):
+    """Thesis checks use **bold** markdown; escape, then convert to <b>."""
+    return re.sub(r'\*\*(.+?)\*\*', r'<b>\1</b>', html.escape(text))
+
+
+def report_filename(company, key):
+    """File-system safe, collision-free base name for a company's report."""
+    slug = re.sub(r'[^A-Za-z0-9]+', '-', company or 'company').strip('-').lower() or 'company'
+    return f"{slug[:60]}-{key[:8]}"
+
+
+def _write_pdf(html_text, path):
+    try:
+        from weasyprint import HTML
+    except ImportError:
+        raise RuntimeError("PDF reports need the optional weasyprint package (pip install weasyprint)")
+    HTML(string=html_text).write_pdf(path)
+
+
+def render_company(source, out_dir, params=None, pdf=False, cache_dir=None):
+    """
+    Process-pool entry point: analyze one batch source and write its report.
+
+    Args:
+        source: collect_sources() entry
+        out_dir: Output directory
+        params: analyze_company() keyword arguments (wacc, growth_rate, terminal_growth)
+        pdf: Also write a PDF (needs weasyprint)
+        cache_dir: Chart image cache directory (None disables caching)
+
+    Returns:
+        dict with 'company', 'status', 'file', 'error' and the record fields
+        the index page shows
+    """
+    start = time.perf_counter()
+    try:
+        data, metadata = load_source(source)
+        analysis = analyze_company(data, metadata, **(params or {}))
+        record, assumptions = analysis['record'], analysis['assumptions']
+        company = record['company'] or source['name']
+
+        # DCF range over the same grid the DCF tab's sensitivity matrix shows
+        wacc_range, growth_range = sensitivity_ranges(assumptions['wacc'], assumptions['growth_rate'],
+                                                      assumptions['terminal_growth'])
+        if wacc_range:
+            grid = get_sensitivity_matrix(assumptions['fcf'], growth_range, wacc_range,
+                                          assumptions['terminal_growth']).to_numpy()
+            dcf_range = f"{_money(float(grid.min()))} – {_money(float(grid.max()), ' Cr')}"
+        else:
+            dcf_range = '—'
+
+        score = record['mountain_score']
+        page = REPORT_TEMPLATE.substitute(
+            company=html.escape(company),
+            latest_period=html.escape(record['latest_period'] or '—'),
+            wacc=f"{assumptions['wacc'] * 100:.1f}%",
+            growth_rate=f"{assumptions['growth_rate'] * 100:.1f}%",
+            terminal_growth=f"{assumptions['terminal_growth'] * 100:.1f}%",
+            verdict=html.escape(record['verdict']),
+            verdict_color=_VERDICT_COLORS.get(score, '#5b6470'),
+            score=score,
+            confidence=html.escape(record['confidence']),
+            price=_money(record['current_price']),
+            market_cap=_money(record['market_cap'], ' Cr'),
+            roe=_pct(record['roe_pct']),
+            de_ratio='—' if record['debt_to_equity'] is None else f"{record['debt_to_equity']:.2f}",
+            eva=_money(record['eva'], ' Cr'),
+            roic=_pct(record['roic_pct']),
+            fair_value=_money(record['fair_value'], ' Cr'),
+            dcf_range=dcf_range,
+            returns_chart=data_uri(returns_chart(analysis['profitability'], cache_dir)),
+            eva_chart=data_uri(eva_chart(analysis['eva'], cache_dir)),
+            checks='\n'.join(f"  <li>{_markdown_bold(check)}</li>" for check in analysis['thesis']['checks']),
+            generated=time.strftime('%Y-%m-%d %H:%M'),
+        )
+
+        base = report_filename(company, source['key'])
+        with open(os.path.join(out_dir, base + '.html'), 'w', encoding='utf-8') as f:
+            f.write(page)
+        if pdf:
+            _write_pdf(page, os.path.join(out_dir, base + '.pdf'))
+
+        result = {'company': company, 'status': 'ok', 'file': base + '.html', 'error': None}
+        result.update({k: record[k] for k in ('mountain_score', 'verdict', 'current_price',
+                                              'fair_value', 'roe_pct', 'debt_to_equity')})
+    except Exception as e:
+        result = {'company': source['name'], 'status': 'error', 'file': None,
+                  'error': f"{type(e).__name__}: {e}"}
+    result['elapsed_ms'] = round((time.perf_counter() - start) * 1000, 2)
+    return result
+
+
+def write_index(results, out_dir):
+    """index.html linking every rendered report, best Mountain Score first."""
+    ok = sorted((r for r in results if r['status'] == 'ok'),
+                key=lambda r: (-r['mountain_score'], r['company']))
+    rows = '\n'.join(
+        f"<tr><td><a href=\"{html.escape(r['file'])}\">{html.escape(r['company'])}</a></td>"
+        f"<td>{r['mountain_score']} / 3</td><td>{html.escape(r['verdict'])}</td>"
+        f"<td>{_money(r['current_price'])}</td><td>{_money(r['fair_value'], ' Cr')}</td>"
+        f"<td>{_pct(r['roe_pct'])}</td>"
+        f"<td>{'—' if r['debt_to_equity'] is None else format(r['debt_to_equity'], '.2f')}</td></tr>"
+        for r in ok)
+    with open(os.path.join(out_dir, 'index.html'), 'w', encoding='utf-8') as f:
+        f.write(INDEX_TEMPLATE.substitute(count=len(ok), rows=rows, generated=time.strftime('%Y-%m-%d %H:%M')))
+
+
+def render_reports(sources, out_dir, max_workers=None, params=None, pdf=False, on_report=None):
+    """
+    Render every source's report across a process pool, then the index.
+
+    Args:
+        sources: collect_sources() output
+        out_dir: Output directory (created if missing)
+        max_workers: Worker processes (default: cpu_count)
+        params: analyze_company() keyword arguments
+        pdf: Also write PDFs
+        on_report: Optional callback(result, done, total)
+
+    Returns:
+        dict with 'results' (input order), 'ok', 'errors', 'seconds'
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    cache_dir = os.path.join(out_dir, REPORT_CHART_CACHE)
+    os.makedirs(cache_dir, exist_ok=True)
+
+    start = time.perf_counter()
+    results = [None] * len(sources)
+    with ProcessPoolExecutor(max_workers=max_workers or os.cpu_count() or 1) as pool:
+        futures = {pool.submit(render_company, source, out_dir, params, pdf, cache_dir): i
+                   for i, source in enumerate(sources)}
+        for done, future in enumerate(as_completed(futures), start=1):
+            result = future.result()
+            results[futures[future]] = result
+            if result['status'] != 'ok':
+                logger.warning("Report failed for %s: %s", result['company'], result['error'])
+            if on_report is not None:
+                on_report(result, done, len(sources))
+
+    write_index(results, out_dir)
+    ok = sum(r['status'] == 'ok' for r in results)
+    return {'results': results, 'ok': ok, 'errors': len(results) - ok,
+            'seconds': round(time.perf_counter() - start, 2)}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render one-page company reports in parallel")
+    parser.add_argument('inputs', nargs='*', help="Workbooks, directories or manifest .txt files")
+    parser.add_argument('--universe', help="Report every company in a published universe store")
+    parser.add_argument('--output', required=True, help="Output directory")
+    parser.add_argument('--workers', type=int, help="Worker processes (default: cpu count)")
+    parser.add_argument('--pdf', action='store_true', help="Also write PDFs (needs weasyprint)")
+    parser.add_argument('--wacc', type=float, default=None, help="WACC in percent")
+    parser.add_argument('--growth', type=float, default=None, help="DCF stage-1 growth in percent")
+    parser.add_argument('--terminal-growth', type=float, default=None, help="Terminal growth in percent")
+    args = parser.parse_args(argv)
+
+    if not args.inputs and not args.universe:
+        parser.error("give workbook inputs and/or --universe")
+    if args.pdf:
+        try:
+            import weasyprint  # noqa: F401
+        except ImportError:
+            parser.error("--pdf needs the optional weasyprint package (pip install weasyprint)")
+
+    params = {name: value / 100 for name, value in
+              (('wacc', args.wacc), ('growth_rate', args.growth), ('terminal_growth', args.terminal_growth))
+              if value is not None}
+    sources = collect_sources(args.inputs, args.universe)
+
+    def report(result, done, total):
+        mark = '✓' if result['status'] == 'ok' else '❌'
+        print(f"{mark} [{done}/{total}] {result['company']}: {result['file'] or result['error']}")
+
+    summary = render_reports(sources, args.output, args.workers, params, args.pdf, on_report=report)
+    rate = summary['ok'] / summary['seconds'] if summary['seconds'] else 0.0
+    print(f"✓ Done: {summary['ok']} reports, {summary['errors']} failed in {summary['seconds']:.1f}s "
+          f"({rate:.1f} reports/s) -> {os.path.join(args.output, 'index.html')}")
+    return 1 if summary['errors'] else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
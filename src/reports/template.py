@@ -0,0 +1,84 @@
+"""
+template.py - One-Page Company Report Template
+🏔️ THE MOUNTAIN PATH - World of Finance
+
+Compiled once per worker process (string.Template) and filled per company;
+every value is pre-formatted and HTML-escaped by the renderer.
+"""
+
+from string import Template
+
+REPORT_TEMPLATE = Template("""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>$company - Mountain Path Report</title>
+<style>
+  @page { size: A4; margin: 14mm; }
+  body { font-family: "Helvetica Neue", Arial, sans-serif; color: #1b1b1b; margin: 0; }
+  header { background: #001f3f; color: #FFFFFF; padding: 16px 22px; border-bottom: 4px solid #FFD700; }
+  header h1 { color: #FFD700; margin: 0; font-size: 26px; }
+  header p { margin: 4px 0 0; font-size: 13px; }
+  .verdict { margin: 16px 22px 0; padding: 10px 14px; border-left: 6px solid $verdict_color;
+             background: #f6f7f9; font-size: 17px; font-weight: bold; }
+  .kpis { display: grid; grid-template-columns: repeat(4, 1fr); gap: 10px; margin: 14px 22px; }
+  .kpi { border: 1px solid #d9dde3; border-radius: 6px; padding: 8px 10px; }
+  .kpi span { display: block; font-size: 11px; color: #5b6470; text-transform: uppercase; }
+  .kpi b { font-size: 18px; color: #001f3f; }
+  .charts { display: grid; grid-template-columns: 1fr 1fr; gap: 10px; margin: 0 22px; }
+  .charts img { width: 100%; border: 1px solid #d9dde3; border-radius: 6px; }
+  ul { margin: 12px 22px; padding-left: 18px; font-size: 13px; }
+  footer { margin: 14px 22px; font-size: 11px; color: #5b6470; border-top: 1px solid #d9dde3; padding-top: 6px; }
+</style>
+</head>
+<body>
+<header>
+  <h1>🏔️ $company</h1>
+  <p>Latest period $latest_period · WACC $wacc · Stage-1 growth $growth_rate · Terminal growth $terminal_growth</p>
+</header>
+<div class="verdict">$verdict <small>(Mountain Score $score / 3 · Confidence $confidence)</small></div>
+<div class="kpis">
+  <div class="kpi"><span>Price</span><b>$price</b></div>
+  <div class="kpi"><span>Market Cap</span><b>$market_cap</b></div>
+  <div class="kpi"><span>ROE</span><b>$roe</b></div>
+  <div class="kpi"><span>Debt / Equity</span><b>$de_ratio</b></div>
+  <div class="kpi"><span>EVA (latest)</span><b>$eva</b></div>
+  <div class="kpi"><span>ROIC</span><b>$roic</b></div>
+  <div class="kpi"><span>DCF Fair Value</span><b>$fair_value</b></div>
+  <div class="kpi"><span>DCF Range</span><b>$dcf_range</b></div>
+</div>
+<div class="charts">
+  <img src="$returns_chart" alt="ROE and net margin history">
+  <img src="$eva_chart" alt="EVA history">
+</div>
+<ul>
+$checks
+</ul>
+<footer>THE MOUNTAIN PATH - World of Finance · Generated $generated · DCF range spans WACC ±2pp and growth ±4pp</footer>
+</body>
+</html>
+""")
+
+INDEX_TEMPLATE = Template("""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>Mountain Path Reports</title>
+<style>
+  body { font-family: "Helvetica Neue", Arial, sans-serif; margin: 22px; }
+  h1 { color: #001f3f; }
+  table { border-collapse: collapse; width: 100%; font-size: 13px; }
+  th { background: #001f3f; color: #FFD700; text-align: left; padding: 6px; }
+  td { border-bottom: 1px solid #d9dde3; padding: 6px; }
+</style>
+</head>
+<body>
+<h1>🏔️ Mountain Path Reports ($count companies)</h1>
+<table>
+<tr><th>Company</th><th>Score</th><th>Verdict</th><th>Price</th><th>Fair Value</th><th>ROE</th><th>D/E</th></tr>
+$rows
+</table>
+<p><small>Generated $generated</small></p>
+</body>
+</html>
+""")
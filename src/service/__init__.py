@@ -0,0 +1,6 @@
+"""
+Local HTTP valuation service: asyncio front end, process-pool backend and
+micro-batched DCF.
+
+    python -m src.service.server
+"""
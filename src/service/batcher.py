@@ -0,0 +1,77 @@
+"""
+batcher.py - Async Micro-Batching
+🏔️ THE MOUNTAIN PATH - World of Finance
+
+Concurrent requests for the same kernel are queued for at most
+max_wait_ms (or until max_batch have arrived) and then executed as one
+vectorized call in the worker pool. Each caller awaits only its own row
+of the result.
+
+    batcher = MicroBatcher(dcf_kernel, pool, max_batch=512, max_wait_ms=2)
+    value = await batcher.submit((fcf, growth, wacc, terminal_growth))
+"""
+
+import asyncio
+
+
+class MicroBatcher:
+    def __init__(self, kernel, executor, max_batch=512, max_wait_ms=2.0):
+        """
+        Args:
+            kernel: Picklable callable taking a list of items and returning a
+                    list of results in the same order
+            executor: Pool the kernel runs in (None = the loop's default)
+            max_batch: Flush as soon as this many items are queued
+            max_wait_ms: Flush this long after the first item of a batch arrives
+        """
+        self.kernel = kernel
+        self.executor = executor
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self._items = []
+        self._futures = []
+        self._timer = None
+        self.batches = 0
+        self.items = 0
+
+    async def submit(self, item):
+        """Queue one item and wait for its result."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._items.append(item)
+        self._futures.append(future)
+
+        if len(self._items) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._items:
+            return
+        items, futures = self._items, self._futures
+        self._items, self._futures = [], []
+        self.batches += 1
+        self.items += len(items)
+        asyncio.ensure_future(self._run(items, futures))
+
+    async def _run(self, items, futures):
+        loop = asyncio.get_running_loop()
+        try:
+            results = await loop.run_in_executor(self.executor, self.kernel, items)
+        except Exception as e:
+            for future in futures:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for future, result in zip(futures, results):
+            if not future.done():
+                future.set_result(result)
+
+    @property
+    def mean_batch_size(self):
+        return self.items / self.batches if self.batches else 0.0
@@ -0,0 +1,115 @@
+"""
+protocol.py - Minimal HTTP/1.1 over asyncio Streams
+🏔️ THE MOUNTAIN PATH - World of Finance
+
+Just enough HTTP for a local JSON service: request line, headers,
+Content-Length bodies and keep-alive. No chunked uploads, no TLS - the
+service binds to localhost and sits behind whatever proxy fronts it.
+"""
+
+import json
+import math
+from http import HTTPStatus
+from urllib.parse import parse_qs
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class Request:
+    def __init__(self, method, path, query, headers, body):
+        self.method = method
+        self.path = path
+        self.query = query
+        self.headers = headers
+        self.body = body
+
+    @property
+    def keep_alive(self):
+        return self.headers.get('connection', '').lower() != 'close'
+
+    def json(self):
+        """Decoded JSON body (an empty body is an empty object)."""
+        if not self.body:
+            return {}
+        try:
+            payload = json.loads(self.body)
+        except (UnicodeDecodeError, json.JSONDecodeError) as e:
+            raise HTTPError(400, f"Invalid JSON body: {e}")
+        if not isinstance(payload, dict):
+            raise HTTPError(400, "JSON body must be an object")
+        return payload
+
+    def param(self, name, default=None):
+        values = self.query.get(name)
+        return values[0] if values else default
+
+
+async def read_request(reader, max_body):
+    """
+    Read one request from the stream.
+
+    Returns:
+        Request, or None when the client closed the connection.
+
+    Raises:
+        HTTPError: malformed request or body over max_body bytes
+    """
+    line = await reader.readline()
+    if not line:
+        return None
+    try:
+        method, target, _ = line.decode('latin-1').rstrip('\r\n').split(' ', 2)
+    except ValueError:
+        raise HTTPError(400, "Malformed request line")
+
+    headers = {}
+    while True:
+        raw = await reader.readline()
+        if raw in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = raw.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+
+    if 'transfer-encoding' in headers:
+        raise HTTPError(411, "Chunked bodies are not supported; send Content-Length")
+    try:
+        length = int(headers.get('content-length', 0))
+    except ValueError:
+        raise HTTPError(400, "Invalid Content-Length")
+    if length > max_body:
+        raise HTTPError(413, f"Body exceeds {max_body} bytes")
+    body = await reader.readexactly(length) if length else b''
+
+    path, _, query = target.partition('?')
+    return Request(method.upper(), path, parse_qs(query), headers, body)
+
+
+def _finite(value):
+    """Copy of a JSON payload with NaN/inf floats replaced by None."""
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+    if isinstance(value, dict):
+        return {k: _finite(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_finite(v) for v in value]
+    return value
+
+
+def encode_response(status, payload, keep_alive=True):
+    """Serialize a JSON response (NaN/inf are not valid JSON: sent as null)."""
+    try:
+        body = json.dumps(payload, default=str, allow_nan=False)
+    except ValueError:
+        body = json.dumps(_finite(payload), default=str, allow_nan=False)
+    body = body.encode()
+    reason = HTTPStatus(status).phrase
+    head = (f"HTTP/1.1 {status} {reason}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+    return head.encode('latin-1') + body
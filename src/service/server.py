@@ -0,0 +1,352 @@
+"""
+server.py - Local Valuation API
+🏔️ THE MOUNTAIN PATH - World of Finance
+
+JSON endpoints over the loader and analysis engines for other internal
+tools. An asyncio front end accepts requests; every CPU-bound step runs in
+a process pool, and concurrent DCF requests are micro-batched into one
+calculate_dcf_batch() call.
+
+    python -m src.service.server --port 8765
+
+Endpoints (rates are decimals, e.g. 0.12):
+    GET  /health
+    GET  /v1/stats                  pool / batching / cache counters
+    POST /v1/datasets?name=x.xlsx   raw workbook bytes -> dataset_id, metadata
+    POST /v1/dcf                    {fcf | dataset_id, growth_rate, wacc, terminal_growth}
+                                    or {"scenarios": [...]}
+    POST /v1/eva                    {dataset_id | data, wacc}
+    POST /v1/ratios                 {dataset_id | data}
+    POST /v1/thesis                 {dataset_id | data, dcf_value? | dcf_value_per_share?, market_price?,
+                                     wacc?, ...}
+    POST /v1/evaluate               {dataset_id | data, wacc?, growth_rate?, terminal_growth?}
+
+`data` is an inline loader frame as a column mapping:
+{"Report Date": [metric names...], "2024-03-31": [values...], ...}.
+
+DCF fair values (/v1/dcf 'fair_value', /v1/thesis 'dcf_value') are totals in
+₹ Cr; the thesis compares the per-share value (total × 1e7 / 'No. of Equity
+Shares') with the per-share market price and returns both as 'dcf_value' and
+'value_per_share'.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import os
+import signal
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from src.analysis.eva import EVAAnalyzer
+from src.analysis.financial import FinancialAnalyzer
+from src.analysis.thesis import ThesisEngine
+from src.analysis.valuation import calculate_dcf_batch, estimate_fcf_proxy, shares_outstanding, value_per_share
+from src.core.config import (FINANCIAL_DEFAULTS, SERVICE_HOST, SERVICE_PORT, SERVICE_BATCH_MAX,
+                             SERVICE_BATCH_WAIT_MS, SERVICE_MAX_BODY_MB, SERVICE_DATASET_CACHE)
+from src.core.ingest import parse_workbook
+from src.core.log import get_logger
+from src.pipeline.evaluate import evaluate_company
+from src.service.batcher import MicroBatcher
+from src.service.protocol import HTTPError, read_request, encode_response
+
+logger = get_logger('src.service.server')  # also when run as __main__
+
+
+# --- Worker-process jobs (module level so they pickle) ---
+
+def frame_json(df):
+    """DataFrame as {'columns': [...], 'data': [[...], ...]} with NaN/inf as null."""
+    values = df.replace([np.inf, -np.inf], np.nan).astype(object)
+    return {'columns': [str(c) for c in df.columns],
+            'data': values.where(values.notna(), None).to_numpy().tolist()}
+
+
+def dcf_kernel(rows):
+    """Batched DCF: rows of (fcf, growth_rate, wacc, terminal_growth) -> fair values."""
+    fcf, growth, wacc, t_growth = np.asarray(rows, dtype=float).T
+    return calculate_dcf_batch(fcf, growth, wacc, t_growth).tolist()
+
+
+def parse_job(payload, name):
+    parsed = parse_workbook(payload, name)
+    if parsed['data'] is None:
+        raise ValueError("not a valid Screener.in workbook")
+    return {'data': parsed['data'], 'metadata': parsed['metadata'], 'fcf': estimate_fcf_proxy(parsed['data'])}
+
+
+def eva_job(data, wacc):
+    return frame_json(EVAAnalyzer(data, wacc).calculate_eva())
+
+
+def ratios_job(data):
+    analyzer = FinancialAnalyzer(data)
+    return {
+        'profitability': frame_json(analyzer.get_profitability_metrics()),
+        'solvency': frame_json(analyzer.get_solvency_metrics()),
+        'efficiency': frame_json(analyzer.get_efficiency_metrics()),
+        'growth': frame_json(analyzer.get_growth_summary()),
+        'dupont': frame_json(analyzer.get_dupont_metrics()),
+    }
+
+
+def thesis_job(data, per_share, market_price):
+    analysis = ThesisEngine(data, per_share, market_price).get_full_analysis()
+    analysis['metrics'] = {k: float(v) for k, v in analysis['metrics'].items()}
+    return analysis
+
+
+def evaluate_job(data, metadata, params):
+    return evaluate_company(data, metadata, **params)
+
+
+# --- Front end ---
+
+class ValuationService:
+    def __init__(self, workers=None, batch_max=SERVICE_BATCH_MAX, batch_wait_ms=SERVICE_BATCH_WAIT_MS,
+                 max_body_mb=SERVICE_MAX_BODY_MB, dataset_cache=SERVICE_DATASET_CACHE):
+        """
+        Args:
+            workers: Process pool size (default: cpu_count)
+            batch_max: Max DCF requests per kernel call (1 disables batching)
+            batch_wait_ms: Max time a DCF request waits for others to join its batch
+            max_body_mb: Request body limit
+            dataset_cache: Parsed workbooks kept for dataset_id lookups
+        """
+        self.pool = ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1)
+        self.dcf = MicroBatcher(dcf_kernel, self.pool, batch_max, batch_wait_ms)
+        self.max_body = int(max_body_mb * 1024 * 1024)
+        self.dataset_cache = dataset_cache
+        self.datasets = OrderedDict()   # dataset_id -> {'data', 'metadata', 'fcf'}
+        self.requests = 0
+        self.started = time.time()
+        self.routes = {
+            ('GET', '/health'): self.health,
+            ('GET', '/v1/stats'): self.stats,
+            ('POST', '/v1/datasets'): self.upload,
+            ('POST', '/v1/dcf'): self.valuation,
+            ('POST', '/v1/eva'): self.eva,
+            ('POST', '/v1/ratios'): self.ratios,
+            ('POST', '/v1/thesis'): self.thesis,
+            ('POST', '/v1/evaluate'): self.evaluate,
+        }
+
+    async def run_job(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self.pool, fn, *args)
+
+    # --- Request helpers ---
+
+    def _dataset(self, payload):
+        """(data, metadata, fcf) from a dataset_id or an inline 'data' frame."""
+        if 'dataset_id' in payload:
+            entry = self.datasets.get(payload['dataset_id'])
+            if entry is None:
+                raise HTTPError(404, f"Unknown dataset_id {payload['dataset_id']!r}; upload it to /v1/datasets")
+            self.datasets.move_to_end(payload['dataset_id'])
+            return entry['data'], entry['metadata'], entry['fcf']
+        if 'data' in payload:
+            try:
+                data = pd.DataFrame(payload['data'])
+            except (TypeError, ValueError) as e:
+                raise HTTPError(400, f"Invalid 'data' frame: {e}")
+            if 'Report Date' not in data.columns:
+                raise HTTPError(400, "'data' needs a 'Report Date' column of metric names")
+            metadata = {'current_price': 0.0, 'market_cap': 0.0, 'company_name': None}
+            metadata.update(payload.get('metadata') or {})
+            return data, metadata, None
+        raise HTTPError(400, "Provide 'dataset_id' or inline 'data'")
+
+    @staticmethod
+    def _rate(payload, name, default):
+        value = payload.get(name, default)
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            raise HTTPError(400, f"'{name}' must be a number")
+
+    def _scenario(self, payload):
+        """One DCF kernel row from a request (fcf explicit or from a dataset)."""
+        if 'fcf' in payload:
+            fcf = self._rate(payload, 'fcf', None)
+        else:
+            data, _, fcf = self._dataset(payload)
+            fcf = estimate_fcf_proxy(data) if fcf is None else fcf
+        return (fcf,
+                self._rate(payload, 'growth_rate', FINANCIAL_DEFAULTS['explicit_growth']),
+                self._rate(payload, 'wacc', FINANCIAL_DEFAULTS['wacc_default'] / 100),
+                self._rate(payload, 'terminal_growth', FINANCIAL_DEFAULTS['terminal_growth']))
+
+    # --- Endpoints ---
+
+    async def health(self, request):
+        return {'status': 'ok'}
+
+    async def stats(self, request):
+        return {
+            'uptime_s': round(time.time() - self.started, 1),
+            'requests': self.requests,
+            'datasets': len(self.datasets),
+            'dcf_batches': self.dcf.batches,
+            'dcf_items': self.dcf.items,
+            'dcf_mean_batch': round(self.dcf.mean_batch_size, 2),
+        }
+
+    async def upload(self, request):
+        if not request.body:
+            raise HTTPError(400, "Send the workbook bytes as the request body")
+        dataset_id = hashlib.sha1(request.body).hexdigest()
+        entry = self.datasets.get(dataset_id)
+        if entry is None:
+            name = request.param('name', 'upload.xlsx')
+            try:
+                entry = await self.run_job(parse_job, request.body, name)
+            except ValueError as e:
+                raise HTTPError(422, f"{name}: {e}")
+            self.datasets[dataset_id] = entry
+            while len(self.datasets) > self.dataset_cache:
+                self.datasets.popitem(last=False)
+        self.datasets.move_to_end(dataset_id)
+
+        data = entry['data']
+        return {
+            'dataset_id': dataset_id,
+            'metadata': entry['metadata'],
+            'fcf_proxy': entry['fcf'],
+            'periods': [c for c in data.columns if c != 'Report Date'],
+            'metrics': data['Report Date'].tolist(),
+        }
+
+    async def valuation(self, request):
+        payload = request.json()
+        if 'scenarios' in payload:
+            rows = [self._scenario(s) for s in payload['scenarios']]
+            values = await asyncio.gather(*(self.dcf.submit(row) for row in rows))
+            return {'results': [{'fcf': row[0], 'fair_value': value} for row, value in zip(rows, values)]}
+        row = self._scenario(payload)
+        return {'fcf': row[0], 'fair_value': await self.dcf.submit(row)}
+
+    async def eva(self, request):
+        payload = request.json()
+        data, _, _ = self._dataset(payload)
+        return await self.run_job(eva_job, data, self._rate(payload, 'wacc', FINANCIAL_DEFAULTS['wacc_default'] / 100))
+
+    async def ratios(self, request):
+        data, _, _ = self._dataset(request.json())
+        return await self.run_job(ratios_job, data)
+
+    async def thesis(self, request):
+        payload = request.json()
+        data, metadata, _ = self._dataset(payload)
+        if 'dcf_value' in payload and 'dcf_value_per_share' in payload:
+            raise HTTPError(400, "Provide either 'dcf_value' (total, ₹ Cr) or 'dcf_value_per_share', not both")
+        shares = shares_outstanding(data)
+        if 'dcf_value_per_share' in payload:
+            per_share = self._rate(payload, 'dcf_value_per_share', 0)
+            dcf_value = per_share * shares / 1e7 if shares > 0 else None
+        else:
+            if 'dcf_value' in payload:
+                dcf_value = self._rate(payload, 'dcf_value', 0)
+            else:
+                dcf_value = await self.dcf.submit(self._scenario(payload))
+            # The price is per share: score the per-share value, not the ₹ Cr total
+            per_share = value_per_share(dcf_value, shares)
+        market_price = self._rate(payload, 'market_price', metadata.get('current_price') or 0)
+        result = await self.run_job(thesis_job, data, per_share, market_price)
+        result['dcf_value'] = dcf_value
+        result['value_per_share'] = per_share
+        return result
+
+    async def evaluate(self, request):
+        payload = request.json()
+        data, metadata, _ = self._dataset(payload)
+        params = {name: self._rate(payload, name, None)
+                  for name in ('wacc', 'growth_rate', 'terminal_growth') if name in payload}
+        return await self.run_job(evaluate_job, data, metadata, params)
+
+    # --- Connection handling ---
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                try:
+                    request = await read_request(reader, self.max_body)
+                except HTTPError as e:
+                    writer.write(encode_response(e.status, {'error': e.message}, keep_alive=False))
+                    break
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                if request is None:
+                    break
+
+                self.requests += 1
+                status, payload = await self.dispatch(request)
+                writer.write(encode_response(status, payload, request.keep_alive))
+                await writer.drain()
+                if not request.keep_alive:
+                    break
+        finally:
+            writer.close()
+
+    async def dispatch(self, request):
+        """(status, JSON payload) for one request; errors become JSON error bodies."""
+        handler = self.routes.get((request.method, request.path))
+        if handler is None:
+            known = any(path == request.path for _, path in self.routes)
+            return (405, {'error': 'Method not allowed'}) if known else (404, {'error': 'Not found'})
+        try:
+            return 200, await handler(request)
+        except HTTPError as e:
+            return e.status, {'error': e.message}
+        except Exception as e:
+            logger.exception("%s %s failed", request.method, request.path)
+            return 500, {'error': f"{type(e).__name__}: {e}"}
+
+    async def serve(self, host=SERVICE_HOST, port=SERVICE_PORT, on_ready=None):
+        server = await asyncio.start_server(self.handle, host, port)
+        serving = asyncio.ensure_future(server.serve_forever())
+        # SIGTERM stops accepting and falls through to the pool shutdown, so no
+        # worker process outlives the server (Ctrl+C cancels us the same way)
+        try:
+            asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, serving.cancel)
+        except (NotImplementedError, RuntimeError):   # Windows / not the main thread
+            pass
+        if on_ready is not None:
+            on_ready(server)
+        try:
+            async with server:
+                await serving
+        except asyncio.CancelledError:
+            if not serving.cancelled():
+                raise
+        finally:
+            self.pool.shutdown(cancel_futures=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local valuation API (DCF, EVA, ratios, thesis)")
+    parser.add_argument('--host', default=SERVICE_HOST)
+    parser.add_argument('--port', type=int, default=SERVICE_PORT)
+    parser.add_argument('--workers', type=int, help="Worker processes (default: cpu count)")
+    parser.add_argument('--batch-max', type=int, default=SERVICE_BATCH_MAX,
+                        help="Max DCF requests per vectorized call (1 disables batching)")
+    parser.add_argument('--batch-wait-ms', type=float, default=SERVICE_BATCH_WAIT_MS)
+    args = parser.parse_args(argv)
+
+    service = ValuationService(args.workers, args.batch_max, args.batch_wait_ms)
+
+    def ready(server):
+        host, port = server.sockets[0].getsockname()[:2]
+        print(f"✓ Valuation service listening on http://{host}:{port}", flush=True)
+
+    try:
+        asyncio.run(service.serve(args.host, args.port, ready))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,209 @@
+"""
+cache.py - Cached Ratio Tables
+🏔️ THE MOUNTAIN PATH - World of Finance
+
+Ratio tables are computed once per dataset and reused across tabs and reruns.
+"""
+
+import multiprocessing
+import os
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+
+import streamlit as st
+from src.analysis import get_engine
+from src.analysis.financial import FinancialAnalyzer
+from src.analysis.dupont import DuPontAnalyzer
+from src.analysis.valuation import dcf_defaults
+from src.core.config import (FINANCIAL_DEFAULTS, SECTOR_MAP_PATH, UNIVERSE_STORE_PATH, PREFETCH_MAX_WORKERS,
+                             SIDEBAR_WACC_DEFAULT, RATIO_CACHE_ENTRIES, UPLOAD_MAX_WORKERS)
+from src.core.ingest import load_sector_map
+from src.core.panel import build_panel
+from src.core.prefetch import Prefetcher, dataset_key
+from src.core.session_data import SessionDataManager, register_shared
+from src.core.universe_store import UniverseStore
+
+
+@st.cache_data(show_spinner=False, max_entries=RATIO_CACHE_ENTRIES)
+def get_ratio_tables(data):
+    """All FinancialAnalyzer ratio tables for one loader frame, keyed by view."""
+    analyzer = FinancialAnalyzer(data)
+    return {
+        'profitability': analyzer.get_profitability_metrics(),
+        'solvency': analyzer.get_solvency_metrics(),
+        'efficiency': analyzer.get_efficiency_metrics(),
+        'growth': analyzer.get_growth_summary(),
+        'dilution': analyzer.get_dilution_metrics(),
+        'dupont': analyzer.get_dupont_metrics(),
+    }
+
+
+@st.cache_data(show_spinner=False)
+def get_universe_dupont(datasets):
+    """DuPont breakdown for every (Company, Year) across several loader frames."""
+    return DuPontAnalyzer(build_panel(datasets)).calculate()
+
+
+@st.cache_resource
+def get_peer_index():
+    """Process-wide k-NN peer index over every company ingested by any session."""
+    return get_engine('peers')()
+
+
+@st.cache_resource
+def get_sector_benchmarks():
+    """Process-wide streaming sector percentile digests (EVA at the default WACC)."""
+    return get_engine('sector_benchmarks')()
+
+
+@st.cache_resource
+def get_scenario_store():
+    """Saved valuation scenarios (SCENARIO_STORE_PATH), shared by every session."""
+    return get_engine('scenario_store')()
+
+
+@st.cache_resource
+def get_scenario_evaluator():
+    """Process-wide memo of scenario results (company inputs × assumptions)."""
+    evaluator = get_engine('scenario_evaluator')()
+    register_shared('scenario memo', evaluator)
+    return evaluator
+
+
+@st.cache_data(show_spinner=False, ttl=300)
+def get_sector_map():
+    return load_sector_map(SECTOR_MAP_PATH)
+
+
+@st.cache_resource(max_entries=2)
+def _open_universe_store(version):
+    return UniverseStore(os.path.join(UNIVERSE_STORE_PATH, version))
+
+
+def get_universe_store():
+    """
+    The published universe store, memory-mapped once per server process and
+    shared by every session (None until something is published).
+    """
+    version = UniverseStore.current_version(UNIVERSE_STORE_PATH)
+    return _open_universe_store(version) if version else None
+
+
+@st.cache_resource
+def _seeded_versions():
+    return set()
+
+
+def _stream_into_universe(panel):
+    get_peer_index().add(get_engine('peer_features')(panel))
+    wacc = FINANCIAL_DEFAULTS['wacc_default'] / 100
+    get_sector_benchmarks().ingest(get_engine('benchmark_metrics')(panel, wacc), get_sector_map())
+
+
+def index_universe(datasets):
+    """
+    Streams the published store (once per version) and newly parsed datasets
+    (name -> parsed dict) into the shared peer index and sector benchmarks.
+    """
+    store = get_universe_store()
+    seeded = _seeded_versions()
+    if store is not None and store.path not in seeded:
+        seeded.add(store.path)
+        _stream_into_universe(store.panel().dropna(how='all').fillna(0))
+
+    # Compared by dataset key, so unchanged (possibly evicted) uploads are not reloaded
+    indexed = st.session_state.setdefault('universe_indexed', {})
+    fresh = {name: d for name, d in datasets.items() if indexed.get(name) != d['key']}
+    if fresh:
+        _stream_into_universe(build_panel({name: d['data'] for name, d in fresh.items()}))
+        for name, d in fresh.items():
+            indexed[name] = d['key']
+
+
+def get_session_data():
+    """This session's SessionDataManager (memory-budgeted uploads and derived results)."""
+    return st.session_state.setdefault('session_data', SessionDataManager())
+
+
+@st.cache_resource
+def get_parse_pool():
+    """
+    Process-wide worker processes for parsing batches of uploads (None on a
+    single-core host, where threads are as fast). Spawned, not forked, from
+    the multi-threaded server, and kept alive so start-up is paid once.
+    """
+    workers = min(UPLOAD_MAX_WORKERS, os.cpu_count() or 1)
+    if workers < 2:
+        return None
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+
+
+@st.cache_resource
+def get_prefetcher():
+    """Process-wide background pool for the non-visible tabs' analyses."""
+    prefetcher = Prefetcher(max_workers=PREFETCH_MAX_WORKERS)
+    register_shared('prefetched analyses', prefetcher)
+    return prefetcher
+
+
+def prefetch_analyses(data, metadata, settings):
+    """
+    Queues every analysis behind the non-dashboard tabs for the active
+    dataset and releases the session's previous dataset (its jobs are
+    cancelled unless another session still needs them).
+
+    Returns:
+        The dataset key to read results with get_prefetcher().get(key, view).
+    """
+    wacc = settings.get('wacc', FINANCIAL_DEFAULTS['wacc_default']) / 100
+    key = dataset_key(data, wacc)
+    prefetcher = get_prefetcher()
+    owner = st.session_state.setdefault('prefetch_owner', uuid.uuid4().hex)
+
+    previous = st.session_state.get('prefetch_key')
+    if previous is not None and previous != key:
+        prefetcher.release(previous, owner)
+    st.session_state['prefetch_key'] = key
+
+    prefetcher.submit(key, _prefetch_jobs(data, metadata, wacc), owner=owner)
+    return key
+
+
+def _prefetch_jobs(data, metadata, wacc):
+    price = metadata.get('current_price', 0)
+    return {
+        'eva': lambda: get_engine('eva')(data, wacc).calculate_eva(),
+        'solvency': lambda: get_ratio_tables(data)['solvency'],
+        'efficiency': lambda: get_ratio_tables(data)['efficiency'],
+        'growth': lambda: get_engine('growth')(data).get_growth_summary(),
+        'dcf': lambda: dcf_defaults(data, wacc, FINANCIAL_DEFAULTS['explicit_growth'],
+                                    FINANCIAL_DEFAULTS['terminal_growth']),
+        'thesis': lambda: get_engine('thesis')(data, 0, price).metrics,
+    }
+
+
+def prewarm_universe(store, companies):
+    """
+    Computes the ratio tables and queues the prefetched analyses of freshly
+    published universe companies at the sidebar's initial WACC, keyed exactly
+    as a session that opens them will ask (the last companies win if there
+    are more than the prefetcher keeps).
+    """
+    prefetcher = get_prefetcher()
+    wacc = SIDEBAR_WACC_DEFAULT / 100
+    for company in companies[-prefetcher.max_datasets:]:
+        data = store.company_frame(company)
+        get_ratio_tables(data)
+        prefetcher.submit(dataset_key(data, wacc), _prefetch_jobs(data, store.company_metadata(company), wacc))
+
+
+@st.cache_resource
+def get_watch_service():
+    """
+    The process-wide watch-folder service (src/core/watcher.py), started on
+    first use; only runs when MOUNTAIN_WATCH is set.
+    """
+    if os.environ.get('MOUNTAIN_WATCH', '').strip().lower() not in ('1', 'true', 'yes', 'on'):
+        return None
+    from src.core.watcher import WatchService
+    return WatchService(on_published=prewarm_universe).start()
@@ -0,0 +1,136 @@
+"""
+charts.py - Cached, Downsampled Charts
+🏔️ THE MOUNTAIN PATH - World of Finance
+
+Chart inputs are built once per (dataset, view, parameters) and reused on
+every rerun:
+
+- native Streamlit charts cache the plotted frame, downsampled with
+  Largest-Triangle-Three-Buckets (LTTB) once a series exceeds
+  CHART_MAX_POINTS, so payload size and render time stay bounded however
+  long the history gets
+- Plotly charts cache the figure object itself
+
+    line_chart(data, 'roe', lambda: prof_df.set_index('Year')['ROE %'])
+    plotly_chart(data, ('dcf_sensitivity', wacc, g, tg), lambda: px.imshow(...))
+
+Plotly is never imported here; tabs build figures inside the callable.
+"""
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from src.core.config import CHART_CACHE_ENTRIES, CHART_MAX_POINTS
+from src.core.session_data import register_shared
+from src.ui.display import DisplayCache
+
+
+def lttb_indices(x, y, max_points):
+    """
+    Positions of the points kept by Largest-Triangle-Three-Buckets.
+
+    The first and last points are always kept; every bucket in between
+    keeps the point forming the largest triangle with the previous pick and
+    the mean of the next bucket, which preserves peaks and troughs.
+
+    Args:
+        x: Monotonic x values (float array)
+        y: y values (float array, NaN allowed)
+        max_points: Number of points to keep (>= 3)
+
+    Returns:
+        Sorted int array of kept positions.
+    """
+    n = len(y)
+    if max_points >= n or max_points < 3:
+        return np.arange(n)
+
+    # Buckets over the interior points
+    edges = np.linspace(1, n - 1, max_points - 1).astype(int)
+    kept = np.empty(max_points, dtype=int)
+    kept[0], kept[-1] = 0, n - 1
+    prev = 0
+    for i in range(max_points - 2):
+        start, stop = edges[i], edges[i + 1]
+        nxt_start, nxt_stop = stop, edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[nxt_start:nxt_stop].mean()
+        avg_y = np.nanmean(y[nxt_start:nxt_stop]) if np.isfinite(y[nxt_start:nxt_stop]).any() else y[prev]
+
+        area = np.abs((x[prev] - avg_x) * (y[start:stop] - y[prev])
+                      - (x[prev] - x[start:stop]) * (avg_y - y[prev]))
+        area = np.where(np.isnan(area), -1.0, area)
+        prev = start + int(np.argmax(area))
+        kept[i + 1] = prev
+    return kept
+
+
+def downsample(frame, max_points=CHART_MAX_POINTS):
+    """
+    Shape-preserving downsample of a Series/DataFrame indexed by x.
+
+    Each column is reduced with LTTB and the union of kept rows is returned,
+    so every series keeps its own extremes. Non-numeric indices (year
+    labels) are treated as evenly spaced.
+    """
+    if max_points is None or len(frame) <= max_points:
+        return frame
+
+    index = frame.index
+    if pd.api.types.is_datetime64_any_dtype(index):
+        x = index.asi8.astype(float)
+    elif pd.api.types.is_numeric_dtype(index):
+        x = np.asarray(index, dtype=float)
+    else:
+        x = np.arange(len(frame), dtype=float)
+
+    columns = frame.to_frame() if isinstance(frame, pd.Series) else frame
+    kept = np.unique(np.concatenate([
+        lttb_indices(x, pd.to_numeric(columns[col], errors='coerce').to_numpy(dtype=float), max_points)
+        for col in columns.columns
+    ]))
+    return frame.iloc[kept]
+
+
+class ChartCache(DisplayCache):
+    """LRU of chart frames and figures keyed by (dataset key, view); shared by all sessions."""
+
+    def convert(self, built):
+        return built
+
+
+@st.cache_resource
+def get_chart_cache():
+    cache = ChartCache(CHART_CACHE_ENTRIES)
+    register_shared('chart frames', cache)
+    return cache
+
+
+def chart_frame(data, view, build, max_points=CHART_MAX_POINTS):
+    """
+    Cached, downsampled frame for one chart view of a dataset.
+
+    Args:
+        data: Loader frame the view is derived from (cache identity)
+        view: View name, or a tuple of name and parameters
+        build: Zero-argument callable returning the Series/DataFrame to plot
+        max_points: Per-series point budget (None disables downsampling)
+    """
+    return get_chart_cache().get(data, (view, max_points), lambda: downsample(build(), max_points))
+
+
+def line_chart(data, view, build, max_points=CHART_MAX_POINTS, **kwargs):
+    st.line_chart(chart_frame(data, view, build, max_points), **kwargs)
+
+
+def area_chart(data, view, build, max_points=CHART_MAX_POINTS, **kwargs):
+    st.area_chart(chart_frame(data, view, build, max_points), **kwargs)
+
+
+def bar_chart(data, view, build, max_points=CHART_MAX_POINTS, **kwargs):
+    st.bar_chart(chart_frame(data, view, build, max_points), **kwargs)
+
+
+def plotly_chart(data, view, build, **kwargs):
+    """st.plotly_chart of a figure built once per (data, view); build returns the figure."""
+    st.plotly_chart(get_chart_cache().get(data, ('plotly', view), build), **kwargs)
@@ -0,0 +1,117 @@
+"""
+display.py - Cached Arrow Display Tables
+🏔️ THE MOUNTAIN PATH - World of Finance
+
+Display-ready tables are built once per (dataset, view) as pyarrow Tables
+with string headers and the index materialized as the first column, then
+handed to st.dataframe as-is. Reruns skip the transpose, the
+copy-and-cast of index/columns and the pandas -> Arrow conversion.
+
+    show_table(data, 'financials', lambda: data.set_index('Report Date').T)
+
+Views that depend on parameters carry them in the view key, e.g.
+('eva', wacc).
+"""
+
+import threading
+import weakref
+from collections import OrderedDict
+
+import pyarrow as pa
+import streamlit as st
+
+from src.core.config import DISPLAY_CACHE_ENTRIES
+from src.core.prefetch import dataset_key
+from src.core.session_data import approx_nbytes, register_shared
+
+
+def to_display_table(df):
+    """
+    Convert a DataFrame into an Arrow table ready for st.dataframe: the index
+    becomes the first column and every header is a string.
+    """
+    frame = df.copy(deep=False)
+    frame.index = frame.index.astype(str)
+    frame.columns = frame.columns.astype(str)
+    frame = frame.reset_index(names=df.index.name or '')
+    try:
+        return pa.Table.from_pandas(frame, preserve_index=False)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        # Mixed-type object columns (e.g. numbers and labels): show as text
+        mixed = frame.select_dtypes(include='object').columns
+        frame[mixed] = frame[mixed].astype(str)
+        return pa.Table.from_pandas(frame, preserve_index=False)
+
+
+class DisplayCache:
+    """LRU of Arrow tables keyed by (dataset key, view); shared by all sessions."""
+
+    def __init__(self, max_entries=DISPLAY_CACHE_ENTRIES):
+        self.max_entries = max_entries
+        self._tables = OrderedDict()
+        self._frame_keys = {}
+        self._lock = threading.Lock()
+
+    def frame_key(self, data):
+        """
+        Content key of a loader frame, hashed once per frame object (the memo
+        entry is dropped when the frame is garbage collected).
+        """
+        entry = self._frame_keys.get(id(data))
+        if entry is not None and entry[0]() is data:
+            return entry[1]
+        key = dataset_key(data)
+        ref = weakref.ref(data, lambda _, i=id(data): self._frame_keys.pop(i, None))
+        self._frame_keys[id(data)] = (ref, key)
+        return key
+
+    def convert(self, built):
+        """Turn what build() returned into the cached value."""
+        return to_display_table(built)
+
+    def get(self, data, view, build):
+        key = (self.frame_key(data), view)
+        with self._lock:
+            table = self._tables.get(key)
+            if table is not None:
+                self._tables.move_to_end(key)
+                return table
+
+        table = self.convert(build())
+        with self._lock:
+            self._tables[key] = table
+            while len(self._tables) > self.max_entries:
+                self._tables.popitem(last=False)
+        return table
+
+    def nbytes(self):
+        """Approximate memory held by the cached tables."""
+        with self._lock:
+            tables = list(self._tables.values())
+        return approx_nbytes(tables)
+
+
+@st.cache_resource
+def get_display_cache():
+    cache = DisplayCache()
+    register_shared('display tables', cache)
+    return cache
+
+
+def display_table(data, view, build):
+    """
+    Cached Arrow table for one view of a dataset.
+
+    Args:
+        data: Loader frame the view is derived from (cache identity)
+        view: View name, or a tuple of name and parameters
+        build: Zero-argument callable returning the DataFrame to display
+    """
+    return get_display_cache().get(data, view, build)
+
+
+def show_table(data, view, build, **kwargs):
+    """st.dataframe of the cached Arrow table for (data, view); kwargs go to st.dataframe."""
+    kwargs.setdefault('width', 'stretch')
+    kwargs.setdefault('hide_index', True)
+    st.dataframe(display_table(data, view, build), **kwargs)
@@ -1,21 +1,39 @@
 
 import streamlit as st
-from src.core.config import COMPANY_NAME
+import pandas as pd
+from src.core.config import COMPANY_NAME, SIDEBAR_WACC_DEFAULT
+from src.core.profiler import summarize
 
-def render_sidebar():
-    """Renders sidebar for file upload and global settings."""
+def render_sidebar(universe_companies=None):
+    """
+    Renders sidebar for file upload and global settings.
+    
+    Args:
+        universe_companies: Company names available in the published universe
+                            store (offered as an alternative to uploading)
+    """
     st.sidebar.title(f"🏔️ {COMPANY_NAME}")
     
     # 1. Initialize the settings dictionary
     settings = {}
     
     st.sidebar.header("📁 Data Upload")
-    uploaded_file = st.sidebar.file_uploader(
+    uploaded_files = st.sidebar.file_uploader(
         "Upload Screener.in Excel", 
         type=["xlsx"],
-        help="Download the 'Data Sheet' from Screener.in and upload here."
+        accept_multiple_files=True,
+        help="Download the 'Data Sheet' from Screener.in and upload here. Select several files to compare a sector."
     )
     
+    # Companies already published to the shared universe store
+    settings['universe_picks'] = []
+    if universe_companies:
+        settings['universe_picks'] = st.sidebar.multiselect(
+            "📚 Or load from Universe",
+            universe_companies,
+            help="Companies already ingested into the shared universe store - no upload or parsing needed."
+        )
+    
     st.sidebar.divider()
     
     st.sidebar.header("⚙️ Valuation Assumptions")
@@ -26,7 +44,7 @@ def render_sidebar():
         "Cost of Capital (WACC %)", 
         min_value=5.0, 
         max_value=25.0, 
-        value=10.0,
+        value=SIDEBAR_WACC_DEFAULT,
         step=0.5,
         help="The required rate of return for investors."
     )
@@ -43,6 +61,13 @@ def render_sidebar():
     )
     settings['tax_rate'] = tax_rate / 100
 
+    # 4. Period Basis (Annual vs Trailing Twelve Months)
+    settings['use_ttm'] = st.sidebar.checkbox(
+        "Use TTM figures",
+        value=False,
+        help="Adds a trailing-twelve-month column built from the last four quarters; ratio and valuation tabs then use it as the latest period."
+    )
+
     st.sidebar.divider()
     
     # Sidebar Branding
@@ -51,4 +76,57 @@ def render_sidebar():
         "Developed by Prof. V. Ravichandran"
     )
     
-    return uploaded_file, settings
+    return uploaded_files, settings
+
+
+def render_dataset_selector(names):
+    """Lets the user pick which parsed company drives the single-company tabs."""
+    if len(names) <= 1:
+        return names[0] if names else None
+    return st.sidebar.selectbox("🏢 Active Company", names, key="active_company")
+
+
+def render_publish_button(count):
+    """Offers to publish the session's parsed uploads to the shared universe store."""
+    if count == 0:
+        return False
+    return st.sidebar.button(f"📚 Publish {count} upload(s) to Universe")
+
+
+def render_performance_panel(records, elapsed_ms, trace_path=None, event_counts=None, memory=None):
+    """
+    Shows where the current rerun spent its time (profiler spans grouped by stage).
+
+    Args:
+        records: Span records for this rerun (profiler.run_spans())
+        elapsed_ms: Wall time of the rerun so far
+        trace_path: JSON-lines trace file, if one is being written
+        event_counts: Process-wide operational counters (src.core.log.counters)
+        memory: Optional {'session': SessionDataManager.stats(), 'process': process_stats()}
+    """
+    with st.sidebar.expander("⏱️ Performance", expanded=False):
+        st.metric("Rerun Time", f"{elapsed_ms:,.0f} ms")
+        if memory:
+            session, process = memory['session'], memory['process']
+            mib = 1024 * 1024
+            c1, c2 = st.columns(2)
+            c1.metric("Session Memory", f"{session['bytes'] / mib:,.1f} MiB",
+                      help=f"Budget {session['budget_bytes'] / mib:,.0f} MiB")
+            c2.metric("Process Memory", f"{process['bytes'] / mib:,.1f} MiB",
+                      help=f"Budget {process['budget_bytes'] / mib:,.0f} MiB across {process['sessions']} session(s)")
+            st.caption(f"{session['resident']}/{session['entries']} cached item(s) resident · "
+                       f"evictions: {session['evictions']} · recomputes: {session['recomputes']}")
+            if process.get('shared'):
+                st.caption("Shared caches (bounded by entry count, not the memory budget): " +
+                           " · ".join(f"{name} {nbytes / mib:,.1f} MiB" for name, nbytes in process['shared'].items()))
+        if event_counts:
+            st.caption(" · ".join(f"{name.replace('_', ' ')}: {count}" for name, count in sorted(event_counts.items())))
+        if not records:
+            st.caption("No instrumented stages ran.")
+            return
+        summary = pd.DataFrame(summarize(records)).rename(columns={
+            'name': 'Stage', 'calls': 'Calls', 'total_ms': 'Total ms', 'max_ms': 'Max ms', 'peak_kib': 'Peak KiB',
+        })
+        st.dataframe(summary, hide_index=True, width='stretch')
+        if trace_path:
+            st.caption(f"Trace: {trace_path}")
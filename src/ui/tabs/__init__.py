@@ -1 +1,31 @@
+"""
+Tab renderers, imported on first render.
 
+Tab modules import plotly and their analysis engines at module level; the
+registry keeps those imports off the startup path so the welcome screen
+renders without them.
+"""
+
+import importlib
+
+# Tab key -> (module, render function)
+TAB_RENDERERS = {
+    'dashboard': ('src.ui.tabs.dashboard', 'render_dashboard'),
+    'profitability': ('src.ui.tabs.profitability_tab', 'render_profitability_tab'),
+    'dcf': ('src.ui.tabs.dcf_tab', 'render_dcf_tab'),
+    'efficiency': ('src.ui.tabs.efficiency_tab', 'render_efficiency_tab'),
+    'growth': ('src.ui.tabs.growth_tab', 'render_growth_tab'),
+    'peers': ('src.ui.tabs.peers_tab', 'render_peers_tab'),
+    'shareholding': ('src.ui.tabs.shareholding_tab', 'render_shareholding_tab'),
+    'thesis': ('src.ui.tabs.thesis_tab', 'render_thesis_tab'),
+}
+
+
+def get_renderer(key):
+    """Import (on first use) and return the render function for a tab."""
+    module_name, function = TAB_RENDERERS[key]
+    return getattr(importlib.import_module(module_name), function)
+
+
+def render_tab(key, *args, **kwargs):
+    return get_renderer(key)(*args, **kwargs)
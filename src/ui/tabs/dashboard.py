@@ -1,14 +1,17 @@
 
 import streamlit as st
 import pandas as pd
-from src.analysis.financial import FinancialAnalyzer
+from src.ui.cache import get_ratio_tables
+from src.core.profiler import profiled
+from src.ui.charts import area_chart, bar_chart, line_chart
 
+@profiled('render.dashboard_tab')
 def render_dashboard(data, metadata):
     """
     Renders the institutional dashboard with core KPIs and profitability trends.
     """
-    # 1. Initialize Analyzer
-    analyzer = FinancialAnalyzer(data)
+    # 1. Cached Ratio Tables
+    ratios = get_ratio_tables(data)
     
     # 2. Section Header
     st.markdown(f"### 🏔️ Performance Overview: {metadata.get('company_name', 'Company Profile')}")
@@ -46,18 +49,18 @@ def render_dashboard(data, metadata):
     st.divider()
 
     # 5. Profitability Trends
-    prof_df = analyzer.get_profitability_metrics()
+    prof_df = ratios['profitability']
     
     if not prof_df.empty:
         c1, c2 = st.columns(2)
         
         with c1:
             st.write("**Return on Equity (ROE %)**")
-            st.line_chart(prof_df.set_index('Year')['ROE %'])
+            line_chart(data, 'roe', lambda: prof_df.set_index('Year')['ROE %'])
             
         with c2:
             st.write("**Net Profit Margin (%)**")
-            st.area_chart(prof_df.set_index('Year')['Net Margin %'])
+            area_chart(data, 'net_margin', lambda: prof_df.set_index('Year')['Net Margin %'])
             
         # Summary Table with High Contrast Formatting
         with st.expander("View Historical Ratios"):
@@ -68,9 +71,9 @@ def render_dashboard(data, metadata):
 
     # 6. Debt Analysis
     st.write("### 🛡️ Solvency Position")
-    solvency_df = analyzer.get_solvency_metrics()
+    solvency_df = ratios['solvency']
     if not solvency_df.empty:
-        st.bar_chart(solvency_df.set_index('Year')['Debt-to-Equity'])
+        bar_chart(data, 'debt_to_equity', lambda: solvency_df.set_index('Year')['Debt-to-Equity'])
         
         latest_de = solvency_df['Debt-to-Equity'].iloc[-1]
         if latest_de > 1.5:
@@ -1,11 +1,30 @@
 
+import math
+
 import streamlit as st
 import pandas as pd
 import plotly.express as px
-from src.analysis.valuation import calculate_dcf, get_sensitivity_matrix
+from src.analysis.valuation import (calculate_dcf, calculate_dcf_paths, get_sensitivity_matrix, estimate_fcf_proxy,
+                                    sensitivity_ranges, shares_outstanding, value_per_share)
+from src.core.config import FINANCIAL_DEFAULTS
+from src.core.panel import annual_frame, company_panel
+from src.core.profiler import profiled
+from src.ui.cache import get_scenario_store, get_scenario_evaluator
+from src.ui.charts import plotly_chart
+from src.ui.display import show_table
+
+@profiled('render.dcf_tab')
+def render_dcf_tab(data, settings, defaults=None, metadata=None):
+    """
+    Renders the DCF Valuation interface with safety guardrails.
 
-def render_dcf_tab(data, settings):
-    """Renders the DCF Valuation interface with safety guardrails."""
+    Args:
+        data: Loader frame
+        settings: Sidebar settings
+        defaults: Optional precomputed dcf_defaults() result, used while
+                  the sliders sit at their default assumptions
+        metadata: Loader metadata; enables the saved-scenario comparison
+    """
     st.subheader("🎯 Intrinsic Value Estimation (DCF)")
     
     # --- 1. Inputs & Parameters ---
@@ -19,36 +38,45 @@ def render_dcf_tab(data, settings):
         st.info(f"Current WACC (from sidebar): **{wacc*100:.1f}%**")
 
         # Growth Inputs
-        growth_rate = st.slider("Step 1: 5Y Growth Rate (%)", 0.0, 50.0, 15.0) / 100
+        growth_rate = st.slider("Step 1: 5Y Growth Rate (%)", 0.0, 50.0, round(FINANCIAL_DEFAULTS['explicit_growth'] * 100, 2)) / 100
         
         # Terminal Growth should ideally be < Risk-Free Rate
-        t_growth = st.slider("Step 2: Terminal Growth (%)", 0.0, 6.0, 4.0) / 100
+        t_growth = st.slider("Step 2: Terminal Growth (%)", 0.0, 6.0, round(FINANCIAL_DEFAULTS['terminal_growth'] * 100, 2)) / 100
+        
+        # Precomputed in the background for the default assumptions
+        use_defaults = defaults is not None and all(
+            math.isclose(a, b) for a, b in zip((defaults['wacc'], defaults['growth_rate'], defaults['terminal_growth']),
+                                               (wacc, growth_rate, t_growth)))
+        
+        # Stage 0: FCF Proxy (Net Profit adjusted for non-cash items)
+        latest_fcf = defaults['fcf'] if use_defaults else estimate_fcf_proxy(data)
         
         # Validation to prevent negative infinity math
         if wacc <= t_growth:
             st.error("⚠️ Error: WACC must be strictly higher than Terminal Growth to calculate Terminal Value.")
             fair_value = 0.0
+        elif use_defaults:
+            fair_value = defaults['fair_value']
         else:
-            # Stage 0: FCF Proxy (Net Profit adjusted for non-cash items)
-            latest_pat = data.iloc[-1].get('Net Profit', 0)
-            depreciation = data.iloc[-1].get('Depreciation', 0)
-            # Conservative Institutional FCF Proxy
-            latest_fcf = latest_pat + (depreciation * 0.3)
-            
             # --- 2. Calculation ---
             fair_value = calculate_dcf(latest_fcf, growth_rate, wacc, t_growth)
 
     # --- 3. Save to Session State for Thesis Tab ---
+    # The price is per share: the thesis compares it with the per-share value
+    per_share = value_per_share(fair_value, shares_outstanding(data))
     st.session_state['intrinsic_value'] = fair_value
+    st.session_state['intrinsic_value_per_share'] = per_share
 
     with col2:
         if fair_value > 0:
             st.success(f"### Estimated Intrinsic Value: ₹{fair_value:,.2f} Cr")
             
             # Market Gap Logic
-            curr_price = st.session_state.get('current_price', 0)
-            if curr_price > 0:
-                upside = ((fair_value / curr_price) - 1) * 100
+            curr_price = (metadata or {}).get('current_price', 0)
+            if per_share > 0:
+                st.write(f"**Value per Share:** ₹{per_share:,.2f}")
+            if per_share > 0 and curr_price > 0:
+                upside = ((per_share / curr_price) - 1) * 100
                 color = "green" if upside > 0 else "red"
                 st.markdown(f"**Potential Upside:** :{color}[{upside:.1f}%]")
         else:
@@ -60,30 +88,40 @@ def render_dcf_tab(data, settings):
         # --- 4. Sensitivity Matrix ---
         st.write("#### Sensitivity Matrix (WACC vs. Growth)")
         
-        # Generate ranges centered around user inputs
-        wacc_range = [round(wacc + i, 3) for i in [-0.02, -0.01, 0, 0.01, 0.02]]
-        growth_range = [round(growth_rate + i, 3) for i in [-0.04, -0.02, 0, 0.02, 0.04]]
-        
-        # Filter ranges to ensure no matrix cell breaks the math
-        wacc_range = [w for w in wacc_range if w > t_growth]
+        # Generate ranges centered around user inputs (cells that break the math are dropped)
+        wacc_range, growth_range = sensitivity_ranges(wacc, growth_rate, t_growth)
 
         if wacc_range:
-            matrix_df = get_sensitivity_matrix(latest_fcf, growth_range, wacc_range, t_growth)
-            
-            # Format the matrix for display (Convert to Strings for Arrow Compatibility)
-            matrix_df.index = [f"{i*100:.1f}%" for i in matrix_df.index]
-            matrix_df.columns = [f"{i*100:.1f}%" for i in matrix_df.columns]
-
-            fig = px.imshow(
-                matrix_df,
-                text_auto=".0f",
-                color_continuous_scale='RdYlGn',
-                labels=dict(x="Growth Rate", y="WACC", color="Fair Value")
-            )
-            st.plotly_chart(fig, width='stretch')
+            def sensitivity_figure():
+                if use_defaults:
+                    matrix_df = defaults['matrix'].copy()
+                else:
+                    matrix_df = get_sensitivity_matrix(latest_fcf, growth_range, wacc_range, t_growth)
+
+                # Format the matrix for display (Convert to Strings for Arrow Compatibility)
+                matrix_df.index = [f"{i*100:.1f}%" for i in matrix_df.index]
+                matrix_df.columns = [f"{i*100:.1f}%" for i in matrix_df.columns]
+
+                return px.imshow(
+                    matrix_df,
+                    text_auto=".0f",
+                    color_continuous_scale='RdYlGn',
+                    labels=dict(x="Growth Rate", y="WACC", color="Fair Value")
+                )
+
+            # Rebuilt only when the dataset or the assumptions change
+            plotly_chart(data, ('dcf_sensitivity', round(wacc, 6), round(growth_rate, 6), round(t_growth, 6)),
+                         sensitivity_figure)
         else:
             st.info("Sensitivity matrix hidden: WACC assumptions are too low.")
 
+    # --- 5. Model-Based FCF Forecast ---
+    render_forecast(data, wacc, t_growth)
+
+    # --- 6. Saved Scenarios (Bear / Base / Bull, house WACC variants) ---
+    if metadata is not None:
+        render_scenarios(data, metadata, wacc, growth_rate, t_growth)
+
     with st.expander("📚 Understanding the DCF Math"):
         st.write("""
         The intrinsic value is calculated using a **Two-Stage Gordon Growth Model**:
@@ -92,3 +130,70 @@ def render_dcf_tab(data, settings):
         
         If the **WACC** (your discount rate) is lower than **Terminal Growth**, the model assumes the company grows faster than the economy forever, which results in a negative/infinite value. Professional analysts cap Terminal Growth at the Risk-Free Rate.
         """)
+
+def render_forecast(data, wacc, t_growth):
+    """
+    Projected FCF paths from the fitted forecasting models (instead of the
+    proxy × slider growth) and the multi-year DCF value of the chosen one.
+    """
+    from src.analysis.forecast import FCFForecaster, MODELS, MODEL_LABELS
+
+    st.divider()
+    st.write("#### 📈 Model-Based FCF Forecast")
+    # Fiscal years only: a 'TTM' column is not one more year of history
+    forecaster = FCFForecaster(company_panel(annual_frame(data))).fit()
+    model = st.selectbox("Forecast model", MODELS, index=len(MODELS) - 1, format_func=MODEL_LABELS.get,
+                         key='forecast_model')
+    path = forecaster.paths(model)
+
+    c1, c2 = st.columns([1, 2])
+    if wacc <= t_growth:
+        c1.warning("Forecast value unavailable: WACC must exceed Terminal Growth.")
+    else:
+        value = float(calculate_dcf_paths(path.to_numpy()[0], wacc, t_growth))
+        c1.metric("Forecast Intrinsic Value", f"₹{value:,.2f} Cr")
+    fitted = forecaster.params.iloc[0]
+    c2.caption(f"Fitted on {int(fitted['Years'])} years · log-linear growth {fitted['Log Growth %']:.1f}% · "
+               f"mean FCF margin {fitted['Mean Margin %']:.1f}% (persistence {fitted['Margin Persistence']:.2f})")
+    # Every model's path (same for any selection)
+    show_table(data, 'fcf_forecast', lambda: forecaster.forecast().droplevel('Company').round(2))
+
+
+def render_scenarios(data, metadata, wacc, growth_rate, t_growth):
+    """
+    Save the current slider assumptions as a named scenario and compare every
+    scenario saved for this company (plus the house views) side by side -
+    one batched DCF / EVA / thesis evaluation, memoized across reruns.
+    """
+    from src.analysis.scenarios import HOUSE, scenario_inputs
+
+    company = metadata.get('company_name') or 'Company'
+    store = get_scenario_store()
+
+    st.divider()
+    st.write("#### 🗂️ Saved Scenarios")
+    c1, c2, c3 = st.columns([2, 1, 1])
+    name = c1.text_input("Scenario name", placeholder="e.g. Bear, Base, Bull", key='scenario_name')
+    house = c2.checkbox("House view (all companies)", key='scenario_house')
+    if c3.button("💾 Save current assumptions", disabled=not name.strip()):
+        store.save(HOUSE if house else company, name, wacc, growth_rate, t_growth)
+        st.success(f"✓ Saved '{name.strip()}' ({wacc*100:.1f}% WACC, {growth_rate*100:.1f}% growth, "
+                   f"{t_growth*100:.1f}% terminal)")
+
+    scenarios = store.scenarios(company)
+    if not scenarios:
+        st.caption("No saved scenarios yet - set the sliders and save them as named views.")
+        return
+
+    inputs = scenario_inputs(company_panel(data, company), {company: metadata.get('current_price', 0)})
+    results = get_scenario_evaluator().evaluate(inputs, scenarios).droplevel('Company')
+    st.dataframe(results.drop(columns=['Market Price']), width='stretch')
+
+    d1, d2 = st.columns([2, 1])
+    doomed = d1.selectbox("Delete scenario", list(scenarios), index=None, placeholder="Choose a scenario",
+                          key='scenario_delete')
+    if d2.button("🗑️ Delete", disabled=doomed is None):
+        # The company's own scenario first; otherwise the house view (for every company)
+        if not store.delete(company, doomed):
+            store.delete(HOUSE, doomed)
+        st.rerun()
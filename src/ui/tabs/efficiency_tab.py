@@ -1,11 +1,16 @@
 import streamlit as st
-from src.analysis.financial import FinancialAnalyzer
+from src.ui.cache import get_ratio_tables
+from src.ui.charts import bar_chart, line_chart
+from src.ui.display import show_table
+from src.core.profiler import profiled
 
-def render_efficiency_tab(data):
+@profiled('render.efficiency_tab')
+def render_efficiency_tab(data, eff_df=None):
     st.subheader("⚡ Operational Efficiency")
     
-    analyzer = FinancialAnalyzer(data)
-    eff_df = analyzer.get_efficiency_metrics()
+    # Prefetched table when available
+    if eff_df is None:
+        eff_df = get_ratio_tables(data)['efficiency']
 
     # Metric Cards for latest year
     latest = eff_df.iloc[-1]
@@ -20,11 +25,11 @@ def render_efficiency_tab(data):
     with col1:
         st.write("#### Asset Utilization Trend")
         # Ensure 'Year' is the index for the chart
-        st.line_chart(eff_df.set_index('Year')['Asset Turnover'])
+        line_chart(data, 'asset_turnover', lambda: eff_df.set_index('Year')['Asset Turnover'])
     
     with col2:
         st.write("#### Working Capital Cycle (Days)")
-        st.bar_chart(eff_df.set_index('Year')['Debtor Days'])
+        bar_chart(data, 'debtor_days', lambda: eff_df.set_index('Year')['Debtor Days'])
 
     st.write("#### Efficiency Data Table")
-    st.dataframe(eff_df.set_index('Year').T, width='stretch')
+    show_table(data, 'efficiency', lambda: eff_df.set_index('Year').T)
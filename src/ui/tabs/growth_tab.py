@@ -1,12 +1,16 @@
 
 import streamlit as st
 from src.analysis.growth import GrowthAnalyzer
+from src.core.profiler import profiled
+from src.ui.charts import line_chart
 
-def render_growth_tab(data):
+@profiled('render.growth_tab')
+def render_growth_tab(data, growth_df=None):
     st.subheader("🚀 Growth Momentum")
     
-    analyzer = GrowthAnalyzer(data)
-    growth_df = analyzer.get_growth_summary()
+    # Prefetched summary when available
+    if growth_df is None:
+        growth_df = GrowthAnalyzer(data).get_growth_summary()
 
     if not growth_df.empty:
         st.write("#### Compounded Annual Growth Rates (%)")
@@ -15,6 +19,6 @@ def render_growth_tab(data):
         st.divider()
         st.write("#### Historical Sales vs Profit Growth")
         # Plotting raw values to show scale of growth
-        st.line_chart(data.set_index('Report Date')[['Sales', 'Net Profit']])
+        line_chart(data, 'sales_vs_profit', lambda: data.set_index('Report Date')[['Sales', 'Net Profit']])
     else:
         st.warning("Insufficient historical data to calculate CAGR metrics.")
@@ -1,29 +1,91 @@
 import streamlit as st
 import pandas as pd
 import plotly.express as px
+from src.analysis.benchmarks import benchmark_metrics, DEFAULT_SECTOR
+from src.core.config import FINANCIAL_DEFAULTS
+from src.core.panel import annual_frame, company_panel
+from src.ui.cache import get_ratio_tables, get_peer_index, get_sector_benchmarks, get_sector_map, get_session_data
+from src.core.profiler import profiled
+from src.ui.charts import plotly_chart
 
-def render_peers_tab(data):
+@profiled('render.peers_tab')
+def render_peers_tab(data, datasets=None, company=None):
     st.subheader("💹 Peer & Historical Benchmarking")
-    
-    # 1. Historical Median Comparison
-    metrics = ['Net Margin %', 'ROE %', 'Sales']
-    latest = data.iloc[-1]
-    median = data[metrics].median()
-    
+
+    # 0. Nearest Peers across the whole ingested universe
+    peer_index = get_peer_index()
+    if company in peer_index and len(peer_index) > 1:
+        st.write("#### 🧭 Most Similar Companies (Fundamentals k-NN)")
+        max_k = min(20, len(peer_index) - 1)
+        k = st.slider("Number of peers", 1, max_k, min(5, max_k)) if max_k > 1 else 1
+        st.dataframe(peer_index.query(company, k).round(2), width='stretch')
+        st.caption("Distance in standardized size, margin, ROE, leverage and growth space (lower = more similar).")
+        st.divider()
+
+    # 0b. Sector Percentiles (streaming t-digest benchmarks)
+    benchmarks = get_sector_benchmarks()
+    if company is not None and benchmarks.digests:
+        sector = get_sector_map().get(company, DEFAULT_SECTOR)
+        # Digests are bucketed by fiscal year: a 'TTM' column has no bucket
+        metrics = benchmark_metrics(company_panel(annual_frame(data), company), FINANCIAL_DEFAULTS['wacc_default'] / 100)
+        pctl = benchmarks.company_percentiles(metrics, sector)
+        latest_year = pctl.index[-1]
+
+        st.write(f"#### 📊 Sector Percentiles ({sector})")
+        st.caption(f"Rank within {benchmarks.peer_count(sector, latest_year)} ingested company-years for FY{str(latest_year)[:4]} "
+                   f"(100 = best in sector; for Debt-to-Equity, higher = more leveraged).")
+        st.dataframe(pctl.T, width='stretch')
+        st.divider()
+
+    # 1. Side-by-Side Comparison of every uploaded company
+    if datasets and len(datasets) > 1:
+        st.write("#### Side-by-Side Comparison (Latest Period)")
+        # One small row per dataset, kept in the session's data manager so
+        # evicted datasets are not reloaded on every rerun
+        cached_rows = get_session_data().namespace('peer_rows')
+        rows = []
+        for name, dataset in datasets.items():
+            row = cached_rows.get(dataset['key'])
+            if row is None:
+                ratios = get_ratio_tables(dataset['data'])
+                prof = ratios['profitability'].iloc[-1]
+                dupont = ratios['dupont'].iloc[-1]
+                row = {
+                    'Period': prof['Year'],
+                    'Market Cap (Cr)': dataset['metadata'].get('market_cap', 0),
+                    'ROE %': prof['ROE %'],
+                    'Net Margin %': prof['Net Margin %'],
+                    'Asset Turnover': dupont['Asset Turnover'],
+                    'Debt-to-Equity': ratios['solvency']['Debt-to-Equity'].iloc[-1],
+                    'Sales Growth %': ratios['growth']['Sales Growth %'].iloc[-1],
+                }
+                cached_rows.put(dataset['key'], row)
+            rows.append({'Company': name, **row})
+        st.dataframe(pd.DataFrame(rows).set_index('Company').round(2), width='stretch')
+        st.divider()
+
+    # 2. Historical Median Comparison
+    prof_df = get_ratio_tables(data)['profitability']
+    metrics = ['Net Margin %', 'ROE %']
+    latest = prof_df.iloc[-1]
+    median = prof_df[metrics].median()
+
     col1, col2 = st.columns(2)
-    
+
     with col1:
-        st.write("#### Current vs. 10Y Median")
+        st.write(f"#### Current vs. {len(prof_df)}Y Median")
         comp_df = pd.DataFrame({
             'Metric': metrics,
-            'Current': [latest['Net Margin %'], latest['ROE %'], "Latest"],
-            '10Y Median': [median['Net Margin %'], median['ROE %'], "Average"]
+            'Current': [latest[m] for m in metrics],
+            'Historical Median': [median[m] for m in metrics]
         })
-        st.table(comp_df)
+        st.table(comp_df.set_index('Metric').round(2))
 
     with col2:
         st.write("#### Margin Consistency")
-        fig = px.box(data, y="Net Margin %", points="all", title="Margin Dispersion (10 Years)")
-        st.plotly_chart(fig, theme="streamlit")
+        plotly_chart(data, 'margin_dispersion',
+                     lambda: px.box(prof_df, y="Net Margin %", points="all", title=f"Margin Dispersion ({len(prof_df)} Years)"),
+                     theme="streamlit")
 
-    st.info("💡 Note: For direct competitor comparison, upload a 'Peer Comparison' CSV from Screener.in.")
+    if len(peer_index) < 2:
+        st.info("💡 Note: Upload several Screener.in workbooks at once to compare companies side by side and discover peers.")
@@ -1,13 +1,18 @@
 
 import streamlit as st
 import pandas as pd
-from src.analysis.financial import FinancialAnalyzer
+from src.ui.cache import get_ratio_tables
+from src.ui.charts import area_chart, line_chart
+from src.ui.display import show_table
+from src.core.profiler import profiled
 
+@profiled('render.profitability_tab')
 def render_profitability_tab(data):
     st.subheader("📊 Profitability & Margin Analysis")
     
-    analyzer = FinancialAnalyzer(data)
-    metrics_df = analyzer.get_profitability_metrics()
+    ratios = get_ratio_tables(data)
+    metrics_df = ratios['profitability']
+    dupont_df = ratios['dupont']
     
     # --- 1. Top Level Metrics (Latest Year) ---
     latest = metrics_df.iloc[-1]
@@ -35,8 +40,7 @@ def render_profitability_tab(data):
     
     if available_cols:
         # Use 'Year' for x-axis indexing
-        chart_data = metrics_df.set_index('Year')[available_cols]
-        st.area_chart(chart_data)
+        area_chart(data, 'margin_trends', lambda: metrics_df.set_index('Year')[available_cols])
     else:
         st.warning("⚠️ Margin data is missing or improperly formatted in the Analysis Layer.")
 
@@ -50,9 +54,27 @@ def render_profitability_tab(data):
     valid_display = [c for c in display_cols if c in metrics_df.columns]
         
     # Transpose so years are columns (Screener.in style)
-    st.dataframe(metrics_df[valid_display].set_index('Year').T, width='stretch')
+    show_table(data, 'profitability', lambda: metrics_df[valid_display].set_index('Year').T)
 
-    # --- 4. Institutional Insight (DuPont Perspective) ---
+    # --- 4. DuPont Decomposition ---
+    st.write("#### DuPont Decomposition of ROE")
+    d1, d2 = st.columns(2)
+    
+    with d1:
+        st.write("**3-Step Levers**")
+        line_chart(data, 'dupont_levers', lambda: dupont_df.set_index('Year')[['Asset Turnover', 'Equity Multiplier']])
+    
+    with d2:
+        st.write("**Margin vs ROE (%)**")
+        line_chart(data, 'margin_vs_roe', lambda: dupont_df.set_index('Year')[['Net Margin %', 'ROE %']])
+    
+    with st.expander("View 5-Step DuPont Table"):
+        five_step = ['Tax Burden', 'Interest Burden', 'EBIT Margin %', 'Asset Turnover', 'Equity Multiplier', 'ROE (5-Step) %']
+        show_table(data, 'dupont_5step', lambda: dupont_df.set_index('Year')[five_step].T)
+
+    st.divider()
+
+    # --- 5. Institutional Insight (DuPont Perspective) ---
     with st.expander("🔍 Institutional Insight: The DuPont Analysis"):
         st.write("""
         Professional investors break down **Return on Equity (ROE)** into three levers:
@@ -1,6 +1,9 @@
 import streamlit as st
 from src.analysis.shareholding import CapitalAnalyzer
+from src.core.profiler import profiled
+from src.ui.charts import area_chart
 
+@profiled('render.shareholding_tab')
 def render_shareholding_tab(data):
     st.subheader("🏦 Capital Structure & Equity Dilution")
     
@@ -11,7 +14,7 @@ def render_shareholding_tab(data):
     
     with col1:
         st.write("#### Share Count Trend")
-        st.area_chart(metrics['No. of Shares'])
+        area_chart(data, 'share_count', lambda: metrics['No. of Shares'])
     
     with col2:
         latest_change = metrics['Share Count Change %'].iloc[-1]
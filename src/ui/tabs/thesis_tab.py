@@ -1,6 +1,8 @@
 import streamlit as st
 from src.analysis.thesis import ThesisEngine
+from src.core.profiler import profiled
 
+@profiled('render.thesis_tab')
 def render_thesis_tab(data, settings):
     st.subheader("📝 Automated Investment Thesis")
     